@@ -0,0 +1,67 @@
+"""
+Per-call overhead of running OMDB coroutines from sync code: a fresh event
+loop per call (previous behaviour) versus the persistent AsyncBridge loop.
+
+    python -m benchmarks.async_bridge --calls 2000
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import setup_django, report
+
+setup_django()
+
+from django.conf import settings
+from utils.async_bridge import async_bridge
+from utils.fake_omdb import FakeOMDBServer
+from utils.movie_api import fetch_movie_details, omdb_client
+
+
+def run_in_new_loop(coro_factory):
+    # Previous behaviour of get_or_create_movie / search_external_movies
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro_factory())
+    finally:
+        loop.run_until_complete(omdb_client.close())
+        loop.close()
+
+
+def run_on_bridge(coro_factory):
+    return async_bridge.run(coro_factory())
+
+
+def measure(label, runner, coro_factory, calls):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(calls):
+        call_started = time.perf_counter()
+        runner(coro_factory)
+        latencies.append(time.perf_counter() - call_started)
+    report(label, latencies, time.perf_counter() - started)
+
+
+async def noop():
+    return None
+
+
+def main(args):
+    print("empty coroutine")
+    measure('  new loop per call', run_in_new_loop, noop, args.calls)
+    measure('  async bridge', run_on_bridge, noop, args.calls)
+
+    with FakeOMDBServer(['Inception']) as server:
+        settings.OMDB_API_URL = server.url
+        lookup = lambda: fetch_movie_details('Inception')  # noqa: E731
+
+        print("OMDB lookup against local stub")
+        measure('  new loop per call', run_in_new_loop, lookup, args.calls)
+        measure('  async bridge', run_on_bridge, lookup, args.calls)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=1000)
+    main(parser.parse_args())
@@ -0,0 +1,134 @@
+"""
+Concurrent-request capacity of one ASGI worker on an OMDB-bound endpoint
+(reviews by movie, for titles not stored yet) against a slow local OMDB
+stub: the previous sync view, which Django runs in a thread that blocks on
+the lookup, versus the async view. Requests are driven in process through
+Django's ASGI handler, ``--concurrency`` at a time.
+
+    python -m benchmarks.async_views --requests 400 --concurrency 50 100 200 --latency 200
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.common import setup_django, report, test_database
+
+setup_django()
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.test import override_settings
+from django.urls import include, path
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework_simplejwt.tokens import AccessToken
+from movies.models import Movie
+from reviews.views import MovieReviewsAPIView
+from users.models import User
+from utils.fake_omdb import FakeOMDBServer
+from utils.movie_api import get_or_create_movie
+from utils.omdb_cache import omdb_cache
+from utils.views import SparseFieldsetMixin
+
+
+class SyncMovieReviewsAPIView(SparseFieldsetMixin, generics.GenericAPIView):
+    # Previous behaviour: a sync handler blocking on the OMDB lookup
+    serializer_class = MovieReviewsAPIView.serializer_class
+    permission_classes = MovieReviewsAPIView.permission_classes
+    pagination_class = MovieReviewsAPIView.pagination_class
+    keyset_ordering = MovieReviewsAPIView.keyset_ordering
+    list_reviews = MovieReviewsAPIView.list_reviews
+
+    def get(self, request, *args, **kwargs):
+        movie_title = request.query_params.get('title')
+        movie = Movie.objects.filter(title__icontains=movie_title).first() or get_or_create_movie(movie_title)
+        if not movie:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return self.list_reviews(movie)
+
+
+class urlconf:
+    urlpatterns = [
+        path('sync/', SyncMovieReviewsAPIView.as_view()),
+        path('async/', MovieReviewsAPIView.as_view()),
+        path('', include(settings.ROOT_URLCONF)),
+    ]
+
+
+async def get(application, url, title, token):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': url, 'raw_path': url.encode(), 'root_path': '',
+        'query_string': f'title={title.replace(" ", "+")}'.encode(),
+        'headers': [(b'host', b'127.0.0.1'), (b'authorization', f'Bearer {token}'.encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('127.0.0.1', 80),
+    }
+    received = False
+    response = {}
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Future()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+
+    await application(scope, receive, send)
+    return response['status']
+
+
+async def load(application, url, titles, token, concurrency):
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(title):
+        nonlocal errors
+        async with slots:
+            started = time.perf_counter()
+            errors += await get(application, url, title, token) != 200
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(title) for title in titles))
+    return latencies, time.perf_counter() - started, errors
+
+
+def main(args):
+    runs = [(url, concurrency) for concurrency in args.concurrency for url in ('sync', 'async')]
+    titles = {run: [f'Bench {run[0]} {run[1]} {index}' for index in range(args.requests)] for run in runs}
+    server = FakeOMDBServer([title for run in runs for title in titles[run]], latency=args.latency / 1000).start()
+    application = get_asgi_application()
+    # Concurrent writers need a file database (the in-memory one raises "table is
+    # locked") and immediate transactions so they queue on the lock instead of failing
+    directory = tempfile.TemporaryDirectory()
+    database = settings.DATABASES['default']
+    database['TEST']['NAME'] = os.path.join(directory.name, 'bench.sqlite3')
+    database['OPTIONS'] = {**database.get('OPTIONS', {}), 'transaction_mode': 'IMMEDIATE', 'timeout': 60}
+    try:
+        with directory, test_database(), override_settings(OMDB_API_URL=server.url, ROOT_URLCONF=urlconf):
+            token = str(AccessToken.for_user(User.objects.create_user(email='bench@example.com', password='x')))
+            for url, concurrency in runs:
+                omdb_cache.clear(shared=True)
+                latencies, elapsed, errors = asyncio.run(
+                    load(application, f'/{url}/', titles[url, concurrency], token, concurrency)
+                )
+                report(f'{url} x{concurrency}', latencies, elapsed)
+                if errors:
+                    print(f'{"":<28} non-200 responses={errors}')
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200])
+    parser.add_argument('--latency', type=float, default=200, help='stub latency in ms')
+    main(parser.parse_args())
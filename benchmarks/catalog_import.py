@@ -0,0 +1,62 @@
+"""
+Catalog import throughput against a local OMDB stub: one title at a time
+through save_movie_details (the only path before the import command) versus
+the import_movies pipeline at a few concurrency levels.
+
+    python -m benchmarks.catalog_import --titles 500 --latency 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import setup_django, test_database
+
+setup_django()
+
+from django.test import override_settings
+from movies.importer import import_movies
+from movies.models import Movie
+from utils.async_bridge import async_bridge
+from utils.fake_omdb import FakeOMDBServer
+from utils.movie_api import save_movie_details
+from utils.omdb_cache import omdb_cache
+
+
+def line(label, count, elapsed):
+    print(f"{label:<28} n={count:<6} titles/s={count / elapsed:>8.1f}  total={elapsed:>6.2f}s")
+
+
+def main(args):
+    titles = [f'Catalog Movie {index}' for index in range(args.titles)]
+    server = FakeOMDBServer(titles, latency=args.latency / 1000).start()
+    try:
+        with test_database(), override_settings(OMDB_API_URL=server.url), tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            for title in titles:
+                async_bridge.run(save_movie_details(title))
+            line('one at a time', len(titles), time.perf_counter() - started)
+
+            path = os.path.join(directory, 'catalog.txt')
+            with open(path, 'w', encoding='utf-8') as target:
+                target.writelines(f'{title}\n' for title in titles)
+            for concurrency in args.concurrency:
+                Movie.objects.all().delete()
+                omdb_cache.clear(shared=True)
+                started = time.perf_counter()
+                stats = import_movies(
+                    path, concurrency=concurrency, rate=args.rate, batch_size=args.batch_size, restart=True
+                )
+                line(f'import_movies x{concurrency}', stats.imported, time.perf_counter() - started)
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=20, help='stub latency in ms')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32])
+    parser.add_argument('--rate', type=float, default=1000, help='requests per second')
+    parser.add_argument('--batch-size', type=int, default=200)
+    main(parser.parse_args())
@@ -0,0 +1,66 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run benchmarks from the project root, e.g. ``python -m benchmarks.omdb_pool``.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'movie_review_api.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    os.environ.setdefault('GOOGLE_CLIENT_ID', 'benchmark-client-id')
+
+    import django
+    django.setup()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(label, latencies, elapsed):
+    """
+    Print throughput and latency percentiles (latencies and elapsed in seconds)
+    """
+    count = len(latencies)
+    print(
+        f"{label:<28} n={count:<6} "
+        f"req/s={count / elapsed if elapsed else 0:>9.1f}  "
+        f"mean={statistics.mean(latencies) * 1000 if latencies else 0:>8.2f}ms  "
+        f"p50={percentile(latencies, 50) * 1000:>8.2f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:>8.2f}ms"
+    )
+
+
+@contextmanager
+def test_database():
+    """
+    Create (and afterwards destroy) a throwaway test database for the default alias
+    """
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def timed(fn, repeat):
+    """
+    Call fn ``repeat`` times and return the per-call latencies in seconds
+    """
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - started)
+    return latencies
@@ -0,0 +1,81 @@
+"""
+Trigram index lookups for misspelled titles: build time, memory-resident
+search latency and substring lookups, without touching the database.
+
+    python -m benchmarks.fuzzy_match --movies 100000
+"""
+import argparse
+import random
+import time
+import uuid
+
+from benchmarks.common import setup_django, report, timed
+
+setup_django()
+
+from movies.fuzzy import TrigramIndex
+from utils.text import normalize_title
+
+# English letter frequencies (per mille)
+LETTER_WEIGHTS = {
+    'e': 127, 't': 91, 'a': 82, 'o': 75, 'i': 70, 'n': 67, 's': 63, 'h': 61, 'r': 60,
+    'd': 43, 'l': 40, 'c': 28, 'u': 28, 'm': 24, 'w': 24, 'f': 22, 'g': 20, 'y': 20,
+    'p': 19, 'b': 15, 'v': 10, 'k': 8, 'j': 2, 'x': 2, 'q': 1, 'z': 1,
+}
+
+
+def catalog(count, seed=7):
+    """
+    Titles of one to five words drawn from a Zipf-like vocabulary, a quarter of
+    them starting with "The", roughly like real catalogs
+    """
+    rng = random.Random(seed)
+    letters, letter_weights = list(LETTER_WEIGHTS), list(LETTER_WEIGHTS.values())
+    vocabulary = sorted({
+        ''.join(rng.choices(letters, letter_weights, k=rng.randint(3, 9))) for _ in range(20000)
+    })
+    rng.shuffle(vocabulary)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    titles = []
+    for _ in range(count):
+        words = rng.choices(vocabulary, weights, k=rng.randint(1, 5))
+        if rng.random() < 0.25:
+            words.insert(0, 'the')
+        titles.append(' '.join(words).title())
+    return titles
+
+
+def misspell(title):
+    # Swap two letters in the middle of the title
+    middle = len(title) // 2
+    return title[:middle - 1] + title[middle] + title[middle - 1] + title[middle + 1:]
+
+
+def main(args):
+    index = TrigramIndex()
+    titles = catalog(args.movies)
+    rows = [(uuid.uuid4(), normalize_title(title)) for title in titles]
+    started = time.perf_counter()
+    index.load(rows)
+    print(f"indexed {args.movies} titles in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(1)
+    typos = [misspell(title) for title in rng.sample(titles, args.repeat) if len(title) > 6]
+    substring = normalize_title(titles[len(titles) // 3]).split(' ')[-1]
+    queries = iter(typos * 2)
+    latencies = timed(lambda: index.search(next(queries), limit=5, threshold=0.5), len(typos))
+    report('search (typo, suggestions)', latencies, sum(latencies))
+    queries = iter(typos * 2)
+    latencies = timed(lambda: index.search(next(queries), limit=3, threshold=0.75), len(typos))
+    report('search (typo, auto-resolve)', latencies, sum(latencies))
+    latencies = timed(lambda: index.search('No Such Movie Title', limit=5, threshold=0.5), args.repeat)
+    report('search (miss)', latencies, sum(latencies))
+    latencies = timed(lambda: index.containing(substring), args.repeat)
+    report('containing', latencies, sum(latencies))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--movies', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=200)
+    main(parser.parse_args())
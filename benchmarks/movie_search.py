@@ -0,0 +1,76 @@
+"""
+Movie search on a large synthetic catalog: DRF SearchFilter-style OR-ed
+icontains over title/genre/director/actors versus the full-text index.
+
+    python -m benchmarks.movie_search --movies 200000
+"""
+import argparse
+import time
+from functools import reduce
+from operator import and_, or_
+
+from benchmarks.common import setup_django, report, test_database, timed
+
+setup_django()
+
+from django.db.models import Q
+from movies.models import Movie
+from movies.search import search_movies, SEARCH_FIELDS, rebuild_search_index
+from utils.text import normalize_title
+
+WORDS = ['star', 'night', 'river', 'ghost', 'iron', 'last', 'dark', 'city', 'storm', 'king',
+         'blue', 'silent', 'broken', 'golden', 'wild', 'lost', 'winter', 'red', 'shadow', 'fire']
+GENRES = ['Action', 'Drama', 'Comedy', 'Horror', 'Sci-Fi', 'Romance', 'Thriller', 'Animation']
+NAMES = ['Smith', 'Nolan', 'Garcia', 'Kim', 'Okafor', 'Novak', 'Rossi', 'Tanaka', 'Dubois', 'Silva']
+
+
+def seed(count, batch_size=10000):
+    started = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        batch = []
+        for i in range(offset, min(count, offset + batch_size)):
+            title = f"{WORDS[i % 20].title()} {WORDS[(i // 20) % 20].title()} {i}"
+            batch.append(Movie(
+                title=title,
+                normalized_title=normalize_title(title),
+                genre=f'{GENRES[i % 8]}, {GENRES[(i // 8) % 8]}',
+                director=f'Director {NAMES[i % 10]}',
+                actors=', '.join(f'Actor {NAMES[(i + n) % 10]}{(i + n) % 97}' for n in range(4)),
+            ))
+        Movie.objects.bulk_create(batch)
+    rebuild_search_index(Movie)
+    print(f"seeded and indexed {count} movies in {time.perf_counter() - started:.1f}s")
+
+
+def icontains_search(term):
+    # What SearchFilter compiles search_fields into
+    conditions = [
+        reduce(or_, (Q(**{f'{field}__icontains': word}) for field in SEARCH_FIELDS))
+        for word in term.split()
+    ]
+    return Movie.objects.filter(reduce(and_, conditions)).order_by('title')
+
+
+def full_text_search(term):
+    return search_movies(Movie.objects.all(), term).order_by('-search_rank', 'title')
+
+
+def main(args):
+    with test_database():
+        seed(args.movies)
+        for term in ['ghost storm', 'nolan', 'zzz nothing']:
+            print(f"'{term}' (first page of 10 + count)")
+            for label, search in [('icontains OR scan', icontains_search), ('full-text index', full_text_search)]:
+                def run():
+                    queryset = search(term)
+                    queryset.count()
+                    list(queryset[:10])
+                latencies = timed(run, args.repeat)
+                report(f'  {label}', latencies, sum(latencies))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--movies', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,89 @@
+"""
+Review list latency on page 1 versus page 10,000: page-number pagination
+(COUNT(*) plus OFFSET), the same with a cached count, and keyset pagination
+with a cursor at the same position.
+
+    python -m benchmarks.pagination --reviews 200000
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from benchmarks.common import setup_django, report, test_database, timed
+
+setup_django()
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from movies.models import Movie
+from reviews.models import Review
+from users.models import User
+from utils.pagination import KeysetPagination
+
+PAGE_SIZE = 10
+
+
+def seed(count, users=500, batch_size=10000):
+    started = time.perf_counter()
+    User.objects.bulk_create(User(email=f'reviewer{index}@example.com') for index in range(users))
+    user_ids = list(User.objects.values_list('id', flat=True))
+    movie_count = -(-count // users)
+    Movie.objects.bulk_create((Movie(title=f'Movie {index}') for index in range(movie_count)), batch_size=batch_size)
+    movie_ids = list(Movie.objects.values_list('id', flat=True))
+    now = timezone.now()
+    batch = []
+    for index in range(count):
+        batch.append(Review(
+            movie_id=movie_ids[index // users], user_id=user_ids[index % users],
+            content='Review', rating=index % 5 + 1, created_at=now - timedelta(seconds=index),
+        ))
+        if len(batch) >= batch_size:
+            Review.objects.bulk_create(batch)
+            batch = []
+    Review.objects.bulk_create(batch)
+    print(f"seeded {count} reviews in {time.perf_counter() - started:.1f}s")
+
+
+def keyset_cursor(offset):
+    # Cursor of the row just before ``offset`` in the review list order
+    row = Review.objects.order_by('-created_at', '-id').values('created_at', 'id')[offset - 1]
+    return KeysetPagination.encode_cursor([row['created_at'].isoformat(), str(row['id'])])
+
+
+def main(args):
+    with test_database():
+        seed(args.reviews)
+        client = APIClient()
+        client.force_authenticate(user=User.objects.first())
+        url = '/api/v1/reviews/'
+        deep = args.page
+
+        def fetch(params):
+            response = client.get(url, {'page_size': PAGE_SIZE, **params}, SERVER_NAME='127.0.0.1')
+            assert response.status_code == 200, response.status_code
+            return response
+
+        cases = [
+            ('page-number p1', {'page': 1}, 0),
+            (f'page-number p{deep}', {'page': deep}, 0),
+            ('cached count p1', {'page': 1}, 60),
+            (f'cached count p{deep}', {'page': deep}, 60),
+            ('keyset p1', {'pagination': 'keyset'}, 0),
+            (f'keyset p{deep}', {'cursor': keyset_cursor((deep - 1) * PAGE_SIZE)}, 0),
+        ]
+        for label, params, count_cache in cases:
+            cache.clear()
+            with override_settings(PAGINATION_COUNT_CACHE_TIMEOUT=count_cache):
+                fetch(params)
+                latencies = timed(lambda: fetch(params), args.repeat)
+            report(label, latencies, sum(latencies))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reviews', type=int, default=200000)
+    parser.add_argument('--page', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,78 @@
+"""
+Movie list and reviews-by-movie throughput without the response cache, with
+it, and for conditional GETs answered 304 from the ETag alone (cache off).
+
+    python -m benchmarks.response_cache --movies 20000 --reviews 100000
+"""
+import argparse
+from datetime import timedelta
+
+from benchmarks.common import setup_django, report, test_database, timed
+
+setup_django()
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from movies.models import Movie
+from movies.ratings import rebuild_rating_aggregates
+from reviews.models import Review
+from users.models import User
+
+
+def seed(movies, reviews, users=500, batch_size=10000):
+    User.objects.bulk_create(User(email=f'reviewer{index}@example.com', first_name=f'R{index}') for index in range(users))
+    user_ids = list(User.objects.values_list('id', flat=True))
+    Movie.objects.bulk_create(
+        (Movie(title=f'Movie {index:06d}', normalized_title=f'movie {index:06d}', year=1950 + index % 70,
+               genre='Drama', director='Someone', plot='A plot ' * 20) for index in range(movies)),
+        batch_size=batch_size
+    )
+    movie_ids = list(Movie.objects.order_by('title').values_list('id', flat=True))
+    now = timezone.now()
+    # The first movie gets a page-filling share of the reviews
+    Review.objects.bulk_create(
+        (Review(movie_id=movie_ids[0] if index < 200 else movie_ids[index % len(movie_ids)],
+                user_id=user_ids[index % users], content='Review text ' * 10, rating=index % 5 + 1,
+                created_at=now - timedelta(seconds=index))
+         for index in range(reviews)),
+        batch_size=batch_size, ignore_conflicts=True
+    )
+    rebuild_rating_aggregates(Movie, Review)
+
+
+def main(args):
+    with test_database():
+        seed(args.movies, args.reviews)
+        client = APIClient()
+        client.force_authenticate(user=User.objects.first())
+        endpoints = [
+            ('movie list', '/api/v1/movies/', {'ordering': '-average_rating', 'page_size': 20}),
+            ('reviews by movie', '/api/v1/reviews/by-movie/', {'title': 'Movie 000000', 'page_size': 20}),
+        ]
+        for name, url, params in endpoints:
+            def fetch(expected=200, **headers):
+                response = client.get(url, params, SERVER_NAME='127.0.0.1', **headers)
+                assert response.status_code == expected, response.status_code
+                return response
+
+            cache.clear()
+            with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+                latencies = timed(fetch, args.repeat)
+                report(f'{name} uncached', latencies, sum(latencies))
+                etag = fetch()['ETag']
+                latencies = timed(lambda: fetch(304, HTTP_IF_NONE_MATCH=etag), args.repeat)
+                report(f'{name} 304', latencies, sum(latencies))
+            with override_settings(RESPONSE_CACHE_TIMEOUT=300):
+                fetch()
+                latencies = timed(fetch, args.repeat)
+                report(f'{name} cached', latencies, sum(latencies))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--movies', type=int, default=20000)
+    parser.add_argument('--reviews', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=200)
+    main(parser.parse_args())
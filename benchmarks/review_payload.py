@@ -0,0 +1,102 @@
+"""
+Payload size and serialization time of a 100-review page: the previous
+fully nested representation (every movie and user column, including the
+password hash) versus the compact default and a ?fields= selection.
+
+    python -m benchmarks.review_payload --reviews 100
+"""
+import argparse
+import time
+
+from benchmarks.common import setup_django, report, test_database, timed
+
+setup_django()
+
+from django.contrib.auth.hashers import make_password
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from movies.models import Movie
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+from users.models import User
+from utils.serializers import only_serialized
+
+PLOT = ('A retired thief is pulled back for one last job that goes wrong in every '
+        'conceivable way, forcing an uneasy alliance with the detective who once caught him. ') * 3
+
+
+class LegacyMovieSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Movie
+        fields = '__all__'
+
+
+class LegacyUserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = '__all__'
+
+
+class LegacyReviewSerializer(serializers.ModelSerializer):
+    # The representation before sparse fieldsets
+    user = LegacyUserSerializer(read_only=True)
+    movie = LegacyMovieSerializer(read_only=True)
+
+    class Meta:
+        model = Review
+        fields = ['id', 'movie', 'content', 'rating', 'user', 'created_at', 'updated_at']
+
+
+def seed(count):
+    started = time.perf_counter()
+    password = make_password('benchmark-password')
+    for index in range(count):
+        user = User.objects.create(
+            email=f'reviewer{index}@example.com', first_name='Review', last_name=f'Er{index}', password=password
+        )
+        movie = Movie.objects.create(
+            title=f'Movie {index}', year=2010, rated='PG-13', runtime=120,
+            genre='Action, Crime, Thriller', director='Some Director',
+            actors='Actor One, Actor Two, Actor Three, Actor Four', plot=PLOT,
+            poster=f'https://example.com/posters/{index}.jpg', imdb_rating='7.5',
+            external_id=f'tt{index:07d}',
+        )
+        Review.objects.create(movie=movie, user=user, content='Solid heist movie. ' * 10, rating=index % 5 + 1)
+    print(f"seeded {count} reviews in {time.perf_counter() - started:.1f}s")
+
+
+def measure(label, serializer_class, queryset, query, repeat):
+    request = Request(APIRequestFactory().get('/api/v1/reviews/', query))
+    renderer = JSONRenderer()
+    if serializer_class is ReviewSerializer:
+        queryset = only_serialized(queryset, serializer_class(context={'request': request}))
+
+    def render():
+        serializer = serializer_class(list(queryset.all()), many=True, context={'request': request})
+        return renderer.render(serializer.data)
+
+    payload = render()
+    latencies = timed(render, repeat)
+    report(label, latencies, sum(latencies))
+    print(f"{'':<28} payload={len(payload) / 1024:.1f} KiB")
+
+
+def main(args):
+    with test_database():
+        seed(args.reviews)
+        reviews = Review.objects.all()[:args.reviews]
+        legacy = reviews.select_related('movie', 'user').prefetch_related('user__groups', 'user__user_permissions')
+        eager = ReviewSerializer.setup_eager_loading(reviews)
+        measure('legacy nested __all__', LegacyReviewSerializer, legacy, {}, args.repeat)
+        measure('compact default', ReviewSerializer, eager, {}, args.repeat)
+        measure('?expand=movie', ReviewSerializer, eager, {'expand': 'movie'}, args.repeat)
+        measure('?fields=id,rating,movie', ReviewSerializer, eager, {'fields': 'id,rating,movie'}, args.repeat)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reviews', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,67 @@
+"""
+Movie title resolution on a large catalog: the previous iexact/icontains
+lookup versus the indexed normalized_title lookup in get_movie_from_db.
+
+    python -m benchmarks.title_lookup --movies 1000000
+"""
+import argparse
+import time
+
+from benchmarks.common import setup_django, report, test_database, timed
+
+setup_django()
+
+from movies.models import Movie
+from utils.movie_api import get_movie_from_db
+from utils.text import normalize_title
+
+WORDS = ['star', 'night', 'river', 'ghost', 'iron', 'last', 'dark', 'city', 'storm', 'king',
+         'blue', 'silent', 'broken', 'golden', 'wild', 'lost', 'winter', 'red', 'shadow', 'fire']
+
+
+def synthetic_title(index):
+    words = [WORDS[(index // len(WORDS) ** n) % len(WORDS)] for n in range(3)]
+    return f"The {' '.join(words).title()} {index}"
+
+
+def seed(count, batch_size=10000):
+    started = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        batch = []
+        for index in range(offset, min(count, offset + batch_size)):
+            title = synthetic_title(index)
+            batch.append(Movie(
+                title=title,
+                normalized_title=normalize_title(title),
+                external_id=f'tt{index:08d}',
+            ))
+        Movie.objects.bulk_create(batch)
+    print(f"seeded {count} movies in {time.perf_counter() - started:.1f}s")
+
+
+def legacy_lookup(movie_title):
+    # Previous get_movie_from_db
+    movie = Movie.objects.filter(title__iexact=movie_title).first()
+    if movie:
+        return movie
+    return Movie.objects.filter(title__icontains=movie_title).first()
+
+
+def main(args):
+    with test_database():
+        seed(args.movies)
+        hit = synthetic_title(args.movies // 2).upper()
+        miss = 'No Such Movie Title'
+        for label, title in [('exact hit', hit), ('miss', miss)]:
+            print(label)
+            latencies = timed(lambda: legacy_lookup(title), args.repeat)
+            report('  iexact/icontains', latencies, sum(latencies))
+            latencies = timed(lambda: get_movie_from_db(title), args.repeat)
+            report('  normalized index', latencies, sum(latencies))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--movies', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    main(parser.parse_args())
@@ -17,6 +17,71 @@ SECRET_KEY = os.environ.get('SECRET_KEY')
 
 #OMDB API
 OMDB_API_KEY = os.environ.get('OMDB_API_KEY')
+OMDB_API_URL = os.environ.get('OMDB_API_URL', 'http://www.omdbapi.com/')
+OMDB_CONNECTION_LIMIT = int(os.environ.get('OMDB_CONNECTION_LIMIT', 100))
+OMDB_CONNECTION_LIMIT_PER_HOST = int(os.environ.get('OMDB_CONNECTION_LIMIT_PER_HOST', 20))
+OMDB_KEEPALIVE_TIMEOUT = float(os.environ.get('OMDB_KEEPALIVE_TIMEOUT', 30))
+OMDB_CONNECT_TIMEOUT = float(os.environ.get('OMDB_CONNECT_TIMEOUT', 3))
+OMDB_REQUEST_TIMEOUT = float(os.environ.get('OMDB_REQUEST_TIMEOUT', 10))
+OMDB_SEARCH_RESULT_LIMIT = int(os.environ.get('OMDB_SEARCH_RESULT_LIMIT', 5))
+OMDB_SEARCH_CONCURRENCY = int(os.environ.get('OMDB_SEARCH_CONCURRENCY', 5))
+OMDB_SEARCH_ITEM_TIMEOUT = float(os.environ.get('OMDB_SEARCH_ITEM_TIMEOUT', 3))
+OMDB_SEARCH_DEADLINE = float(os.environ.get('OMDB_SEARCH_DEADLINE', 5))
+# Shared OMDB response cache tier; only useful with a cache shared between
+# processes, so off by default (the in-process tier is always on)
+OMDB_CACHE_ALIAS = os.environ.get('OMDB_CACHE_ALIAS', '')
+OMDB_CACHE_MAXSIZE = int(os.environ.get('OMDB_CACHE_MAXSIZE', 2048))
+OMDB_CACHE_TTL = int(os.environ.get('OMDB_CACHE_TTL', 60 * 60 * 24))
+OMDB_CACHE_NEGATIVE_TTL = int(os.environ.get('OMDB_CACHE_NEGATIVE_TTL', 60 * 10))
+OMDB_LOCK_ALIAS = os.environ.get('OMDB_LOCK_ALIAS')
+OMDB_LOCK_TIMEOUT = int(os.environ.get('OMDB_LOCK_TIMEOUT', 10))
+# Requests per second allowed across every process sharing the cache alias (0 disables;
+# the alias must be a shared backend, not the default local-memory cache),
+# and how long a request may wait for the next second's budget
+OMDB_RATE_LIMIT = int(os.environ.get('OMDB_RATE_LIMIT', 0))
+OMDB_RATE_LIMIT_ALIAS = os.environ.get('OMDB_RATE_LIMIT_ALIAS', 'default')
+OMDB_RATE_LIMIT_WAIT = float(os.environ.get('OMDB_RATE_LIMIT_WAIT', 0.5))
+# Stop calling OMDB for a cooldown once this share of recent calls failed
+OMDB_BREAKER_FAILURE_RATE = float(os.environ.get('OMDB_BREAKER_FAILURE_RATE', 0.5))
+OMDB_BREAKER_MIN_CALLS = int(os.environ.get('OMDB_BREAKER_MIN_CALLS', 10))
+OMDB_BREAKER_WINDOW = float(os.environ.get('OMDB_BREAKER_WINDOW', 30))
+OMDB_BREAKER_COOLDOWN = float(os.environ.get('OMDB_BREAKER_COOLDOWN', 30))
+
+# Typo-tolerant title matching
+MOVIE_TRIGRAM_INDEX = os.environ.get('MOVIE_TRIGRAM_INDEX', 'True') == 'True'
+MOVIE_TRIGRAM_INDEX_TTL = int(os.environ.get('MOVIE_TRIGRAM_INDEX_TTL', 300))
+MOVIE_FUZZY_MATCH_THRESHOLD = float(os.environ.get('MOVIE_FUZZY_MATCH_THRESHOLD', 0.9))
+MOVIE_SUGGESTION_THRESHOLD = float(os.environ.get('MOVIE_SUGGESTION_THRESHOLD', 0.5))
+
+# Movie search asks OMDB "always", or only when local matches don't fill the page ("auto")
+MOVIE_SEARCH_EXTERNAL = os.environ.get('MOVIE_SEARCH_EXTERNAL', 'always')
+# Store OMDB search results missing from the catalog, in the background
+MOVIE_SEARCH_WARM_CATALOG = os.environ.get('MOVIE_SEARCH_WARM_CATALOG', 'True') == 'True'
+
+# Accept reviews for unknown titles before OMDB answers (also per request with
+# "Prefer: respond-async"); manage.py resolve_pending_reviews resolves them
+REVIEW_DEFER_MOVIE_RESOLUTION = os.environ.get('REVIEW_DEFER_MOVIE_RESOLUTION', 'False') == 'True'
+REVIEW_RESOLVE_BATCH_SIZE = int(os.environ.get('REVIEW_RESOLVE_BATCH_SIZE', 50))
+REVIEW_RESOLVE_INTERVAL = float(os.environ.get('REVIEW_RESOLVE_INTERVAL', 1))
+REVIEW_RESOLVE_MAX_ATTEMPTS = int(os.environ.get('REVIEW_RESOLVE_MAX_ATTEMPTS', 5))
+
+# Background refresh of stale OMDB data (manage.py refresh_movies)
+MOVIE_REFRESH_MAX_AGE = int(os.environ.get('MOVIE_REFRESH_MAX_AGE', 60 * 60 * 24 * 7))
+MOVIE_REFRESH_BATCH_SIZE = int(os.environ.get('MOVIE_REFRESH_BATCH_SIZE', 100))
+MOVIE_REFRESH_INTERVAL = int(os.environ.get('MOVIE_REFRESH_INTERVAL', 300))
+OMDB_REFRESH_RATE = float(os.environ.get('OMDB_REFRESH_RATE', 1))
+OMDB_REFRESH_CONCURRENCY = int(os.environ.get('OMDB_REFRESH_CONCURRENCY', 4))
+
+# Seconds to cache movie list/detail and reviews-by-movie responses (0 disables;
+# ETags and 304s work either way). Writes invalidate entries through version
+# counters in the same cache, so RESPONSE_CACHE_ALIAS must be shared between
+# processes (not the default local-memory cache) to turn this on
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 0))
+RESPONSE_CACHE_ALIAS = os.environ.get('RESPONSE_CACHE_ALIAS', 'default')
+
+# Seconds to cache COUNT(*) for page-number pagination (0 disables)
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.environ.get('PAGINATION_COUNT_CACHE_TIMEOUT', 0))
+PAGINATION_COUNT_CACHE_ALIAS = os.environ.get('PAGINATION_COUNT_CACHE_ALIAS', 'default')
 
 DEBUG = os.environ.get('DEBUG', 'False') == 'True'
 
@@ -56,7 +121,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'utils.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -44,6 +44,7 @@ api_v1_patterns = [
     path('users/', include('users.urls')),
     path('reviews/', include('reviews.urls')),
     path('movies/', include('movies.urls')),
+    path('metrics/', include('utils.urls')),
     re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
     path('docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-docs'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
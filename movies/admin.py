@@ -4,6 +4,6 @@ from .models import Movie
 @admin.register(Movie)
 class MovieAdmin(admin.ModelAdmin):
     list_display = ('title', 'year', 'genre', 'imdb_rating')
-    list_filter = ('year', 'genre')
+    list_filter = ('year', 'genre', 'from_search')
     search_fields = ('title', 'director', 'actors')
     ordering = ('title',)
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Merging duplicate movies. Saves keyed on the title rather than the IMDb ID
+left several rows for one film behind; rows sharing an IMDb ID were merged
+when external_id became unique, and these helpers fold the copies without
+one. Like movies.ratings they take the model classes, so migrations can pass
+historical models.
+"""
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Count, Q
+from .ratings import rebuild_rating_aggregates
+from .search import unindex_movies
+
+
+def duplicate_groups(Movie, using='default'):
+    """
+    Yield ``(keeper, duplicates)`` for every film stored more than once. A
+    row without an IMDb ID belongs to the only row with the same normalized
+    title, an IMDb ID and a compatible year; with no such row, copies without
+    IDs sharing a title and year are folded into the oldest. Rows matching
+    several films (remakes) are left alone.
+    """
+    titles = (
+        Movie.objects.using(using).exclude(normalized_title='')
+        .values('normalized_title')
+        .annotate(rows=Count('id'), without_id=Count('id', filter=Q(external_id=None)))
+        .filter(rows__gt=1, without_id__gt=0)
+        .values_list('normalized_title', flat=True)
+    )
+    for normalized_title in list(titles):
+        movies = list(
+            Movie.objects.using(using).filter(normalized_title=normalized_title)
+            .only('id', 'external_id', 'year', 'created_at').order_by('created_at')
+        )
+        with_id = [movie for movie in movies if movie.external_id]
+        merged = defaultdict(list)
+        unmatched = defaultdict(list)
+        for movie in movies:
+            if movie.external_id:
+                continue
+            matches = [other for other in with_id if movie.year in (None, other.year)]
+            if len(matches) == 1:
+                merged[matches[0]].append(movie)
+            elif not matches:
+                unmatched[movie.year].append(movie)
+        yield from merged.items()
+        for keeper, *duplicates in unmatched.values():
+            if duplicates:
+                yield keeper, duplicates
+
+
+def merge_movies(Movie, Review, PendingMovie, keeper, duplicates, using='default'):
+    """
+    Move the reviews and pending titles of ``duplicates`` to ``keeper`` and
+    delete them. A user who reviewed several copies keeps their latest
+    review. Stored rating aggregates are left to rebuild_rating_aggregates.
+    """
+    duplicate_ids = [movie.pk for movie in duplicates]
+    reviews = (
+        Review.objects.using(using).filter(movie_id__in=[keeper.pk, *duplicate_ids])
+        .only('id', 'user_id', 'movie_id', 'updated_at').order_by('-updated_at')
+    )
+    reviewers, stale, moved = set(), [], []
+    for review in reviews:
+        if review.user_id in reviewers:
+            stale.append(review.pk)
+            continue
+        reviewers.add(review.user_id)
+        if review.movie_id != keeper.pk:
+            moved.append(review.pk)
+
+    Review.objects.using(using).filter(pk__in=stale).delete()
+    Review.objects.using(using).filter(pk__in=moved).update(movie_id=keeper.pk)
+    PendingMovie.objects.using(using).filter(movie_id__in=duplicate_ids).update(movie_id=keeper.pk)
+    Movie.objects.using(using).filter(pk__in=duplicate_ids).delete()
+    # Historical models send no signals, so the search index is cleaned here
+    unindex_movies(duplicate_ids, using)
+
+
+def merge_duplicate_movies(Movie, Review, PendingMovie, using='default'):
+    """
+    Merge every group found by duplicate_groups and return how many rows were removed
+    """
+    removed = 0
+    with transaction.atomic(using=using):
+        for keeper, duplicates in list(duplicate_groups(Movie, using)):
+            merge_movies(Movie, Review, PendingMovie, keeper, duplicates, using)
+            removed += len(duplicates)
+        if removed:
+            rebuild_rating_aggregates(Movie, Review, using)
+    return removed
@@ -0,0 +1,42 @@
+"""
+Facet counts for the movie list, read from indexes: genre counts from the
+genre relation's index on genre_id, decades from the year index.
+"""
+from django.db.models import Count, F
+from .models import Genre, Movie
+
+
+def genre_counts(movies):
+    """
+    ``[{'name', 'count'}]`` of the genres of ``movies``, most common first
+    """
+    rows = Movie.genres.through.objects.using(movies.db)
+    if movies.query.has_filters():
+        matching = movies.order_by().values('pk')
+        if movies.query.extra_tables or movies.query.extra:
+            # Raw SQL added by search_movies names movies_movie, which is
+            # aliased inside a subquery; run it on its own
+            matching = list(matching.values_list('pk', flat=True))
+        rows = rows.filter(movie__in=matching)
+    counts = dict(rows.order_by().values('genre_id').annotate(count=Count('genre_id')).values_list('genre_id', 'count'))
+    names = dict(Genre.objects.using(movies.db).filter(pk__in=counts).order_by().values_list('id', 'name'))
+    return sorted(
+        ({'name': names[genre_id], 'count': count} for genre_id, count in counts.items() if genre_id in names),
+        key=lambda facet: (-facet['count'], facet['name'])
+    )
+
+
+def decade_counts(movies):
+    """
+    ``[{'decade', 'count'}]`` of the release years of ``movies``, oldest first
+    """
+    return list(
+        movies.order_by().exclude(year=None)
+        .annotate(decade=F('year') / 10 * 10)
+        .values('decade').annotate(count=Count('year'))
+        .order_by('decade')
+    )
+
+
+def movie_facets(movies):
+    return {'genres': genre_counts(movies), 'decades': decade_counts(movies)}
@@ -0,0 +1,25 @@
+from rest_framework import filters
+from .search import search_movies
+
+
+class MovieSearchFilter(filters.SearchFilter):
+    """
+    ?search= backed by the full-text index instead of OR-ed icontains scans
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        return search_movies(queryset, ' '.join(search_terms))
+
+
+class MovieOrderingFilter(filters.OrderingFilter):
+    """
+    Orders search results by relevance unless ?ordering= is given
+    """
+
+    def get_default_ordering(self, view):
+        if view.request.query_params.get(filters.SearchFilter.search_param):
+            return ['-search_rank', 'title']
+        return super().get_default_ordering(view)
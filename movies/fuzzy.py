@@ -0,0 +1,260 @@
+"""
+In-process trigram index over normalized movie titles.
+
+Used to offer "did you mean" suggestions, and to resolve near-exact
+misspellings that OMDB does not know. The index is built lazily from the database on
+first use, kept current by Movie signals in this process and rebuilt every
+MOVIE_TRIGRAM_INDEX_TTL seconds to pick up writes from other processes. The
+rebuild runs on a background thread while lookups keep using the old index.
+"""
+import bisect
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import connections
+from utils.text import normalize_title
+
+logger = logging.getLogger(__name__)
+
+_NUMBERING_RE = re.compile(r'^(\d+|[ivx]+)$')
+_TITLE_YEAR_RE = re.compile(r'^(.*\S)\s*\((\d{4})\)$')
+
+
+def trigrams(normalized):
+    padded = f'  {normalized} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    # Titles are stored in integer slots: posting lists of small ints hash and
+    # intersect far faster than sets of UUIDs
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rebuilding = False
+        # (movie_id, normalized_title) changes made while a rebuild reads the
+        # database, replayed onto the new index; None when not rebuilding
+        self._changes = None
+        self._reset()
+
+    def _reset(self):
+        self._postings = defaultdict(set)
+        self._slots = {}
+        self._ids = []
+        self._titles = []
+        self._sizes = []
+        self._loaded_at = None
+
+    @property
+    def loaded(self):
+        return self._loaded_at is not None
+
+    def _add(self, movie_id, normalized):
+        grams = trigrams(normalized)
+        slot = len(self._ids)
+        self._slots[movie_id] = slot
+        self._ids.append(movie_id)
+        self._titles.append(normalized)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings[gram].add(slot)
+
+    def _remove(self, movie_id):
+        slot = self._slots.pop(movie_id, None)
+        if slot is None:
+            return
+        # The slot itself stays empty until the next rebuild
+        for gram in trigrams(self._titles[slot]):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(slot)
+                if not posting:
+                    del self._postings[gram]
+        self._ids[slot] = None
+        self._titles[slot] = ''
+
+    def load(self, rows):
+        """
+        Replace the index contents with (movie_id, normalized_title) rows. The
+        new index is built aside and swapped in, so lookups are only held up
+        for the swap.
+        """
+        with self._lock:
+            self._changes = []
+        try:
+            fresh = TrigramIndex()
+            for movie_id, normalized in rows:
+                if normalized:
+                    fresh._add(movie_id, normalized)
+            with self._lock:
+                self._postings, self._slots = fresh._postings, fresh._slots
+                self._ids, self._titles, self._sizes = fresh._ids, fresh._titles, fresh._sizes
+                for movie_id, normalized in self._changes:
+                    self._remove(movie_id)
+                    if normalized:
+                        self._add(movie_id, normalized)
+                self._loaded_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._changes = None
+
+    def _rows(self):
+        from .models import Movie
+        return Movie.objects.values_list('id', 'normalized_title').iterator(chunk_size=5000)
+
+    def _rebuild(self):
+        try:
+            self.load(self._rows())
+        except Exception as e:
+            # The old index stays in use and the next lookup tries again
+            logger.error(f"Error rebuilding the title index: {str(e)}")
+        finally:
+            self._rebuilding = False
+            connections.close_all()
+
+    def _start_rebuild(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, name='title-index', daemon=True).start()
+
+    def ensure_loaded(self):
+        """
+        Load the index on first use; once it is older than
+        MOVIE_TRIGRAM_INDEX_TTL, rebuild it in the background
+        """
+        if self.loaded:
+            if time.monotonic() - self._loaded_at >= getattr(settings, 'MOVIE_TRIGRAM_INDEX_TTL', 300):
+                self._start_rebuild()
+            return
+        with self._lock:
+            if not self.loaded:
+                self.load(self._rows())
+
+    def update(self, movie_id, normalized):
+        if not self.loaded:
+            return
+        with self._lock:
+            self._remove(movie_id)
+            if normalized:
+                self._add(movie_id, normalized)
+            if self._changes is not None:
+                self._changes.append((movie_id, normalized))
+
+    def remove(self, movie_id):
+        self.update(movie_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def search(self, title, limit=5, threshold=0.5):
+        """
+        Return up to ``limit`` (movie_id, similarity) pairs, best first, where
+        similarity is the Dice coefficient of the titles' trigram sets
+        """
+        normalized = normalize_title(title)
+        if not normalized:
+            return []
+        self.ensure_loaded()
+        query = trigrams(normalized)
+        # A title scoring >= threshold shares at least min_shared trigrams with
+        # the query, so it must appear in one of the len(query) - min_shared + 1
+        # shortest posting lists; the longer ones are only probed for the
+        # candidates found there
+        min_shared = max(1, math.ceil(threshold * len(query) / (2 - threshold)))
+        with self._lock:
+            postings = sorted((self._postings.get(gram, ()) for gram in query), key=len)
+            split = len(query) - min_shared + 1
+            shared = Counter()
+            for posting in postings[:split]:
+                shared.update(posting)
+            probed = postings[split:]
+
+            best = []
+            floor = threshold
+            sizes = self._sizes
+            query_size = len(query)
+            probed_count = len(probed)
+            for slot, count in shared.items():
+                size = query_size + sizes[slot]
+                # Skip candidates that could not reach the floor even if they
+                # contained every probed trigram
+                if 2 * (count + probed_count) < floor * size:
+                    continue
+                if probed:
+                    count += sum(1 for posting in probed if slot in posting)
+                score = 2 * count / size
+                if score >= floor:
+                    bisect.insort(best, (-score, slot))
+                    if len(best) > limit:
+                        best.pop()
+                    if len(best) == limit:
+                        floor = max(floor, -best[-1][0])
+            return [(self._ids[slot], -score) for score, slot in best]
+
+    def containing(self, normalized, limit=1):
+        """
+        Ids of titles containing ``normalized`` as a substring, shortest title first
+        """
+        if not normalized:
+            return []
+        self.ensure_loaded()
+        grams = [gram for gram in trigrams(normalized) if gram.strip() == gram]
+        with self._lock:
+            if not grams:
+                candidates = self._slots.values()
+            else:
+                postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+                candidates = set.intersection(*postings)
+            titles = self._titles
+            matches = [slot for slot in candidates if normalized in titles[slot]]
+            matches.sort(key=lambda slot: (len(titles[slot]), titles[slot]))
+            return [self._ids[slot] for slot in matches[:limit]]
+
+
+title_index = TrigramIndex()
+
+
+def fuzzy_enabled():
+    return getattr(settings, 'MOVIE_TRIGRAM_INDEX', True)
+
+
+def find_similar_movies(title, limit=5, threshold=None):
+    """
+    Return ``(movie, similarity)`` pairs for titles close to ``title``
+    """
+    from .models import Movie
+
+    if not fuzzy_enabled():
+        return []
+    if threshold is None:
+        threshold = getattr(settings, 'MOVIE_SUGGESTION_THRESHOLD', 0.5)
+    matches = title_index.search(title, limit=limit, threshold=threshold)
+    movies = Movie.objects.in_bulk([movie_id for movie_id, _ in matches])
+    # Rows deleted by another process may still be indexed until the next rebuild
+    return [(movies[movie_id], score) for movie_id, score in matches if movie_id in movies]
+
+
+def numbering(title):
+    """
+    Sequel and part numbers in a title ("2", "iii"), which trigram similarity
+    barely notices but which must match for two titles to be the same movie
+    """
+    return {token for token in normalize_title(title).split() if _NUMBERING_RE.match(token)}
+
+
+def split_year(title):
+    """
+    ("Alien", 1979) for "Alien (1979)"; (title, None) without a trailing year
+    """
+    match = _TITLE_YEAR_RE.match(title.strip())
+    return (match.group(1), int(match.group(2))) if match else (title, None)
+
+
+def suggest_titles(title, limit=5):
+    return [movie.title for movie, _ in find_similar_movies(title, limit=limit)]
@@ -0,0 +1,199 @@
+"""
+Bulk catalog import: stream titles or IMDb IDs from a CSV, JSONL or plain
+text file, fetch them from OMDB through a bounded worker pool and a rate
+limiter, and upsert them in batches keyed on external_id.
+
+Each batch is written while the next one is being fetched, and a checkpoint
+(records consumed plus running totals) is saved after every write, so an
+interrupted import resumes after the last stored batch. Identifiers that
+failed (HTTP errors, timeouts) are appended to a retry file, which is itself
+a valid JSONL input.
+"""
+import asyncio
+import csv
+import json
+import os
+import time
+from itertools import chain, islice
+from utils.async_bridge import async_bridge
+from utils.movie_api import fetch_movie_uncached, upsert_movies
+from utils.omdb_cache import NOT_FOUND
+from utils.rate_limit import AsyncTokenBucket
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.txt': 'txt'}
+ID_COLUMNS = ('imdb_id', 'imdbid', 'external_id')
+TITLE_COLUMNS = ('title',)
+
+
+def _pick(record, columns):
+    for column in columns:
+        value = record.get(column)
+        if value:
+            return str(value).strip()
+    return None
+
+
+def read_identifiers(path, format=None):
+    """
+    Yield one identifier (IMDb ID or title, None for an unusable record) per
+    record of ``path``, reading it lazily
+    """
+    format = format or FORMATS.get(os.path.splitext(path)[1].lower(), 'txt')
+    with open(path, newline='', encoding='utf-8') as source:
+        if format == 'csv':
+            rows = csv.reader(source)
+            first = next(rows, None)
+            if first is None:
+                return
+            header = [cell.strip().lower() for cell in first]
+            if not set(header) & {*ID_COLUMNS, *TITLE_COLUMNS}:
+                # No header: the first column holds the identifiers
+                for row in chain([first], rows):
+                    yield (row[0].strip() or None) if row else None
+                return
+            for row in rows:
+                record = dict(zip(header, row))
+                yield _pick(record, ID_COLUMNS) or _pick(record, TITLE_COLUMNS)
+        elif format == 'jsonl':
+            for line in source:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield None
+                    continue
+                if isinstance(record, dict):
+                    record = {key.lower(): value for key, value in record.items()}
+                    yield _pick(record, ID_COLUMNS) or _pick(record, TITLE_COLUMNS)
+                else:
+                    yield str(record).strip() or None
+        else:
+            for line in source:
+                if line.strip():
+                    yield line.strip()
+
+
+class ImportStats:
+    FIELDS = ('processed', 'imported', 'not_found', 'failed', 'skipped')
+
+    def __init__(self, **counts):
+        for field in self.FIELDS:
+            setattr(self, field, counts.get(field, 0))
+        self.started = time.perf_counter()
+        self.processed_at_start = self.processed
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @property
+    def rate(self):
+        """
+        Records per second processed by this run
+        """
+        elapsed = time.perf_counter() - self.started
+        return (self.processed - self.processed_at_start) / elapsed if elapsed else 0.0
+
+
+class Checkpoint:
+    """
+    Number of input records already stored, plus the running totals, kept
+    in a small JSON file replaced atomically
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as source:
+                return json.load(source)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, position, stats):
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as target:
+            json.dump({'position': position, **stats.as_dict()}, target)
+        os.replace(temporary, self.path)
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def fetch_batch(identifiers, limiter, workers, fetch=fetch_movie_uncached):
+    """
+    ``fetch`` every identifier (None for blanks), at most ``workers``
+    (a semaphore) at a time and paced by ``limiter``, if any
+    """
+    async def fetch_one(identifier):
+        if not identifier:
+            return None
+        async with workers:
+            if limiter is not None:
+                await limiter.acquire()
+            return await fetch(identifier)
+
+    return await asyncio.gather(*(fetch_one(identifier) for identifier in identifiers))
+
+
+def import_movies(path, format=None, concurrency=8, rate=10, batch_size=500,
+                  checkpoint_path=None, retry_path=None, restart=False, using='default', report=None):
+    """
+    Import every record of ``path`` (see the module docstring). ``report`` is
+    called with the ImportStats after each stored batch. Returns the stats.
+    """
+    checkpoint = Checkpoint(checkpoint_path or f'{path}.checkpoint')
+    retry_path = retry_path or f'{path}.failed.jsonl'
+    state = {} if restart else checkpoint.load()
+    position = state.get('position', 0)
+    stats = ImportStats(**{field: state.get(field, 0) for field in ImportStats.FIELDS})
+    if restart and os.path.exists(retry_path):
+        os.remove(retry_path)
+
+    limiter = AsyncTokenBucket(rate, capacity=concurrency)
+    workers = asyncio.Semaphore(concurrency)
+
+    def store(identifiers, future):
+        nonlocal position
+        results = future.result()
+        found, failed = [], []
+        for identifier, result in zip(identifiers, results):
+            if result is None:
+                stats.skipped += 1
+            elif result == NOT_FOUND:
+                stats.not_found += 1
+            elif 'error' in result:
+                failed.append(identifier)
+            else:
+                found.append(result)
+        stats.imported += len(upsert_movies(found, using))
+        if failed:
+            stats.failed += len(failed)
+            with open(retry_path, 'a', encoding='utf-8') as retries:
+                retries.writelines(json.dumps(identifier) + '\n' for identifier in failed)
+        stats.processed += len(identifiers)
+        position += len(identifiers)
+        checkpoint.save(position, stats)
+        if report is not None:
+            report(stats)
+
+    records = islice(read_identifiers(path, format), position, None)
+    # The batch being fetched and not stored yet
+    in_flight = None
+    try:
+        for batch in _batches(records, batch_size):
+            # Fetch this batch while the previous one is written
+            fetched, in_flight = in_flight, (batch, async_bridge.submit(fetch_batch(batch, limiter, workers)))
+            if fetched is not None:
+                store(*fetched)
+        if in_flight is not None:
+            fetched, in_flight = in_flight, None
+            store(*fetched)
+    finally:
+        if in_flight is not None:
+            in_flight[1].cancel()
+    return stats
@@ -0,0 +1,54 @@
+import os
+from django.core.management.base import BaseCommand, CommandError
+from movies.importer import import_movies
+
+
+class Command(BaseCommand):
+    help = (
+        "Import movies from a CSV, JSONL or text file of titles or IMDb IDs, fetching "
+        "them from OMDB concurrently. Re-running resumes from the last checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV (imdb_id and/or title columns, or one per row), JSONL or text file")
+        parser.add_argument('--format', choices=['csv', 'jsonl', 'txt'], help="Defaults to the file extension")
+        parser.add_argument('--concurrency', type=int, default=8, help="OMDB requests in flight at once")
+        parser.add_argument('--rate', type=float, default=10, help="OMDB requests per second")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--checkpoint', help="Checkpoint file (default: <path>.checkpoint)")
+        parser.add_argument('--retry-file', help="Where failed identifiers go (default: <path>.failed.jsonl)")
+        parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and start over")
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['path']):
+            raise CommandError(f"{options['path']} does not exist")
+        if options['concurrency'] < 1 or options['rate'] <= 0 or options['batch_size'] < 1:
+            raise CommandError("--concurrency, --rate and --batch-size must be positive")
+
+        def report(stats):
+            self.stdout.write(
+                f"{stats.processed} processed: {stats.imported} imported, {stats.not_found} not found, "
+                f"{stats.failed} failed, {stats.skipped} skipped ({stats.rate:.1f}/s)"
+            )
+
+        stats = import_movies(
+            options['path'],
+            format=options['format'],
+            concurrency=options['concurrency'],
+            rate=options['rate'],
+            batch_size=options['batch_size'],
+            checkpoint_path=options['checkpoint'],
+            retry_path=options['retry_file'],
+            restart=options['restart'],
+            using=options['database'],
+            report=report,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats.imported} movie(s) from {stats.processed} record(s)"
+        ))
+        if stats.failed:
+            self.stdout.write(self.style.WARNING(
+                f"{stats.failed} record(s) failed; retry them with: "
+                f"manage.py import_movies {options['retry_file'] or options['path'] + '.failed.jsonl'}"
+            ))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from movies.models import Movie
+from movies.ratings import find_rating_mismatches, rebuild_rating_aggregates
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = "Recompute the review aggregates stored on movies, or check them with --check"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Only report movies whose stored aggregates disagree with their reviews; "
+                 "exits with an error if any do"
+        )
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if options['check']:
+            mismatches = find_rating_mismatches(Movie, Review, using)
+            for movie_id, stored, expected in mismatches:
+                changed = ', '.join(
+                    f"{field}: {stored[field]} != {expected[field]}"
+                    for field in stored if stored[field] != expected[field]
+                )
+                self.stdout.write(f"{movie_id}: {changed}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} movie(s) have inconsistent rating aggregates")
+            self.stdout.write(self.style.SUCCESS("Rating aggregates are consistent"))
+            return
+
+        fixed = rebuild_rating_aggregates(Movie, Review, using, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating aggregates for {fixed} movie(s)"))
@@ -0,0 +1,36 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from movies.refresh import refresh_limiter, refresh_stale_movies
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-fetch the movies whose OMDB data is stalest, a batch per cycle, within the "
+        "OMDB_REFRESH_RATE request budget. Runs until interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Refresh one batch and exit")
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'MOVIE_REFRESH_BATCH_SIZE', 100))
+        parser.add_argument('--max-age', type=int, default=getattr(settings, 'MOVIE_REFRESH_MAX_AGE', 60 * 60 * 24 * 7),
+                            help="Seconds after which a movie is stale")
+        parser.add_argument('--interval', type=int, default=getattr(settings, 'MOVIE_REFRESH_INTERVAL', 300),
+                            help="Seconds to wait once no stale movies are left")
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        limiter = refresh_limiter()
+        while True:
+            counts = refresh_stale_movies(
+                limit=options['batch_size'], max_age=options['max_age'], limiter=limiter, using=options['database']
+            )
+            if any(counts.values()):
+                self.stdout.write(
+                    f"{counts['refreshed']} refreshed, {counts['not_found']} not found, {counts['failed']} failed"
+                )
+            if options['once']:
+                return
+            # Wait once the backlog is drained, or when OMDB is failing
+            if counts['refreshed'] + counts['not_found'] < options['batch_size']:
+                time.sleep(options['interval'])
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2025-04-08 05:37
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Movie',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for the object', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the object was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the object was last updated')),
+                ('title', models.CharField(max_length=255)),
+                ('external_id', models.CharField(blank=True, max_length=50, null=True)),
+                ('year', models.CharField(blank=True, max_length=20, null=True)),
+                ('rated', models.CharField(blank=True, max_length=20, null=True)),
+                ('runtime', models.CharField(blank=True, max_length=50, null=True)),
+                ('genre', models.CharField(blank=True, max_length=100, null=True)),
+                ('director', models.CharField(blank=True, max_length=255, null=True)),
+                ('actors', models.TextField(blank=True, null=True)),
+                ('plot', models.TextField(blank=True, null=True)),
+                ('poster', models.URLField(blank=True, null=True)),
+                ('imdb_rating', models.CharField(blank=True, max_length=10, null=True)),
+            ],
+            options={
+                'ordering': ['title'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='normalized_title',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Casefolded, accent and punctuation-free title used for lookups', max_length=255),
+        ),
+    ]
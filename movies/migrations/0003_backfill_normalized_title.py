@@ -0,0 +1,66 @@
+# Generated by Django 5.2 on 2026-10-18 04:31
+
+from django.db import migrations
+from django.db.models import Count
+from utils.text import normalize_title
+
+BATCH_SIZE = 1000
+
+
+def backfill_normalized_title(apps, schema_editor):
+    Movie = apps.get_model('movies', 'Movie')
+    batch = []
+    for movie in Movie.objects.only('id', 'title').iterator(chunk_size=BATCH_SIZE):
+        movie.normalized_title = normalize_title(movie.title)
+        batch.append(movie)
+        if len(batch) >= BATCH_SIZE:
+            Movie.objects.bulk_update(batch, ['normalized_title'])
+            batch = []
+    if batch:
+        Movie.objects.bulk_update(batch, ['normalized_title'])
+
+
+def merge_duplicate_external_ids(apps, schema_editor):
+    """
+    Make external_id unique: blank IDs become NULL and movies sharing an IMDb ID
+    are merged into the oldest row, moving their reviews across.
+    """
+    Movie = apps.get_model('movies', 'Movie')
+    Review = apps.get_model('reviews', 'Review')
+
+    Movie.objects.filter(external_id='').update(external_id=None)
+
+    duplicated = (
+        Movie.objects.exclude(external_id=None)
+        .values('external_id')
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)
+        .values_list('external_id', flat=True)
+    )
+    for external_id in list(duplicated):
+        keeper, *duplicates = Movie.objects.filter(external_id=external_id).order_by('created_at')
+        for duplicate in duplicates:
+            for review in Review.objects.filter(movie=duplicate).order_by('created_at'):
+                # A user may have reviewed both copies; keep their latest review
+                existing = Review.objects.filter(movie=keeper, user_id=review.user_id).first()
+                if existing is not None:
+                    if existing.updated_at >= review.updated_at:
+                        review.delete()
+                        continue
+                    existing.delete()
+                review.movie = keeper
+                review.save(update_fields=['movie'])
+            duplicate.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0002_movie_normalized_title'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_normalized_title, migrations.RunPython.noop),
+        migrations.RunPython(merge_duplicate_external_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_backfill_normalized_title'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='movie',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+    ]
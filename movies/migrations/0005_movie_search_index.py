@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-18 04:48
+
+from django.db import migrations
+from movies.search import FTS_TABLE, PG_SEARCH_INDEX, PG_SEARCH_VECTOR, rebuild_search_index
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"movie_id UNINDEXED, title, genre, director, actors, "
+            f"tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        rebuild_search_index(apps.get_model('movies', 'Movie'), connection.alias)
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {PG_SEARCH_INDEX} ON movies_movie USING GIN (({PG_SEARCH_VECTOR}))"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {PG_SEARCH_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_movie_unique_external_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.2 on 2026-10-18 05:20
+
+from django.db import migrations, models
+from utils.text import parse_rating, parse_runtime, parse_year
+
+BATCH_SIZE = 1000
+TYPED_FIELDS = {
+    'year': parse_year,
+    'runtime': parse_runtime,
+    'imdb_rating': parse_rating,
+}
+
+
+def _copy(apps, source_suffix, target_suffix, convert):
+    Movie = apps.get_model('movies', 'Movie')
+    columns = [f'{name}{source_suffix}' for name in TYPED_FIELDS]
+    targets = [f'{name}{target_suffix}' for name in TYPED_FIELDS]
+    batch = []
+    for movie in Movie.objects.only('id', *columns).iterator(chunk_size=BATCH_SIZE):
+        for name, parse in TYPED_FIELDS.items():
+            setattr(movie, f'{name}{target_suffix}', convert(name, parse, getattr(movie, f'{name}{source_suffix}')))
+        batch.append(movie)
+        if len(batch) >= BATCH_SIZE:
+            Movie.objects.bulk_update(batch, targets)
+            batch = []
+    if batch:
+        Movie.objects.bulk_update(batch, targets)
+
+
+def parse_columns(apps, schema_editor):
+    _copy(apps, '', '_typed', lambda name, parse, value: parse(value))
+
+
+def format_columns(apps, schema_editor):
+    def convert(name, parse, value):
+        if value is None:
+            return None
+        return f'{value} min' if name == 'runtime' else str(value)
+
+    _copy(apps, '_typed', '', convert)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_movie_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='year_typed',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='runtime_typed',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='imdb_rating_typed',
+            field=models.DecimalField(blank=True, decimal_places=1, max_digits=3, null=True),
+        ),
+        migrations.RunPython(parse_columns, format_columns),
+        migrations.RemoveField(
+            model_name='movie',
+            name='year',
+        ),
+        migrations.RemoveField(
+            model_name='movie',
+            name='runtime',
+        ),
+        migrations.RemoveField(
+            model_name='movie',
+            name='imdb_rating',
+        ),
+        migrations.RenameField(
+            model_name='movie',
+            old_name='year_typed',
+            new_name='year',
+        ),
+        migrations.RenameField(
+            model_name='movie',
+            old_name='runtime_typed',
+            new_name='runtime',
+        ),
+        migrations.RenameField(
+            model_name='movie',
+            old_name='imdb_rating_typed',
+            new_name='imdb_rating',
+        ),
+        migrations.AlterField(
+            model_name='movie',
+            name='runtime',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Runtime in minutes', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['year'], name='movie_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['imdb_rating'], name='movie_imdb_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2 on 2026-10-18 05:10
+
+import uuid
+from django.db import migrations, models
+from movies.relations import SOURCE_FIELDS, sync_movie_relations
+
+BATCH_SIZE = 200
+
+
+def backfill_relations(apps, schema_editor):
+    Movie = apps.get_model('movies', 'Movie')
+    using = schema_editor.connection.alias
+    batch = []
+    for movie in Movie.objects.using(using).only('id', *SOURCE_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        batch.append(movie)
+        if len(batch) >= BATCH_SIZE:
+            sync_movie_relations(Movie, batch, using)
+            batch = []
+    sync_movie_relations(Movie, batch, using)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_movie_typed_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for the object', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the object was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the object was last updated')),
+                ('name', models.CharField(max_length=255)),
+                ('normalized_name', models.CharField(editable=False, max_length=255, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for the object', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the object was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the object was last updated')),
+                ('name', models.CharField(max_length=255)),
+                ('normalized_name', models.CharField(editable=False, max_length=255, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'people',
+                'ordering': ['name'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='genres',
+            field=models.ManyToManyField(blank=True, related_name='movies', to='movies.genre'),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='cast',
+            field=models.ManyToManyField(blank=True, related_name='acted_movies', to='movies.person'),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='directors',
+            field=models.ManyToManyField(blank=True, related_name='directed_movies', to='movies.person'),
+        ),
+        migrations.RunPython(backfill_relations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 05:16
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_last_fetched_at(apps, schema_editor):
+    # Movies fetched from OMDB have not been refreshed since they were created
+    Movie = apps.get_model('movies', 'Movie')
+    Movie.objects.using(schema_editor.connection.alias).exclude(external_id=None).update(
+        last_fetched_at=F('created_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0009_genre_person'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='last_fetched_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, help_text='When the OMDB data was last fetched; the stalest movies are refreshed in the background', null=True),
+        ),
+        migrations.RunPython(backfill_last_fetched_at, migrations.RunPython.noop),
+    ]
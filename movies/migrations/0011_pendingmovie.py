@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 05:24
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0010_movie_last_fetched_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingMovie',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for the object', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the object was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the object was last updated')),
+                ('title', models.CharField(max_length=255)),
+                ('normalized_title', models.CharField(editable=False, max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('resolved', 'Resolved'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Failed OMDB lookups so far')),
+                ('error', models.CharField(blank=True, default='', max_length=255)),
+                ('movie', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='movies.movie')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='pending_movie_queue_idx'), models.Index(fields=['normalized_title', 'status'], name='pending_movie_title_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 05:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0011_pendingmovie'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='from_search',
+            field=models.BooleanField(default=False, editable=False, help_text='Added to the catalog from OMDB search results rather than a lookup of its own'),
+        ),
+    ]
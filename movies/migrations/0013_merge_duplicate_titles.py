@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 06:02
+
+from django.db import migrations
+from movies.dedup import merge_duplicate_movies
+
+
+def merge_duplicate_titles(apps, schema_editor):
+    merge_duplicate_movies(
+        apps.get_model('movies', 'Movie'),
+        apps.get_model('reviews', 'Review'),
+        apps.get_model('movies', 'PendingMovie'),
+        schema_editor.connection.alias
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0012_movie_from_search'),
+        ('reviews', '0004_review_pending_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_titles, migrations.RunPython.noop),
+    ]
@@ -1,23 +1,142 @@
 from django.db import models
 from utils.models import BaseModel
+from utils.text import normalize_title
+
+class NamedModel(BaseModel):
+    """
+    Genre or person, unique by normalized name
+    """
+    name = models.CharField(max_length=255)
+    normalized_name = models.CharField(max_length=255, unique=True, editable=False)
+
+    class Meta:
+        abstract = True
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_title(self.name)
+        super().save(*args, **kwargs)
+
+
+class Genre(NamedModel):
+    pass
+
+
+class Person(NamedModel):
+    class Meta(NamedModel.Meta):
+        verbose_name_plural = 'people'
+
 
 class Movie(BaseModel ):
     title = models.CharField(max_length=255)
-    external_id = models.CharField(max_length=50, blank=True, null=True)
-    year = models.CharField(max_length=20, blank=True, null=True)
+    normalized_title = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        db_index=True,
+        help_text="Casefolded, accent and punctuation-free title used for lookups"
+    )
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
+    year = models.PositiveSmallIntegerField(blank=True, null=True)
     rated = models.CharField(max_length=20, blank=True, null=True)
-    runtime = models.CharField(max_length=50, blank=True, null=True)
-    runtime = models.CharField(max_length=50, blank=True, null=True)
+    runtime = models.PositiveSmallIntegerField(blank=True, null=True, help_text="Runtime in minutes")
     genre = models.CharField(max_length=100, blank=True, null=True)
     director = models.CharField(max_length=255, blank=True, null=True)
     actors = models.TextField(blank=True, null=True)
     plot = models.TextField(blank=True, null=True)
     poster = models.URLField(blank=True, null=True)
-    imdb_rating = models.CharField(max_length=10, blank=True, null=True)
-    
+    imdb_rating = models.DecimalField(max_digits=3, decimal_places=1, blank=True, null=True)
+
+    last_fetched_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True,
+        help_text="When the OMDB data was last fetched; the stalest movies are refreshed in the background"
+    )
+    from_search = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="Added to the catalog from OMDB search results rather than a lookup of its own"
+    )
+
+    # Indexed relations derived from genre, director and actors (see movies.relations)
+    genres = models.ManyToManyField(Genre, blank=True, related_name='movies')
+    directors = models.ManyToManyField(Person, blank=True, related_name='directed_movies')
+    cast = models.ManyToManyField(Person, blank=True, related_name='acted_movies')
+
+    # Review aggregates, maintained by reviews.signals
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_1 = models.PositiveIntegerField(default=0, editable=False)
+    rating_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_5 = models.PositiveIntegerField(default=0, editable=False)
+    average_rating = models.FloatField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="rating_sum / review_count, stored so movies can be sorted and filtered by it"
+    )
     
     class Meta:
         ordering = ['title']
+        indexes = [
+            # Keyset pagination order (see utils.pagination.KeysetPagination)
+            models.Index(fields=['title', 'id'], name='movie_title_id_idx'),
+            models.Index(fields=['year'], name='movie_year_idx'),
+            models.Index(fields=['imdb_rating'], name='movie_imdb_rating_idx'),
+        ]
         
-        def __str__(self):
-            return self.title
\ No newline at end of file
+    def __str__(self):
+        return self.title
+
+    def save(self, *args, **kwargs):
+        self.normalized_title = normalize_title(self.title)
+        # Blank IDs would collide on the unique index
+        self.external_id = self.external_id or None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'title' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_title'}
+        super().save(*args, **kwargs)
+
+    @property
+    def rating_histogram(self):
+        return {rating: getattr(self, f'rating_{rating}') for rating in range(1, 6)}
+
+
+class PendingMovie(BaseModel):
+    """
+    A title reviews were accepted for before it was resolved to a movie.
+    The resolve_pending_reviews worker looks it up and links its reviews.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RESOLVED = 'resolved', 'Resolved'
+        FAILED = 'failed', 'Failed'
+
+    title = models.CharField(max_length=255)
+    normalized_title = models.CharField(max_length=255, editable=False)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    movie = models.ForeignKey(Movie, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Failed OMDB lookups so far")
+    error = models.CharField(max_length=255, blank=True, default='')
+
+    class Meta:
+        indexes = [
+            # The worker's queue and the per-title placeholder lookup
+            models.Index(fields=['status', 'created_at'], name='pending_movie_queue_idx'),
+            models.Index(fields=['normalized_title', 'status'], name='pending_movie_title_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        self.normalized_title = normalize_title(self.title)
+        super().save(*args, **kwargs)
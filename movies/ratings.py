@@ -0,0 +1,97 @@
+"""
+Review aggregates stored on Movie: review_count, rating_sum, a 1-5 histogram
+(rating_1 .. rating_5) and average_rating.
+
+Review signals apply deltas with one UPDATE per affected movie inside the
+review's transaction. rebuild_rating_aggregates recomputes them from the
+reviews table for anything that bypasses signals (queryset.update(),
+bulk_create(), raw SQL), and find_rating_mismatches reports such drift.
+"""
+import math
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+from utils import response_cache
+
+RATINGS = range(1, 6)
+COUNTER_FIELDS = ('review_count', 'rating_sum', *(f'rating_{rating}' for rating in RATINGS))
+AGGREGATE_FIELDS = (*COUNTER_FIELDS, 'average_rating')
+
+
+def apply_rating_changes(Movie, changes, using='default'):
+    """
+    Apply ``{movie_id: {rating: delta}}`` to the stored aggregates, e.g.
+    ``{movie.id: {4: 1}}`` for a new 4-star review
+    """
+    for movie_id, deltas in changes.items():
+        deltas = {rating: delta for rating, delta in deltas.items() if delta}
+        if not deltas:
+            continue
+        count_delta = sum(deltas.values())
+        review_count = F('review_count') + count_delta
+        rating_sum = F('rating_sum') + sum(rating * delta for rating, delta in deltas.items())
+        # Every right-hand side sees the row as it was before the UPDATE
+        Movie.objects.using(using).filter(pk=movie_id).update(
+            updated_at=timezone.now(),
+            review_count=review_count,
+            rating_sum=rating_sum,
+            average_rating=Case(
+                When(review_count=-count_delta, then=Value(0.0)),
+                default=Cast(rating_sum, FloatField()) / Cast(review_count, FloatField()),
+            ),
+            **{f'rating_{rating}': F(f'rating_{rating}') + delta for rating, delta in deltas.items()}
+        )
+
+
+def _empty_aggregates():
+    return {field: 0 for field in AGGREGATE_FIELDS}
+
+
+def expected_aggregates(Review, using='default'):
+    """
+    Aggregates computed from the reviews table, keyed by movie id
+    """
+    rows = Review.objects.using(using).order_by().values('movie_id').annotate(
+        review_count=Count('id'),
+        rating_sum=Sum('rating'),
+        **{f'rating_{rating}': Count('id', filter=Q(rating=rating)) for rating in RATINGS}
+    )
+    expected = {}
+    for row in rows:
+        values = {field: row[field] for field in COUNTER_FIELDS}
+        values['average_rating'] = row['rating_sum'] / row['review_count']
+        expected[row['movie_id']] = values
+    return expected
+
+
+def find_rating_mismatches(Movie, Review, using='default'):
+    """
+    Return ``(movie_id, stored, expected)`` for every movie whose stored
+    aggregates disagree with its reviews
+    """
+    expected = expected_aggregates(Review, using)
+    mismatches = []
+    movies = Movie.objects.using(using).order_by().only('id', *AGGREGATE_FIELDS)
+    for movie in movies.iterator(chunk_size=2000):
+        stored = {field: getattr(movie, field) for field in AGGREGATE_FIELDS}
+        wanted = expected.get(movie.id) or _empty_aggregates()
+        if (any(stored[field] != wanted[field] for field in COUNTER_FIELDS)
+                or not math.isclose(stored['average_rating'], wanted['average_rating'], abs_tol=1e-9)):
+            mismatches.append((movie.id, stored, wanted))
+    return mismatches
+
+
+def rebuild_rating_aggregates(Movie, Review, using='default', batch_size=1000):
+    """
+    Rewrite the aggregates of every movie that drifted from its reviews and
+    return how many were fixed
+    """
+    with transaction.atomic(using=using):
+        mismatches = find_rating_mismatches(Movie, Review, using)
+        now = timezone.now()
+        movies = [Movie(id=movie_id, updated_at=now, **wanted) for movie_id, _, wanted in mismatches]
+        Movie.objects.using(using).bulk_update(movies, [*AGGREGATE_FIELDS, 'updated_at'], batch_size=batch_size)
+        if movies:
+            response_cache.bump('movie', using=using)
+    return len(mismatches)
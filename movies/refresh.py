@@ -0,0 +1,77 @@
+"""
+Stale-while-revalidate for OMDB data. Requests are always served from the
+database; refresh_stale_movies re-fetches the movies whose data is oldest,
+one batch per cycle, within an OMDB request rate budget. The refresh_movies
+management command runs it in a loop.
+"""
+import asyncio
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from utils import response_cache
+from utils.async_bridge import async_bridge
+from utils.movie_api import refetch_movie_by_id, upsert_movies
+from utils.omdb_cache import NOT_FOUND
+from utils.rate_limit import AsyncTokenBucket
+from .importer import fetch_batch
+from .models import Movie
+
+
+def stale_movies(limit, max_age=None, using='default'):
+    """
+    Up to ``limit`` OMDB movies not fetched for ``max_age`` seconds, never
+    fetched ones first, then oldest first
+    """
+    if max_age is None:
+        max_age = getattr(settings, 'MOVIE_REFRESH_MAX_AGE', 60 * 60 * 24 * 7)
+    movies = Movie.objects.using(using).exclude(external_id=None).only('id', 'external_id', 'last_fetched_at')
+    stale = list(movies.filter(last_fetched_at=None)[:limit])
+    if len(stale) < limit:
+        cutoff = timezone.now() - timedelta(seconds=max_age)
+        stale += movies.filter(last_fetched_at__lt=cutoff).order_by('last_fetched_at')[:limit - len(stale)]
+    return stale
+
+
+def refresh_limiter():
+    """
+    Rate limiter for the OMDB_REFRESH_RATE budget; keep one per process so
+    the budget holds across cycles
+    """
+    return AsyncTokenBucket(getattr(settings, 'OMDB_REFRESH_RATE', 1), capacity=1)
+
+
+def refresh_stale_movies(limit=None, max_age=None, limiter=None, concurrency=None, using='default'):
+    """
+    Re-fetch one batch of stale movies by IMDb ID from OMDB itself (not the
+    response cache, which gets the fresh answers) and store the results.
+    Movies OMDB no longer knows are marked fetched so they do not block the
+    queue; failed fetches stay stale and are retried next cycle. Returns
+    ``{'refreshed', 'not_found', 'failed'}`` counts.
+    """
+    if limit is None:
+        limit = getattr(settings, 'MOVIE_REFRESH_BATCH_SIZE', 100)
+    if concurrency is None:
+        concurrency = getattr(settings, 'OMDB_REFRESH_CONCURRENCY', 4)
+    counts = {'refreshed': 0, 'not_found': 0, 'failed': 0}
+    movies = stale_movies(limit, max_age, using)
+    if not movies:
+        return counts
+
+    results = async_bridge.run(fetch_batch(
+        [movie.external_id for movie in movies], limiter or refresh_limiter(), asyncio.Semaphore(concurrency),
+        fetch=refetch_movie_by_id,
+    ))
+    found, missing = [], []
+    for movie, result in zip(movies, results):
+        if result == NOT_FOUND:
+            missing.append(movie.pk)
+        elif 'error' in result:
+            counts['failed'] += 1
+        else:
+            found.append(result)
+    counts['refreshed'] = len(upsert_movies(found, using))
+    now = timezone.now()
+    counts['not_found'] = Movie.objects.using(using).filter(pk__in=missing).update(last_fetched_at=now, updated_at=now)
+    if counts['not_found']:
+        response_cache.bump('movie', using=using)
+    return counts
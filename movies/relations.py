@@ -0,0 +1,76 @@
+"""
+Genre and Person relations of Movie, derived from the comma separated
+``genre``, ``director`` and ``actors`` strings OMDB returns.
+
+The strings stay on Movie as the rendered value; the many-to-many relations
+are what filters and facets query, through their indexes. Movie's post_save
+signal keeps them in step, and sync_movie_relations is also used by the
+backfill migration with historical models.
+"""
+from utils.text import normalize_title
+
+# Many-to-many field on Movie and the string field it is derived from
+RELATIONS = (
+    ('genres', 'genre'),
+    ('directors', 'director'),
+    ('cast', 'actors'),
+)
+SOURCE_FIELDS = frozenset(source for _, source in RELATIONS)
+
+
+def split_names(value):
+    """
+    ``{normalized name: display name}`` for "Action, Sci-Fi", skipping
+    blanks, duplicates and OMDB's "N/A"
+    """
+    names = {}
+    for name in (value or '').split(','):
+        name = ' '.join(name.split())
+        key = normalize_title(name)
+        if key and key != 'n a':
+            names.setdefault(key, name)
+    return names
+
+
+def _resolve(model, names, using):
+    """
+    Ids of the ``model`` rows for ``{normalized name: display name}``,
+    creating the missing ones
+    """
+    if not names:
+        return {}
+    manager = model.objects.using(using)
+    ids = dict(manager.filter(normalized_name__in=names).values_list('normalized_name', 'id'))
+    missing = [key for key in names if key not in ids]
+    if missing:
+        # A concurrent writer may create the same names; re-read the winners
+        manager.bulk_create(
+            [model(name=names[key], normalized_name=key) for key in missing], ignore_conflicts=True
+        )
+        ids.update(manager.filter(normalized_name__in=missing).values_list('normalized_name', 'id'))
+    return ids
+
+
+def sync_movie_relations(Movie, movies, using='default'):
+    """
+    Replace the genre, director and cast rows of ``movies`` with the names
+    in their string fields
+    """
+    movies = list(movies)
+    if not movies:
+        return
+    movie_ids = [movie.pk for movie in movies]
+    for field_name, source in RELATIONS:
+        field = Movie._meta.get_field(field_name)
+        Through = field.remote_field.through
+        Related = field.related_model
+        movie_column = field.m2m_field_name() + '_id'
+        related_column = field.m2m_reverse_field_name() + '_id'
+
+        wanted = {movie.pk: split_names(getattr(movie, source)) for movie in movies}
+        ids = _resolve(Related, {key: name for names in wanted.values() for key, name in names.items()}, using)
+        Through.objects.using(using).filter(**{f'{movie_column}__in': movie_ids}).delete()
+        Through.objects.using(using).bulk_create([
+            Through(**{movie_column: movie_id, related_column: ids[key]})
+            for movie_id, names in wanted.items() for key in names
+        ])
@@ -0,0 +1,126 @@
+"""
+Full-text search over movie titles, genres, directors and actors.
+
+On SQLite an FTS5 table (movies_movie_fts) is kept in sync with Movie by
+signals; on PostgreSQL a GIN index over a weighted tsvector expression is
+queried directly. Other backends fall back to icontains filters.
+"""
+import re
+from django.db import connections
+from django.db.models import Q, Value, FloatField
+
+FTS_TABLE = 'movies_movie_fts'
+SEARCH_FIELDS = ('title', 'genre', 'director', 'actors')
+
+# Title matches weigh most, then genre/director, then cast
+SQLITE_BM25_WEIGHTS = '0, 10.0, 4.0, 4.0, 1.0'
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(genre, '') || ' ' || coalesce(director, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(actors, '')), 'C')"
+)
+PG_SEARCH_INDEX = 'movies_movie_search_gin'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_tokens(term):
+    return _TOKEN_RE.findall(term or '')
+
+
+def _vendor(alias):
+    return connections[alias].vendor
+
+
+def search_movies(queryset, term):
+    """
+    Filter a Movie queryset to full-text matches of ``term`` (every word must
+    match, the last ones as prefixes) and annotate it with ``search_rank``,
+    higher being more relevant.
+    """
+    tokens = search_tokens(term)
+    if not tokens:
+        return queryset.none()
+
+    vendor = _vendor(queryset.db)
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.movie_id = movies_movie.id', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'-bm25({FTS_TABLE}, {SQLITE_BM25_WEIGHTS})'},
+        )
+
+    if vendor == 'postgresql':
+        query = ' & '.join(f'{token}:*' for token in tokens)
+        return queryset.extra(
+            where=[f"({PG_SEARCH_VECTOR}) @@ to_tsquery('english', %s)"],
+            params=[query],
+            select={'search_rank': f"ts_rank({PG_SEARCH_VECTOR}, to_tsquery('english', %s))"},
+            select_params=[query],
+        )
+
+    condition = Q()
+    for token in tokens:
+        token_condition = Q()
+        for field in SEARCH_FIELDS:
+            token_condition |= Q(**{f'{field}__icontains': token})
+        condition &= token_condition
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def _fts_rowid(movie_id):
+    # Stable integer key for the FTS row, so updates and deletes hit the rowid
+    # b-tree instead of scanning the (unindexed) movie_id column
+    return movie_id.int & ((1 << 63) - 1)
+
+
+def index_movies(movies, using='default'):
+    """
+    Write movies into the SQLite FTS table (a no-op on other backends)
+    """
+    if _vendor(using) != 'sqlite':
+        return
+    rows = [
+        (_fts_rowid(movie.id), movie.id.hex, movie.title or '', movie.genre or '',
+         movie.director or '', movie.actors or '')
+        for movie in movies
+    ]
+    if not rows:
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, movie_id, title, genre, director, actors) '
+            f'VALUES (%s, %s, %s, %s, %s, %s)',
+            rows
+        )
+
+
+def unindex_movies(movie_ids, using='default'):
+    if _vendor(using) != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(_fts_rowid(movie_id),) for movie_id in movie_ids]
+        )
+
+
+def rebuild_search_index(Movie, using='default', batch_size=1000):
+    """
+    Repopulate the SQLite FTS table from the movies table
+    """
+    if _vendor(using) != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    batch = []
+    movies = Movie.objects.using(using).only('id', 'title', 'genre', 'director', 'actors')
+    for movie in movies.iterator(chunk_size=batch_size):
+        batch.append(movie)
+        if len(batch) >= batch_size:
+            index_movies(batch, using)
+            batch = []
+    index_movies(batch, using)
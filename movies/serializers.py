@@ -1,9 +1,21 @@
 from rest_framework import serializers
+from utils.serializers import DynamicFieldsMixin
 from .models import Movie
 
 
-class MovieSerializer(serializers.ModelSerializer):
+class MovieSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Movie
-        fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
\ No newline at end of file
+        # The genre/person relations are rendered through their string fields
+        exclude = ['normalized_title', 'from_search', 'genres', 'directors', 'cast']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class MovieSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact movie representation nested in reviews
+    """
+    class Meta:
+        model = Movie
+        fields = ['id', 'title', 'year', 'average_rating']
+        read_only_fields = fields
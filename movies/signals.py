@@ -0,0 +1,36 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Movie
+from .fuzzy import title_index
+from .relations import SOURCE_FIELDS, split_names, sync_movie_relations
+from .search import index_movies, unindex_movies
+from utils import response_cache
+
+
+@receiver(post_save, sender=Movie)
+def index_saved_movie(sender, instance, using, **kwargs):
+    index_movies([instance], using)
+    # The in-memory index must not see rows a rollback would discard
+    transaction.on_commit(partial(title_index.update, instance.id, instance.normalized_title), using=using)
+
+
+@receiver(post_save, sender=Movie)
+def sync_saved_movie_relations(sender, instance, created, update_fields, using, **kwargs):
+    if update_fields is not None and not SOURCE_FIELDS & set(update_fields):
+        return
+    if created and not any(split_names(getattr(instance, field)) for field in SOURCE_FIELDS):
+        return
+    sync_movie_relations(sender, [instance], using)
+
+
+@receiver(post_delete, sender=Movie)
+def unindex_deleted_movie(sender, instance, using, **kwargs):
+    unindex_movies([instance.id], using)
+    transaction.on_commit(partial(title_index.remove, instance.id), using=using)
+
+
+@receiver([post_save, post_delete], sender=Movie)
+def invalidate_movie_responses(sender, using, **kwargs):
+    response_cache.bump('movie', using=using)
@@ -1,9 +1,35 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest.mock import AsyncMock, patch
+from datetime import timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
 from users.models import User
-from movies.models import Movie
+from movies.dedup import merge_duplicate_movies
+from movies.models import Genre, Movie, PendingMovie
+from movies.fuzzy import title_index, suggest_titles
+from movies.importer import import_movies
+from movies.ratings import find_rating_mismatches
+from movies.refresh import refresh_stale_movies
+from movies.relations import sync_movie_relations
+from movies.search import search_movies
+from movies.serializers import MovieSerializer
+from movies.views import MovieSearchAPIView
+from reviews.models import Review
+from utils.async_bridge import async_bridge
+from utils.movie_api import fetch_movie_by_id, find_stored_movie, get_movie_from_db, get_or_create_movie, save_movie_data
+from utils.testing import FakeOMDBMixin, QueryCountMixin, QueryPlanMixin, run_omdb
 
 class MovieAPITest(TestCase):
     def setUp(self):
@@ -32,4 +58,631 @@ class MovieAPITest(TestCase):
     def test_get_movie_detail(self):
         response = self.client.get(self.movie_detail_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['title'], 'Test Movie')
\ No newline at end of file
+        self.assertEqual(response.data['title'], 'Test Movie')
+
+    def test_sparse_fields(self):
+        response = self.client.get(self.movie_list_url, {'fields': 'id,title'})
+        self.assertEqual(response.data['results'], [{'id': str(self.movie.id), 'title': 'Test Movie'}])
+
+    def test_keyset_pagination(self):
+        Movie.objects.create(title='Test Movie')
+        Movie.objects.create(title='Another Movie')
+        response = self.client.get(self.movie_list_url, {'pagination': 'keyset', 'page_size': 2})
+        titles = [movie['title'] for movie in response.data['results']]
+        response = self.client.get(response.data['links']['next'])
+        titles += [movie['title'] for movie in response.data['results']]
+        self.assertEqual(titles, ['Another Movie', 'Test Movie', 'Test Movie'])
+        self.assertIsNone(response.data['links']['next'])
+
+    def test_order_and_filter_by_average_rating(self):
+        Movie.objects.create(title='Loved', review_count=2, rating_sum=9, average_rating=4.5)
+        Movie.objects.create(title='Liked', review_count=1, rating_sum=4, average_rating=4.0)
+        response = self.client.get(self.movie_list_url, {'ordering': '-average_rating'})
+        self.assertEqual([movie['title'] for movie in response.data['results']], ['Loved', 'Liked', 'Test Movie'])
+        response = self.client.get(self.movie_list_url, {'min_average_rating': '4', 'min_review_count': '2'})
+        self.assertEqual([movie['title'] for movie in response.data['results']], ['Loved'])
+
+    def test_order_and_filter_by_year_and_imdb_rating(self):
+        Movie.objects.create(title='Classic', year=1994, imdb_rating='10.0', runtime=142)
+        Movie.objects.create(title='Recent', year=2015, imdb_rating='7.5')
+        response = self.client.get(self.movie_list_url, {'ordering': '-imdb_rating'})
+        self.assertEqual([movie['title'] for movie in response.data['results']], ['Classic', 'Test Movie', 'Recent'])
+        self.assertEqual(response.data['results'][0]['runtime'], 142)
+        response = self.client.get(self.movie_list_url, {'year_min': '2000', 'year_max': '2025', 'ordering': 'year'})
+        self.assertEqual([movie['title'] for movie in response.data['results']], ['Recent', 'Test Movie'])
+        response = self.client.get(self.movie_list_url, {'min_imdb_rating': '8', 'year': 'soon'})
+        self.assertEqual([movie['title'] for movie in response.data['results']], ['Classic', 'Test Movie'])
+
+class MovieLookupTest(TestCase):
+    def setUp(self):
+        title_index.clear()
+        self.movie = Movie.objects.create(
+            title='Amélie: The Fabulous Destiny',
+            external_id='tt0211915'
+        )
+        self.sequel = Movie.objects.create(title='Amélie: The Fabulous Destiny II')
+
+    def test_normalized_title_is_maintained(self):
+        self.assertEqual(self.movie.normalized_title, 'amelie the fabulous destiny')
+        self.movie.title = 'Amelie!'
+        self.movie.save(update_fields=['title'])
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.normalized_title, 'amelie')
+
+    def test_lookup_ignores_case_accents_and_punctuation(self):
+        self.assertEqual(get_movie_from_db('  AMELIE   the fabulous destiny'), self.movie)
+
+    def test_lookup_by_prefix_and_imdb_id(self):
+        self.assertEqual(get_movie_from_db('Amelie'), self.movie)
+        self.assertEqual(get_movie_from_db('TT0211915'), self.movie)
+        self.assertEqual(get_movie_from_db('fabulous destiny ii'), self.sequel)
+
+    def test_blank_external_ids_do_not_collide(self):
+        Movie.objects.create(title='First', external_id='')
+        Movie.objects.create(title='Second', external_id='')
+        self.assertEqual(Movie.objects.filter(external_id=None).count(), 3)
+
+
+
+class MovieSaveTest(TestCase):
+    def movie_data(self, title, external_id=None):
+        return {'title': title, 'external_id': external_id, 'year': '2016', 'genre': 'Drama'}
+
+    def test_saves_upsert_on_the_imdb_id_in_one_statement(self):
+        stored = Movie.objects.create(title='Arrival (working title)', external_id='tt2543164')
+        with CaptureQueriesContext(connection) as queries:
+            movie = save_movie_data(self.movie_data('Arrival', 'tt2543164'))
+
+        self.assertEqual(movie.pk, stored.pk)
+        self.assertEqual((movie.title, movie.normalized_title, movie.year), ('Arrival', 'arrival', 2016))
+        self.assertEqual(Movie.objects.count(), 1)
+        # No read before the write
+        movie_queries = [query['sql'] for query in queries.captured_queries if '"movies_movie"' in query['sql']]
+        self.assertTrue(movie_queries[0].startswith('INSERT'))
+        self.assertIn('ON CONFLICT', movie_queries[0])
+
+    def test_data_without_an_imdb_id_updates_the_same_title(self):
+        stored = Movie.objects.create(title='Home Video')
+        self.assertEqual(save_movie_data(self.movie_data('home video')).pk, stored.pk)
+        self.assertEqual(Movie.objects.get().year, 2016)
+
+
+class MovieDeduplicationTest(TestCase):
+    def setUp(self):
+        self.first = User.objects.create_user(email='first@example.com', password='testpassword123')
+        self.second = User.objects.create_user(email='second@example.com', password='testpassword123')
+        self.arrival = Movie.objects.create(title='Arrival', external_id='tt2543164', year=2016)
+        self.copy = Movie.objects.create(title='Arrival', year=2016)
+        self.undated_copy = Movie.objects.create(title='arrival!')
+        self.solaris = [
+            Movie.objects.create(title='Solaris', external_id='tt0069293', year=1972),
+            Movie.objects.create(title='Solaris', external_id='tt0307479', year=2002),
+            Movie.objects.create(title='Solaris'),
+        ]
+
+    def merge(self):
+        return merge_duplicate_movies(Movie, Review, PendingMovie)
+
+    def test_copies_without_imdb_id_are_merged_with_their_reviews(self):
+        Review.objects.create(user=self.first, movie=self.arrival, content='Old take', rating=2)
+        Review.objects.create(user=self.first, movie=self.copy, content='Second viewing', rating=5)
+        Review.objects.create(user=self.second, movie=self.undated_copy, content='Lovely', rating=4)
+        pending = PendingMovie.objects.create(title='Arrival 2016', movie=self.copy, status=PendingMovie.Status.RESOLVED)
+
+        self.assertEqual(self.merge(), 2)
+
+        self.assertEqual(list(Movie.objects.filter(normalized_title='arrival')), [self.arrival])
+        self.assertEqual(
+            sorted(self.arrival.reviews.values_list('user__email', 'content')),
+            [('first@example.com', 'Second viewing'), ('second@example.com', 'Lovely')]
+        )
+        self.arrival.refresh_from_db()
+        self.assertEqual((self.arrival.review_count, self.arrival.average_rating), (2, 4.5))
+        self.assertEqual(find_rating_mismatches(Movie, Review), [])
+        pending.refresh_from_db()
+        self.assertEqual(pending.movie, self.arrival)
+        self.assertEqual(list(search_movies(Movie.objects.all(), 'arrival')), [self.arrival])
+
+    def test_ambiguous_titles_are_left_alone(self):
+        self.merge()
+        self.assertEqual(Movie.objects.filter(normalized_title='solaris').count(), 3)
+        self.assertEqual(self.merge(), 0)
+
+
+class MovieFullTextSearchTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.inception = Movie.objects.create(
+            title='Inception', genre='Sci-Fi', director='Christopher Nolan',
+            actors='Leonardo DiCaprio, Joseph Gordon-Levitt'
+        )
+        self.titanic = Movie.objects.create(
+            title='Titanic', genre='Romance', director='James Cameron',
+            actors='Leonardo DiCaprio, Kate Winslet'
+        )
+        self.leo = Movie.objects.create(
+            title='Leonardo', genre='Documentary', director='Someone Else', actors='Narrator'
+        )
+
+    def test_prefix_search_across_columns(self):
+        self.assertEqual(list(search_movies(Movie.objects.all(), 'incep')), [self.inception])
+        self.assertEqual(set(search_movies(Movie.objects.all(), 'dicaprio')), {self.inception, self.titanic})
+        self.assertEqual(list(search_movies(Movie.objects.all(), 'nolan sci')), [self.inception])
+
+    def test_title_matches_rank_first(self):
+        response = self.client.get(reverse('movie-list'), {'search': 'leonardo'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['results'][0]['title'], 'Leonardo')
+
+    def test_index_follows_saves_and_deletes(self):
+        self.titanic.title = 'Titanic Remastered'
+        self.titanic.save()
+        self.assertEqual(list(search_movies(Movie.objects.all(), 'remaster')), [self.titanic])
+        self.titanic.delete()
+        self.assertEqual(list(search_movies(Movie.objects.all(), 'titanic')), [])
+
+    def test_search_endpoint_uses_full_text_index(self):
+        with patch('movies.views.asearch_external_movies', AsyncMock(return_value=[])):
+            response = self.client.get(reverse('movie-search'), {'q': 'Cameron'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([movie['title'] for movie in response.data['local_results']], ['Titanic'])
+
+
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=300)
+class MovieResponseCacheTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpassword123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.arrival = Movie.objects.create(title='Arrival', year=2016)
+        self.heat = Movie.objects.create(title='Heat', year=1995)
+        self.list_url = reverse('movie-list')
+        self.detail_url = reverse('movie-detail', args=[self.arrival.id])
+
+    def test_repeated_reads_are_served_from_the_cache(self):
+        first = self.client.get(self.list_url, {'ordering': 'title', 'page_size': 5})
+        # The same query with its parameters in another order
+        with self.assertNumQueries(0):
+            second = self.client.get(f'{self.list_url}?page_size=5&ordering=title')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_writes_invalidate_cached_responses(self):
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+        self.arrival.title = 'Arrival (2016)'
+        self.arrival.save()
+
+        response = self.client.get(self.list_url)
+        self.assertEqual([movie['title'] for movie in response.data['results']], ['Arrival (2016)', 'Heat'])
+        self.assertEqual(self.client.get(self.detail_url).data['title'], 'Arrival (2016)')
+
+    def test_reviews_change_the_list_etag(self):
+        etag = self.client.get(self.list_url)['ETag']
+        Review.objects.create(user=self.user, movie=self.heat, content='Tense', rating=5)
+        response = self.client.get(self.list_url)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['results'][1]['review_count'], 1)
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_conditional_get_is_answered_without_serializing(self):
+        response = self.client.get(self.list_url)
+        self.assertTrue(response['ETag'].startswith('"'))
+        with patch.object(MovieSerializer, 'to_representation') as to_representation, self.assertNumQueries(1):
+            not_modified = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        to_representation.assert_not_called()
+
+        since = self.client.get(self.detail_url)['Last-Modified']
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cached_responses_still_answer_conditional_gets(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class MovieSearchAPITest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpassword123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.inception = Movie.objects.create(title='Inception', director='Christopher Nolan', external_id='tt1375666')
+        self.external = [
+            {'title': 'Inception', 'external_id': 'tt1375666'},
+            {'title': 'Inception: The Cobol Job', 'external_id': 'tt5295894'},
+        ]
+
+    def test_external_results_leave_out_local_movies(self):
+        with patch('movies.views.asearch_external_movies', AsyncMock(return_value=self.external)):
+            response = self.client.get(reverse('movie-search'), {'q': 'Inception'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([movie['title'] for movie in response.data['local_results']], ['Inception'])
+        self.assertEqual([movie['title'] for movie in response.data['external_results']], ['Inception: The Cobol Job'])
+
+    def test_local_and_external_searches_overlap(self):
+        local_results = MovieSearchAPIView.local_results
+
+        def slow_local_results(view, search_term):
+            time.sleep(0.3)
+            return local_results(view, search_term)
+
+        async def slow_external_search(search_term):
+            await asyncio.sleep(0.3)
+            return self.external
+
+        started = time.perf_counter()
+        with patch.object(MovieSearchAPIView, 'local_results', slow_local_results), \
+                patch('movies.views.asearch_external_movies', slow_external_search):
+            response = self.client.get(reverse('movie-search'), {'q': 'Inception'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLess(time.perf_counter() - started, 0.55)
+
+    def test_auto_skips_external_search_when_local_results_fill_the_page(self):
+        for index in range(MovieSearchAPIView.local_limit - 1):
+            Movie.objects.create(title=f'Inception Sequel {index}')
+        with patch('movies.views.asearch_external_movies', AsyncMock(return_value=self.external)) as search:
+            response = self.client.get(reverse('movie-search'), {'q': 'Inception', 'external': 'auto'})
+            self.assertEqual(response.data['external_results'], [])
+            search.assert_not_awaited()
+
+            response = self.client.get(reverse('movie-search'), {'q': 'Inception'})
+            self.assertEqual(len(response.data['external_results']), 1)
+
+    def test_auto_searches_externally_when_local_results_are_short(self):
+        with patch('movies.views.asearch_external_movies', AsyncMock(return_value=self.external)) as search:
+            response = self.client.get(reverse('movie-search'), {'q': 'Inception', 'external': 'auto'})
+        search.assert_awaited_once_with('Inception')
+        self.assertEqual(len(response.data['external_results']), 1)
+
+    def test_unknown_external_mode_is_rejected(self):
+        response = self.client.get(reverse('movie-search'), {'q': 'Inception', 'external': 'sometimes'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_ndjson_stream_sends_local_results_before_external_ones(self):
+        released = asyncio.Event()
+
+        async def external_search(search_term):
+            await released.wait()
+            return self.external
+
+        client = AsyncClient()
+        headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}',
+            'Accept': 'application/x-ndjson',
+        }
+        with patch('movies.views.asearch_external_movies', external_search):
+            response = await client.get(reverse('movie-search'), {'q': 'Inception'}, headers=headers)
+            self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+            lines = aiter(response.streaming_content)
+            # Local results arrive while OMDB is still pending
+            local = json.loads(await asyncio.wait_for(anext(lines), 5))
+            released.set()
+            external = json.loads(await asyncio.wait_for(anext(lines), 5))
+
+        self.assertEqual([movie['title'] for movie in local['local_results']], ['Inception'])
+        self.assertEqual([movie['title'] for movie in external['external_results']], ['Inception: The Cobol Job'])
+
+
+class MovieFuzzyMatchTest(FakeOMDBMixin, TestCase):
+    omdb_titles = ['Aliens', 'The Dark Knight Rises']
+
+    def setUp(self):
+        super().setUp()
+        title_index.clear()
+        self.godfather = Movie.objects.create(title='The Godfather')
+        self.godfather_2 = Movie.objects.create(title='The Godfather Part II')
+        self.shawshank = Movie.objects.create(title='The Shawshank Redemption', year=1994)
+        self.alien = Movie.objects.create(title='Alien', year=1979)
+        self.dark_knight = Movie.objects.create(title='The Dark Knight', year=2008)
+
+    def test_near_titles_resolve_to_their_own_movie(self):
+        self.assertIsNone(find_stored_movie('Aliens'))
+        self.assertIsNone(find_stored_movie('The Dark Knight Rises'))
+        aliens = get_or_create_movie('Aliens')
+        sequel = get_or_create_movie('The Dark Knight Rises')
+        self.assertEqual((aliens.title, aliens.external_id), ('Aliens', 'tt0000001'))
+        self.assertEqual((sequel.title, sequel.external_id), ('The Dark Knight Rises', 'tt0000002'))
+
+    def test_near_titles_unknown_externally_are_not_merged(self):
+        self.assertIsNone(get_or_create_movie('Alienz'))
+        self.assertIsNone(get_or_create_movie('The Dark Knight Returns'))
+        self.assertEqual(self.server.requests['t', 'Alienz'], 1)
+
+    def test_misspelled_title_resolves_after_external_miss(self):
+        self.assertEqual(get_or_create_movie('The Shawshank Redemptio'), self.shawshank)
+        self.assertEqual(self.server.requests['t', 'The Shawshank Redemptio'], 1)
+
+    def test_year_must_match(self):
+        self.assertEqual(get_or_create_movie('The Shawshank Redemptio (1994)'), self.shawshank)
+        self.assertIsNone(get_or_create_movie('The Shawshank Redemptio (2004)'))
+
+    def test_sequel_numbers_must_match(self):
+        self.assertIsNone(get_or_create_movie('The Godfather Part III'))
+
+    def test_suggestions_are_ranked(self):
+        self.assertEqual(suggest_titles('godfather part 2')[:2], ['The Godfather Part II', 'The Godfather'])
+        self.assertEqual(suggest_titles('zzzz'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        title_index.ensure_loaded()
+        with self.captureOnCommitCallbacks(execute=True):
+            movie = Movie.objects.create(title='Pulp Fiction')
+        self.assertEqual(suggest_titles('pulp fictoin'), ['Pulp Fiction'])
+        with self.captureOnCommitCallbacks(execute=True):
+            movie.title = 'Reservoir Dogs'
+            movie.save()
+        self.assertEqual(suggest_titles('pulp fictoin'), [])
+        self.assertEqual(suggest_titles('reservoir dgs'), ['Reservoir Dogs'])
+        with self.captureOnCommitCallbacks(execute=True):
+            movie.delete()
+        self.assertEqual(suggest_titles('reservoir dgs'), [])
+
+    def test_rolled_back_saves_are_not_indexed(self):
+        title_index.ensure_loaded()
+        with self.captureOnCommitCallbacks(execute=False):
+            Movie.objects.create(title='Pulp Fiction')
+        self.assertEqual(title_index.search('pulp fiction'), [])
+
+    def test_stale_index_is_rebuilt_in_the_background(self):
+        title_index.ensure_loaded()
+        # bulk_create sends no signals, like a write from another process
+        Movie.objects.bulk_create([Movie(title='Pulp Fiction', normalized_title='pulp fiction')])
+        with override_settings(MOVIE_TRIGRAM_INDEX_TTL=0), patch.object(title_index, '_start_rebuild') as start:
+            self.assertEqual(suggest_titles('pulp fictoin'), [])
+        start.assert_called_once()
+        title_index.load(title_index._rows())
+        self.assertEqual(suggest_titles('pulp fictoin'), ['Pulp Fiction'])
+
+    def test_changes_during_rebuild_are_kept(self):
+        title_index.ensure_loaded()
+
+        def rows():
+            yield from Movie.objects.values_list('id', 'normalized_title')
+            # Saved and deleted after the rebuild read the table
+            title_index.update(self.alien.pk, 'alien director s cut')
+            title_index.remove(self.shawshank.pk)
+
+        title_index.load(rows())
+        self.assertEqual(suggest_titles('alien directors cut'), ['Alien'])
+        self.assertEqual(suggest_titles('shawshank redemption'), [])
+
+    def test_substring_lookup_uses_index(self):
+        title_index.ensure_loaded()
+        # Exact and prefix lookups, then a primary-key fetch of the indexed candidate
+        with self.assertNumQueries(3):
+            self.assertEqual(get_movie_from_db('shawshank'), self.shawshank)
+
+
+class MovieListQueryCountTest(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='test@example.com', password='testpassword123')
+        self.client.force_authenticate(user=self.user)
+
+    def add_movies(self, count):
+        start = Movie.objects.count()
+        Movie.objects.bulk_create(Movie(title=f'Movie {start + i}') for i in range(count))
+
+    def test_movie_list(self):
+        self.assertConstantQueries(reverse('movie-list'), self.add_movies)
+
+
+class MovieRelationsTest(QueryPlanMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(email='facets@example.com', password='pass'))
+        self.heat = Movie.objects.create(
+            title='Heat', year=1995, genre='Action, Crime, Drama', director='Michael Mann',
+            actors='Al Pacino, Robert De Niro'
+        )
+        self.irishman = Movie.objects.create(
+            title='The Irishman', year=2019, genre='Crime, Drama', director='Martin Scorsese',
+            actors='Robert De Niro, Al Pacino, Joe Pesci'
+        )
+        self.alien = Movie.objects.create(title='Alien', year=1979, genre='Horror, Sci-Fi', director='N/A')
+
+    def titles(self, params):
+        response = self.client.get(reverse('movie-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [movie['title'] for movie in response.data['results']]
+
+    def test_relations_follow_the_strings(self):
+        self.assertEqual([genre.name for genre in self.alien.genres.all()], ['Horror', 'Sci-Fi'])
+        self.assertFalse(self.alien.directors.exists())
+        self.assertEqual(self.irishman.cast.count(), 3)
+        self.alien.genre = 'Sci-Fi,  horror , Thriller'
+        self.alien.save(update_fields=['genre'])
+        self.assertEqual([genre.name for genre in self.alien.genres.all()], ['Horror', 'Sci-Fi', 'Thriller'])
+        self.assertEqual(Genre.objects.filter(name__iexact='horror').count(), 1)
+
+    def test_filters(self):
+        self.assertEqual(self.titles({'genre': 'sci fi'}), ['Alien'])
+        self.assertEqual(self.titles({'actor': 'robert de niro'}), ['Heat', 'The Irishman'])
+        self.assertEqual(self.titles({'actor': 'Al Pacino', 'director': 'Martin Scorsese'}), ['The Irishman'])
+        self.assertEqual(self.titles({'genre': 'Act'}), [])
+
+    def test_facets(self):
+        response = self.client.get(reverse('movie-facets'))
+        self.assertEqual(response.data['genres'][:2], [{'name': 'Crime', 'count': 2}, {'name': 'Drama', 'count': 2}])
+        self.assertEqual(len(response.data['genres']), 5)
+        self.assertEqual(
+            response.data['decades'],
+            [{'decade': 1970, 'count': 1}, {'decade': 1990, 'count': 1}, {'decade': 2010, 'count': 1}]
+        )
+        response = self.client.get(reverse('movie-facets'), {'actor': 'Al Pacino'})
+        self.assertEqual(
+            response.data['genres'],
+            [{'name': 'Crime', 'count': 2}, {'name': 'Drama', 'count': 2}, {'name': 'Action', 'count': 1}]
+        )
+        self.assertEqual(len(response.data['decades']), 2)
+
+    def test_facets_with_search(self):
+        response = self.client.get(reverse('movie-facets'), {'search': 'pacino'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['genres'],
+            [{'name': 'Crime', 'count': 2}, {'name': 'Drama', 'count': 2}, {'name': 'Action', 'count': 1}]
+        )
+        self.assertEqual(response.data['decades'], [{'decade': 1990, 'count': 1}, {'decade': 2010, 'count': 1}])
+
+    def test_query_plans(self):
+        movies = Movie.objects.bulk_create(
+            Movie(title=f'Movie {index}', year=1950 + index % 70, genre=f'Genre {index % 20}, Drama',
+                  director=f'Director {index % 50}', actors=f'Actor {index % 300}, Actor {index % 7}')
+            for index in range(1000)
+        )
+        sync_movie_relations(Movie, movies)
+        for url, params in [
+            (reverse('movie-list'), {'genre': 'Genre 3'}),
+            (reverse('movie-list'), {'actor': 'Actor 12', 'director': 'Director 12'}),
+            (reverse('movie-facets'), {}),
+            (reverse('movie-facets'), {'genre': 'Genre 3'}),
+        ]:
+            with self.subTest(url=url, params=params):
+                self.assertNoFullScans(url, params)
+
+
+class ImportMoviesCommandTest(FakeOMDBMixin, TestCase):
+    omdb_titles = ['Alpha', 'Beta', 'Gamma', 'Delta', 'Epsilon']
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as target:
+            target.write(content)
+        return path
+
+    def run_import(self, path, *args):
+        output = StringIO()
+        call_command('import_movies', path, '--batch-size', '2', '--rate', '1000', *args, stdout=output)
+        return output.getvalue()
+
+    def test_imports_csv_by_id_and_title(self):
+        path = self.write('catalog.csv', 'imdb_id,title\ntt0000001,\n,Beta\n,Missing Movie\ntt0000003,Gamma\n,\n')
+        output = self.run_import(path)
+        self.assertIn('5 processed: 3 imported, 1 not found, 0 failed, 1 skipped', output)
+        self.assertEqual(sorted(Movie.objects.values_list('external_id', flat=True)), ['tt0000001', 'tt0000002', 'tt0000003'])
+        alpha = Movie.objects.get(external_id='tt0000001')
+        self.assertEqual((alpha.normalized_title, alpha.year, alpha.runtime), ('alpha', 2010, 148))
+        self.assertEqual([genre.name for genre in alpha.genres.all()], ['Action', 'Sci-Fi'])
+        self.assertEqual(list(search_movies(Movie.objects.all(), 'gamma')), [Movie.objects.get(title='Gamma')])
+
+    def test_upserts_on_external_id(self):
+        Movie.objects.create(title='Old Alpha', external_id='tt0000001', year=1999)
+        self.run_import(self.write('ids.txt', 'tt0000001\ntt0000001\n'))
+        movie = Movie.objects.get()
+        self.assertEqual((movie.title, movie.year), ('Alpha', 2010))
+
+    def test_resumes_from_checkpoint(self):
+        path = self.write('catalog.jsonl', '\n'.join(json.dumps(row) for row in [
+            {'imdbID': 'tt0000001'}, {'title': 'Beta'}, 'tt0000003', {'imdb_id': 'tt0000004'}, 'Epsilon',
+        ]))
+        with open(f'{path}.checkpoint', 'w', encoding='utf-8') as checkpoint:
+            json.dump({'position': 2, 'processed': 2, 'imported': 2}, checkpoint)
+        output = self.run_import(path)
+        self.assertIn('5 processed: 5 imported', output)
+        self.assertEqual(Movie.objects.count(), 3)
+        self.assertEqual(self.server.total_requests, 3)
+
+        self.server.reset()
+        self.run_import(path)
+        self.assertEqual(self.server.total_requests, 0)
+        self.run_import(path, '--restart')
+        self.assertEqual(self.server.total_requests, 5)
+
+    def test_failed_records_go_to_the_retry_file(self):
+        self.server.failures['tt0000002'] = 503
+        path = self.write('ids.txt', 'tt0000001\ntt0000002\ntt0000003\n')
+        output = self.run_import(path)
+        self.assertIn('1 failed', output)
+        self.assertEqual(Movie.objects.count(), 2)
+
+        self.server.failures.clear()
+        self.run_import(f'{path}.failed.jsonl')
+        self.assertTrue(Movie.objects.filter(external_id='tt0000002').exists())
+
+    def test_failing_batch_cancels_the_one_in_flight(self):
+        self.server.delays['tt0000005'] = 5
+        path = self.write('ids.txt', ''.join(f'tt000000{index}\n' for index in range(1, 6)))
+        futures = []
+        submit = async_bridge.submit
+
+        def track(coro):
+            futures.append(submit(coro))
+            return futures[-1]
+
+        with patch('movies.importer.async_bridge.submit', side_effect=track), \
+                patch('movies.importer.upsert_movies', side_effect=[[], RuntimeError('disk full')]):
+            with self.assertRaises(RuntimeError):
+                import_movies(path, batch_size=2, rate=1000)
+        self.assertEqual(len(futures), 3)
+        self.assertTrue(futures[2].cancelled())
+        with open(f'{path}.checkpoint', encoding='utf-8') as checkpoint:
+            self.assertEqual(json.load(checkpoint)['position'], 2)
+
+
+class RefreshStaleMoviesTest(FakeOMDBMixin, TestCase):
+    omdb_titles = ['Alpha', 'Beta', 'Gamma']
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.alpha = Movie.objects.create(title='Alpha', external_id='tt0000001', imdb_rating='6.0')
+        self.beta = Movie.objects.create(title='Beta', external_id='tt0000002', imdb_rating='6.0')
+        self.gone = Movie.objects.create(title='Gone', external_id='tt0000099')
+        self.fresh = Movie.objects.create(title='Gamma', external_id='tt0000003', imdb_rating='6.0')
+        Movie.objects.create(title='Local only')
+        for movie, age in [(self.alpha, 30), (self.beta, 10), (self.gone, 20), (self.fresh, 1)]:
+            Movie.objects.filter(pk=movie.pk).update(last_fetched_at=now - timedelta(days=age))
+
+    def test_refreshes_the_stalest_movies_first(self):
+        counts = refresh_stale_movies(limit=2, max_age=7 * 24 * 3600)
+        self.assertEqual(counts, {'refreshed': 1, 'not_found': 1, 'failed': 0})
+        self.alpha.refresh_from_db()
+        self.assertEqual(str(self.alpha.imdb_rating), '8.0')
+        self.assertGreater(self.alpha.last_fetched_at, timezone.now() - timedelta(minutes=1))
+        self.beta.refresh_from_db()
+        self.assertEqual(str(self.beta.imdb_rating), '6.0')
+        self.assertEqual(self.server.total_requests, 2)
+
+        self.assertEqual(refresh_stale_movies(limit=2, max_age=7 * 24 * 3600)['refreshed'], 1)
+        self.assertEqual(refresh_stale_movies(limit=2, max_age=7 * 24 * 3600), {'refreshed': 0, 'not_found': 0, 'failed': 0})
+        self.fresh.refresh_from_db()
+        self.assertEqual(str(self.fresh.imdb_rating), '6.0')
+
+    def test_refreshes_bypass_and_update_the_omdb_cache(self):
+        run_omdb(fetch_movie_by_id('tt0000001'))
+        self.server.add_movie('Alpha', 'tt0000001', imdbRating='9.1')
+        self.addCleanup(self.server.add_movie, 'Alpha', 'tt0000001')
+        refresh_stale_movies(limit=1, max_age=7 * 24 * 3600)
+        self.alpha.refresh_from_db()
+        self.assertEqual(str(self.alpha.imdb_rating), '9.1')
+        self.assertEqual(self.server.requests['i', 'tt0000001'], 2)
+        self.assertEqual(run_omdb(fetch_movie_by_id('tt0000001'))['imdb_rating'], '9.1')
+
+    def test_failed_fetches_stay_stale(self):
+        self.server.failures['tt0000001'] = 503
+        output = StringIO()
+        call_command('refresh_movies', '--once', '--batch-size', '1', stdout=output)
+        self.assertIn('0 refreshed, 0 not found, 1 failed', output.getvalue())
+        self.alpha.refresh_from_db()
+        self.assertLess(self.alpha.last_fetched_at, timezone.now() - timedelta(days=7))
+
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import MovieListAPIView, MovieDetailAPIView, MovieSearchAPIView
+from .views import MovieListAPIView, MovieDetailAPIView, MovieSearchAPIView, MovieFacetsAPIView
 
 urlpatterns = [
     path('', MovieListAPIView.as_view(), name='movie-list'),
     path('<uuid:pk>/', MovieDetailAPIView.as_view(), name='movie-detail'),
     path('search/', MovieSearchAPIView.as_view(), name='movie-search'),
+    path('facets/', MovieFacetsAPIView.as_view(), name='movie-facets'),
 ]
\ No newline at end of file
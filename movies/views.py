@@ -1,13 +1,66 @@
-from rest_framework import generics, filters, status, mixins
+import asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
+from rest_framework import generics, status, mixins
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Movie
 from .serializers import MovieSerializer
+from .facets import movie_facets
+from .filters import MovieSearchFilter, MovieOrderingFilter
+from .search import search_movies
 from utils.pagination import StandardResultsSetPagination
-from utils.movie_api import search_external_movies
+from utils.renderers import NDJSONRenderer
+from utils.views import AsyncAPIViewMixin, CachedResponseMixin, SparseFieldsetMixin
+from utils.movie_api import asearch_external_movies
+from utils.text import normalize_title
 
-class MovieListAPIView(mixins.ListModelMixin,
+class MovieFilterMixin:
+    """
+    Query parameter filters shared by the movie list and its facets
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # Genre and people filters go through the relation indexes
+        for param, lookup in [
+            ('genre', 'genres__normalized_name'),
+            ('director', 'directors__normalized_name'),
+            ('actor', 'cast__normalized_name'),
+        ]:
+            value = normalize_title(self.request.query_params.get(param))
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+            
+        # Range filters on the numeric columns and the stored review aggregates
+        for param, lookup, cast in [
+            ('year', 'year', int),
+            ('year_min', 'year__gte', int),
+            ('year_max', 'year__lte', int),
+            ('min_imdb_rating', 'imdb_rating__gte', float),
+            ('min_average_rating', 'average_rating__gte', float),
+            ('max_average_rating', 'average_rating__lte', float),
+            ('min_review_count', 'review_count__gte', int),
+        ]:
+            value = self.request.query_params.get(param)
+            if value:
+                try:
+                    queryset = queryset.filter(**{lookup: cast(value)})
+                except (ValueError, ValidationError):
+                    pass
+            
+        return queryset
+
+
+class MovieListAPIView(CachedResponseMixin,
+                        MovieFilterMixin,
+                        SparseFieldsetMixin,
+                        mixins.ListModelMixin,
                         generics.GenericAPIView):
     """
     API view for listing and searching movies
@@ -16,29 +69,33 @@ class MovieListAPIView(mixins.ListModelMixin,
     serializer_class = MovieSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, MovieSearchFilter, MovieOrderingFilter]
     search_fields = ['title', 'genre', 'director', 'actors']
-    ordering_fields = ['title', 'year', 'imdb_rating']
+    ordering_fields = ['title', 'year', 'imdb_rating', 'average_rating', 'review_count']
     ordering = ['title']
-    
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        
-        genre = self.request.query_params.get('genre')
-        if genre:
-            queryset = queryset.filter(genre__icontains=genre)
-            
-        year = self.request.query_params.get('year')
-        if year:
-            queryset = queryset.filter(year=year)
-            
-        return queryset
+    keyset_ordering = ('title', 'id')
+    cache_scopes = ('movie',)
     
     def get(self, request, *args, **kwargs):
-        return self.list(request, *args, **kwargs)
+        return self.respond_cached(lambda: self.list(request, *args, **kwargs))
 
 
-class MovieDetailAPIView(mixins.RetrieveModelMixin,
+class MovieFacetsAPIView(MovieFilterMixin, generics.GenericAPIView):
+    """
+    API view for genre and decade counts of the movies matching the list filters
+    """
+    queryset = Movie.objects.all()
+    permission_classes = [IsAuthenticated]
+    filter_backends = [MovieSearchFilter]
+    search_fields = MovieListAPIView.search_fields
+
+    def get(self, request, *args, **kwargs):
+        return Response(movie_facets(self.filter_queryset(self.get_queryset())))
+
+
+class MovieDetailAPIView(CachedResponseMixin,
+                            SparseFieldsetMixin,
+                            mixins.RetrieveModelMixin,
                             generics.GenericAPIView):
     """
     API view for retrieving a specific movie
@@ -46,19 +103,32 @@ class MovieDetailAPIView(mixins.RetrieveModelMixin,
     queryset = Movie.objects.all()
     serializer_class = MovieSerializer
     permission_classes = [IsAuthenticated]
+    cache_scopes = ('movie',)
+
+    def get_validators(self):
+        self.object = self.get_object()
+        return (self.object.pk, self.object.updated_at), self.object.updated_at
     
     def get(self, request, *args, **kwargs):
-        return self.retrieve(request, *args, **kwargs)
+        return self.respond_cached(lambda: Response(self.get_serializer(self.object).data))
 
 
-class MovieSearchAPIView(generics.GenericAPIView):
+class MovieSearchAPIView(AsyncAPIViewMixin, generics.GenericAPIView):
     """
     API view for advanced movie searching (local + external)
+
+    The catalog and OMDB are searched concurrently, and OMDB hits already in
+    the catalog are left out. With ?external=auto OMDB is only asked when the
+    local results do not fill the page. Clients accepting application/x-ndjson
+    get the local results as soon as they are ready, then the external ones.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = MovieSerializer
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+    local_limit = 5
+    external_modes = ('always', 'auto')
     
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         search_term = request.query_params.get('q', '')
         
         if not search_term or len(search_term) < 2:
@@ -66,13 +136,52 @@ class MovieSearchAPIView(generics.GenericAPIView):
                 {"detail": "Search term must be at least 3 characters"}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        local_movies = Movie.objects.filter(title__icontains=search_term)[:5]
-        local_results = self.get_serializer(local_movies, many=True).data
-        
-        external_results = search_external_movies(search_term)
-        
-        return Response({
-            'local_results': local_results,
-            'external_results': external_results
-        })
\ No newline at end of file
+
+        external = request.query_params.get('external', getattr(settings, 'MOVIE_SEARCH_EXTERNAL', 'always'))
+        if external not in self.external_modes:
+            return Response(
+                {"detail": f"external must be one of: {', '.join(self.external_modes)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            return StreamingHttpResponse(
+                self.stream(request.accepted_renderer, search_term, external),
+                content_type=request.accepted_renderer.media_type
+            )
+
+        return Response(dict([result async for result in self.search(search_term, external)]))
+
+    def local_results(self, search_term):
+        """
+        The serialized local matches, and the IMDb IDs among them
+        """
+        local_movies = list(search_movies(Movie.objects.all(), search_term).order_by('-search_rank', 'title')[:self.local_limit])
+        external_ids = {movie.external_id.lower() for movie in local_movies if movie.external_id}
+        return self.get_serializer(local_movies, many=True).data, external_ids
+
+    async def search(self, search_term, external):
+        """
+        Yield ('local_results', ...) and then ('external_results', ...)
+        """
+        external_search = None
+        if external == 'always':
+            external_search = asyncio.ensure_future(asearch_external_movies(search_term))
+        try:
+            local_results, external_ids = await sync_to_async(self.local_results)(search_term)
+            yield 'local_results', local_results
+
+            if external_search is None and len(local_results) < self.local_limit:
+                external_search = asyncio.ensure_future(asearch_external_movies(search_term))
+            external_results = await external_search if external_search else []
+            yield 'external_results', [
+                movie for movie in external_results if (movie.get('external_id') or '').lower() not in external_ids
+            ]
+        finally:
+            # The client went away (or the local search failed) before OMDB answered
+            if external_search is not None and not external_search.done():
+                external_search.cancel()
+
+    async def stream(self, renderer, search_term, external):
+        async for key, results in self.search(search_term, external):
+            yield renderer.render({key: results})
@@ -3,7 +3,7 @@ from .models import Review
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ('movie', 'user', 'rating', 'created_at')
-    list_filter = ('rating', 'created_at')
+    list_display = ('movie', 'user', 'rating', 'status', 'created_at')
+    list_filter = ('rating', 'status', 'created_at')
     search_fields = ('movie__title', 'user__email', 'content')
     ordering = ('-created_at',)
\ No newline at end of file
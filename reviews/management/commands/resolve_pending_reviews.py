@@ -0,0 +1,32 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from reviews.pending import resolve_pending_movies
+
+
+class Command(BaseCommand):
+    help = (
+        "Resolve the movies of reviews accepted before their title was known and publish "
+        "them, or mark them failed. Runs until interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Resolve one batch and exit")
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'REVIEW_RESOLVE_BATCH_SIZE', 50))
+        parser.add_argument('--concurrency', type=int, default=4, help="OMDB lookups in flight at once")
+        parser.add_argument('--interval', type=float, default=getattr(settings, 'REVIEW_RESOLVE_INTERVAL', 1),
+                            help="Seconds to wait once no pending reviews are left")
+
+    def handle(self, *args, **options):
+        while True:
+            counts = resolve_pending_movies(limit=options['batch_size'], concurrency=options['concurrency'])
+            if any(counts.values()):
+                self.stdout.write(
+                    f"{counts['published']} review(s) published, {counts['failed']} title(s) failed, "
+                    f"{counts['retrying']} title(s) to retry"
+                )
+            if options['once']:
+                return
+            # Wait once the queue is drained, or when OMDB is failing
+            if counts['retrying'] or not any(counts.values()):
+                time.sleep(options['interval'])
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 05:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0011_pendingmovie'),
+        ('reviews', '0003_review_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='pending_movie',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='movies.pendingmovie'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='status',
+            field=models.CharField(choices=[('published', 'Published'), ('pending', 'Pending'), ('failed', 'Failed')], default='published', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='movie',
+            field=models.ForeignKey(blank=True, help_text="Empty until a pending review's movie is resolved", null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='movies.movie'),
+        ),
+    ]
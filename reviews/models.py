@@ -1,15 +1,32 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
-from movies.models import Movie
+from movies.models import Movie, PendingMovie
 from utils.models import BaseModel
 
 class Review(BaseModel):
+    class Status(models.TextChoices):
+        PUBLISHED = 'published', 'Published'
+        # Accepted before its movie was resolved (see reviews.pending)
+        PENDING = 'pending', 'Pending'
+        FAILED = 'failed', 'Failed'
+
     movie = models.ForeignKey(
         Movie,
         on_delete=models.CASCADE,
-        related_name='reviews'
+        related_name='reviews',
+        blank=True,
+        null=True,
+        help_text="Empty until a pending review's movie is resolved"
+    )
+    pending_movie = models.ForeignKey(
+        PendingMovie,
+        on_delete=models.CASCADE,
+        related_name='reviews',
+        blank=True,
+        null=True
     )
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PUBLISHED)
     content = models.TextField()
     rating = models.IntegerField(
         validators=[
@@ -26,6 +43,30 @@ class Review(BaseModel):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['user', 'movie']
+        indexes = [
+            # Keyset pagination order (see utils.pagination.KeysetPagination)
+            models.Index(fields=['-created_at', '-id'], name='review_created_id_idx'),
+            # List filters (?movie_title=, by-movie, ?min_rating=, ?user=) in
+            # the default newest-first order
+            models.Index(fields=['movie', '-created_at'], name='review_movie_created_idx'),
+            models.Index(fields=['rating', '-created_at'], name='review_rating_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='review_user_created_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.movie.title} - {self.rating}/5 by {self.user.email}"
\ No newline at end of file
+        title = self.movie.title if self.movie_id else self.pending_movie.title
+        return f"{title} - {self.rating}/5 by {self.user.email}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the movie aggregates currently count for this review
+        instance._counted_rating = (instance.__dict__.get('movie_id'), instance.__dict__.get('rating'))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The movie aggregates are updated by a post_save handler; keep both
+        # in one transaction
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Deferred movie resolution for reviews. With deferral on (the
+``Prefer: respond-async`` request header or REVIEW_DEFER_MOVIE_RESOLUTION),
+a review whose title is not in the database is stored at once against a
+PendingMovie placeholder instead of waiting on OMDB. resolve_pending_movies,
+run in a loop by the resolve_pending_reviews management command, looks the
+placeholders up and publishes their reviews, or marks them failed.
+"""
+import asyncio
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from movies.importer import fetch_batch
+from movies.models import PendingMovie
+from utils.async_bridge import async_bridge
+from utils.movie_api import fetch_movie, find_partial_match, find_stored_movie, save_movie_data
+from utils.omdb_cache import NOT_FOUND
+from utils.text import normalize_title
+from .models import Review
+
+PREFER_ASYNC = 'respond-async'
+
+
+def defer_movie_resolution(request):
+    """
+    Whether a review created by ``request`` may be accepted before its movie
+    is resolved
+    """
+    preferences = {
+        token.split('=')[0].strip().lower()
+        for token in request.headers.get('Prefer', '').replace(';', ',').split(',')
+    }
+    return PREFER_ASYNC in preferences or getattr(settings, 'REVIEW_DEFER_MOVIE_RESOLUTION', False)
+
+
+def pending_movie_for(movie_title):
+    """
+    The unresolved placeholder for ``movie_title``, shared by every review
+    waiting on the same title
+    """
+    pending = PendingMovie.objects.filter(
+        normalized_title=normalize_title(movie_title), status=PendingMovie.Status.PENDING
+    ).first()
+    return pending or PendingMovie.objects.create(title=movie_title.strip())
+
+
+def failure_reason(review):
+    """
+    Why a review could not be published, or None
+    """
+    if review.status != Review.Status.FAILED:
+        return None
+    pending = review.pending_movie
+    if pending is not None and pending.status == PendingMovie.Status.FAILED:
+        return pending.error
+    return "You have already reviewed this movie."
+
+
+def publish_reviews(pending, movie):
+    """
+    Link the reviews waiting on ``pending`` to ``movie``. A review whose
+    author already reviewed that movie fails instead, including a review
+    posted while this runs. Returns how many were published.
+    """
+    published = 0
+    with transaction.atomic():
+        pending.status = PendingMovie.Status.RESOLVED
+        pending.movie = movie
+        pending.save(update_fields=['status', 'movie', 'updated_at'])
+        reviews = pending.reviews.select_for_update().filter(status=Review.Status.PENDING)
+        for review in reviews:
+            if Review.objects.filter(user_id=review.user_id, movie=movie).exists():
+                review.status = Review.Status.FAILED
+                review.save(update_fields=['status', 'updated_at'])
+                continue
+            # Rating aggregates follow through the review signals
+            review.movie = movie
+            review.pending_movie = None
+            review.status = Review.Status.PUBLISHED
+            try:
+                with transaction.atomic():
+                    review.save(update_fields=['movie', 'pending_movie', 'status', 'updated_at'])
+            except IntegrityError:
+                # The author reviewed the movie directly since the check above
+                review.movie = None
+                review.pending_movie = pending
+                review.status = Review.Status.FAILED
+                review.save(update_fields=['status', 'updated_at'])
+                continue
+            published += 1
+    return published
+
+
+def fail_pending(pending, error):
+    """
+    Give up on ``pending`` and fail the reviews waiting on it
+    """
+    with transaction.atomic():
+        pending.status = PendingMovie.Status.FAILED
+        pending.error = error[:255]
+        pending.save(update_fields=['status', 'error', 'attempts', 'updated_at'])
+        pending.reviews.filter(status=Review.Status.PENDING).update(status=Review.Status.FAILED)
+
+
+def resolve_pending_movies(limit=None, concurrency=4, max_attempts=None):
+    """
+    Resolve up to ``limit`` placeholders, oldest first: from the database
+    when the movie has been stored since, from OMDB otherwise. Titles OMDB
+    does not know fail at once unless they partly match a stored title;
+    OMDB errors are retried on later calls, up to ``max_attempts``. Returns
+    the number of reviews published and of placeholders failed or left for
+    a retry.
+    """
+    if limit is None:
+        limit = getattr(settings, 'REVIEW_RESOLVE_BATCH_SIZE', 50)
+    if max_attempts is None:
+        max_attempts = getattr(settings, 'REVIEW_RESOLVE_MAX_ATTEMPTS', 5)
+    counts = {'published': 0, 'failed': 0, 'retrying': 0}
+    queue = PendingMovie.objects.filter(status=PendingMovie.Status.PENDING).order_by('created_at')
+    pending_movies = list(queue[:limit])
+
+    unresolved = []
+    for pending in pending_movies:
+        movie = find_stored_movie(pending.title)
+        if movie:
+            counts['published'] += publish_reviews(pending, movie)
+        else:
+            unresolved.append(pending)
+    if not unresolved:
+        return counts
+
+    results = async_bridge.run(fetch_batch(
+        [pending.title for pending in unresolved], None, asyncio.Semaphore(concurrency), fetch=fetch_movie
+    ))
+    for pending, result in zip(unresolved, results):
+        movie = save_movie_data(result) if 'error' not in result else None
+        if movie is None and result == NOT_FOUND:
+            movie = find_partial_match(pending.title)
+        if movie:
+            counts['published'] += publish_reviews(pending, movie)
+        elif result == NOT_FOUND:
+            fail_pending(pending, f"Could not find any movie matching '{pending.title}'.")
+            counts['failed'] += 1
+        else:
+            pending.attempts += 1
+            if pending.attempts >= max_attempts:
+                fail_pending(pending, f"Could not look up '{pending.title}', please try again later.")
+                counts['failed'] += 1
+            else:
+                pending.save(update_fields=['attempts', 'updated_at'])
+                counts['retrying'] += 1
+    return counts
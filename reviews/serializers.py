@@ -1,21 +1,35 @@
 from rest_framework import serializers
 from .models import Review
-from users.serializers import UserSerializer
-from movies.serializers import MovieSerializer
-from utils.movie_api import get_or_create_movie
+from users.serializers import UserSerializer, UserSummarySerializer
+from movies.serializers import MovieSerializer, MovieSummarySerializer
+from movies.fuzzy import suggest_titles
+from utils import metrics
+from utils.movie_api import find_stored_movie, get_or_create_movie
+from utils.serializers import DynamicFieldsMixin
+from utils.text import normalize_title
+from .pending import failure_reason, pending_movie_for
 
-class ReviewSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
-    movie = MovieSerializer(read_only=True)
+class ReviewSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    user = UserSummarySerializer(read_only=True)
+    movie = MovieSummarySerializer(read_only=True)
     movie_title = serializers.CharField(write_only=True)
     
     class Meta:
         model = Review
         fields = [
-            'id', 'movie', 'movie_title', 'content', 'rating',
+            'id', 'movie', 'movie_title', 'content', 'rating', 'status',
             'user', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'movie']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'movie', 'status']
+        expandable = {'movie': MovieSerializer, 'user': UserSerializer}
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Join the movie and user, so serializing a page costs the same number
+        of queries at any size
+        """
+        return queryset.select_related('movie', 'user')
     
     def validate(self, data):
         if 'rating' in data and (data['rating'] < 1 or data['rating'] > 5):
@@ -26,44 +40,77 @@ class ReviewSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({"movie_title": "Movie title is required"})
             if not data.get('content'):
                 raise serializers.ValidationError({"content": "Review content is required"})
-            
-            movie_title = data.get('movie_title')
-            if movie_title:
-                movie = get_or_create_movie(movie_title)
-                if not movie:
-                    raise serializers.ValidationError({
-                        "movie_title": f"Movie '{movie_title}' could not be found. Please check the title or try a different movie."
-                    })
+        if self.context.get('skip_movie_resolution'):
+            return data
+        
+        # Resolve the movie once here; create() and update() save the resolved instance
+        movie_title = data.pop('movie_title', None)
+        if movie_title:
+            user = self.instance.user if self.instance else self.context['request'].user
+            if self.instance is None and self.context.get('defer_movie_resolution'):
+                # Only the database is consulted; unknown titles are resolved later
+                movie = find_stored_movie(movie_title)
+                if movie is None:
+                    already_pending = Review.objects.filter(
+                        user=user,
+                        status=Review.Status.PENDING,
+                        pending_movie__normalized_title=normalize_title(movie_title)
+                    )
+                    if already_pending.exists():
+                        raise serializers.ValidationError({"movie_title": "You have already reviewed this movie."})
+                    data['pending_title'] = movie_title
+                    return data
+            else:
+                # Async views resolve the movie before validating
+                resolved = self.context.get('resolved_movies', {})
+                movie = resolved[movie_title] if movie_title in resolved else get_or_create_movie(movie_title)
+            if not movie:
+                suggestions = suggest_titles(movie_title)
+                if suggestions:
+                    message = f"Could not find any movie matching '{movie_title}'. Did you mean: {', '.join(suggestions)}?"
+                else:
+                    message = f"Could not find any movie matching '{movie_title}'. Please check spelling or try another title."
+                raise serializers.ValidationError({"movie_title": message, "suggestions": suggestions})
+            already_reviewed = Review.objects.filter(user=user, movie=movie)
+            if self.instance is not None:
+                already_reviewed = already_reviewed.exclude(pk=self.instance.pk)
+            if already_reviewed.exists():
+                raise serializers.ValidationError({"movie_title": "You have already reviewed this movie."})
+            data['movie'] = movie
+            data['pending_movie'] = None
+            data['status'] = Review.Status.PUBLISHED
         
         return data
     
     def create(self, validated_data):
-        # Get movie title and fetch/create movie
-        movie_title = validated_data.pop('movie_title')
-        movie = get_or_create_movie(movie_title)
-        
-        # CORRECTION: Better error message
-        if not movie:
-            raise serializers.ValidationError({
-                "movie_title": f"Movie '{movie_title}' could not be found or created. Please try a different title."
-            })
-        
-        # Create the review with the movie
-        validated_data['movie'] = movie
         validated_data['user'] = self.context['request'].user
-        
+        pending_title = validated_data.pop('pending_title', None)
+        if pending_title:
+            validated_data['pending_movie'] = pending_movie_for(pending_title)
+            validated_data['status'] = Review.Status.PENDING
+        movie = validated_data.get('movie')
+        if movie is not None and movie.from_search:
+            metrics.incr('catalog.search_warmed.reviews')
+            if not movie.review_count:
+                # The first review would otherwise have looked the title up on OMDB
+                metrics.incr('catalog.search_warmed.lookups_saved')
         return super().create(validated_data)
-    
-    def update(self, instance, validated_data):
-        if 'movie_title' in validated_data:
-            movie_title = validated_data.pop('movie_title')
-            movie = get_or_create_movie(movie_title)
-            
-            if not movie:
-                raise serializers.ValidationError({
-                    "movie_title": f"Movie '{movie_title}' could not be found or created. Please try a different title."
-                })
-            
-            instance.movie = movie
-        
-        return super().update(instance, validated_data)
\ No newline at end of file
+
+
+class ReviewStatusSerializer(serializers.ModelSerializer):
+    """
+    Where a review accepted before its movie was resolved stands
+    """
+    movie = MovieSummarySerializer(read_only=True)
+    movie_title = serializers.SerializerMethodField()
+    detail = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Review
+        fields = ['id', 'status', 'movie', 'movie_title', 'detail', 'updated_at']
+
+    def get_movie_title(self, review):
+        return review.movie.title if review.movie_id else review.pending_movie.title
+
+    def get_detail(self, review):
+        return failure_reason(review)
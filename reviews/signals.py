@@ -0,0 +1,46 @@
+from collections import defaultdict
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from movies.models import Movie
+from movies.ratings import apply_rating_changes
+from utils import response_cache
+from .models import Review
+
+
+@receiver(pre_save, sender=Review)
+def remember_counted_rating(sender, instance, using, update_fields, **kwargs):
+    if instance._state.adding:
+        instance._counted_rating = None
+    elif None in (getattr(instance, '_counted_rating', None) or (None,)):
+        # Built by hand or loaded with deferred fields, so read what is stored
+        instance._counted_rating = (
+            Review.objects.using(using).filter(pk=instance.pk).values_list('movie_id', 'rating').first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_movie_ratings_on_save(sender, instance, using, **kwargs):
+    changes = defaultdict(lambda: defaultdict(int))
+    counted = getattr(instance, '_counted_rating', None)
+    if counted and None not in counted:
+        movie_id, rating = counted
+        changes[movie_id][rating] -= 1
+    if instance.movie_id is not None:
+        changes[instance.movie_id][instance.rating] += 1
+    apply_rating_changes(Movie, changes, using)
+    instance._counted_rating = (instance.movie_id, instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def update_movie_ratings_on_delete(sender, instance, using, origin=None, **kwargs):
+    movie_id, rating = getattr(instance, '_counted_rating', None) or (instance.movie_id, instance.rating)
+    # Pending reviews are not counted yet; the movie row is going away with its reviews
+    if movie_id is None or isinstance(origin, Movie) and origin.pk == movie_id:
+        return
+    apply_rating_changes(Movie, {movie_id: {rating: -1}}, using)
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_review_responses(sender, using, **kwargs):
+    # The movie's rating aggregates changed too
+    response_cache.bump('review', 'movie', using=using)
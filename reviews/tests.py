@@ -1,10 +1,23 @@
-from django.test import TestCase
+import asyncio
+import time
+from io import StringIO
+from unittest.mock import AsyncMock, patch
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
 from users.models import User
-from movies.models import Movie
+from movies.fuzzy import title_index
+from movies.models import Movie, PendingMovie
 from reviews.models import Review
+from utils.testing import FakeOMDBMixin, QueryCountMixin, QueryPlanMixin
 
 class ReviewAPITest(TestCase):
     def setUp(self):
@@ -55,4 +68,508 @@ class ReviewAPITest(TestCase):
         response = self.client.post(self.review_list_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['content'], 'Fantastic movie!')
-        self.assertEqual(response.data['rating'], 4)
\ No newline at end of file
+        self.assertEqual(response.data['rating'], 4)
+
+class ReviewWriteQueryCountTest(TestCase):
+    """
+    Pins the number of queries per review write; the movie must be resolved once.
+    """
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpassword123'
+        )
+        self.movie = Movie.objects.create(title='Test Movie', year='2023')
+        self.other_movie = Movie.objects.create(title='Other Movie', year='2022')
+        self.review = Review.objects.create(
+            movie=self.movie,
+            user=self.user,
+            content='Great movie!',
+            rating=5
+        )
+        self.client.force_authenticate(user=self.user)
+        self.review_detail_url = reverse('review-detail', args=[self.review.id])
+
+    def test_create_review_queries(self):
+        data = {'movie_title': 'Other Movie', 'content': 'Fine.', 'rating': 3}
+        # movie lookup, duplicate check, savepoint, insert, movie aggregates, release
+        with self.assertNumQueries(6):
+            response = self.client.post(reverse('review-list'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['movie']['id'], str(self.other_movie.id))
+
+    def test_update_review_queries(self):
+        data = {'movie_title': 'Other Movie', 'content': 'Changed my mind.', 'rating': 2}
+        # review with movie and user, movie lookup, duplicate check, savepoint,
+        # update, aggregates of both movies, release
+        with self.assertNumQueries(8):
+            response = self.client.put(self.review_detail_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.movie, self.other_movie)
+
+    def test_partial_update_review_queries(self):
+        # review with movie and user, savepoint, update, movie aggregates, release
+        with self.assertNumQueries(5):
+            response = self.client.patch(self.review_detail_url, {'rating': 4}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rating'], 4)
+
+    def test_unknown_movie_title_is_rejected(self):
+        data = {'movie_title': 'Missing Movie', 'content': 'Hmm.', 'rating': 3}
+        with patch('reviews.views.aget_or_create_movie', AsyncMock(return_value=None)) as lookup, \
+                patch('reviews.serializers.get_or_create_movie') as sync_lookup:
+            response = self.client.post(reverse('review-list'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('movie_title', response.data)
+        lookup.assert_awaited_once_with('Missing Movie')
+        sync_lookup.assert_not_called()
+
+    def test_unknown_movie_title_suggests_close_matches(self):
+        title_index.clear()
+        data = {'movie_title': 'Tesst Movie', 'content': 'Hmm.', 'rating': 3}
+        with patch('reviews.views.aget_or_create_movie', AsyncMock(return_value=None)):
+            response = self.client.post(reverse('review-list'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(self.movie.title, response.data['suggestions'])
+        self.assertIn('Did you mean', response.data['movie_title'][0])
+
+
+class ReviewRatingAggregatesTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='test@example.com', password='testpassword123')
+        self.other_user = User.objects.create_user(email='other@example.com', password='testpassword123')
+        self.movie = Movie.objects.create(title='Test Movie')
+        self.other_movie = Movie.objects.create(title='Other Movie')
+        self.review = Review.objects.create(movie=self.movie, user=self.user, content='Great!', rating=5)
+        Review.objects.create(movie=self.movie, user=self.other_user, content='Meh.', rating=2)
+        self.client.force_authenticate(user=self.user)
+
+    def assertAggregates(self, movie, count, average, histogram):
+        movie.refresh_from_db()
+        self.assertEqual(movie.review_count, count)
+        self.assertEqual(movie.rating_sum, sum(rating * n for rating, n in histogram.items()))
+        self.assertAlmostEqual(movie.average_rating, average)
+        self.assertEqual(movie.rating_histogram, {rating: histogram.get(rating, 0) for rating in range(1, 6)})
+
+    def test_create_update_and_delete(self):
+        self.assertAggregates(self.movie, 2, 3.5, {5: 1, 2: 1})
+        self.client.patch(reverse('review-detail', args=[self.review.id]), {'rating': 4}, format='json')
+        self.assertAggregates(self.movie, 2, 3.0, {4: 1, 2: 1})
+        self.client.delete(reverse('review-detail', args=[self.review.id]))
+        self.assertAggregates(self.movie, 1, 2.0, {2: 1})
+
+    def test_moving_a_review_between_movies(self):
+        data = {'movie_title': 'Other Movie', 'content': 'Wrong movie.', 'rating': 4}
+        response = self.client.put(reverse('review-detail', args=[self.review.id]), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertAggregates(self.movie, 1, 2.0, {2: 1})
+        self.assertAggregates(self.other_movie, 1, 4.0, {4: 1})
+
+    def test_moving_onto_an_already_reviewed_movie_is_rejected(self):
+        Review.objects.create(movie=self.other_movie, user=self.user, content='Fine.', rating=3)
+        data = {'movie_title': 'Other Movie', 'content': 'Again.', 'rating': 4}
+        response = self.client.put(reverse('review-detail', args=[self.review.id]), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertAggregates(self.movie, 2, 3.5, {5: 1, 2: 1})
+
+    def test_cascading_user_delete(self):
+        self.other_user.delete()
+        self.assertAggregates(self.movie, 1, 5.0, {5: 1})
+
+    def test_movie_reviews_use_stored_average(self):
+        with patch('reviews.views.aget_or_create_movie', AsyncMock(return_value=None)):
+            response = self.client.get(reverse('movie-reviews'), {'title': 'Test Movie'})
+        self.assertEqual(response.data['results']['average_rating'], 3.5)
+
+    def test_rebuild_command(self):
+        Movie.objects.filter(pk=self.movie.pk).update(review_count=7, average_rating=1.0)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_movie_ratings', '--check', stdout=StringIO())
+        out = StringIO()
+        call_command('rebuild_movie_ratings', stdout=out)
+        self.assertIn('1 movie(s)', out.getvalue())
+        self.assertAggregates(self.movie, 2, 3.5, {5: 1, 2: 1})
+        call_command('rebuild_movie_ratings', '--check', stdout=StringIO())
+
+
+class ReviewListQueryCountTest(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.viewer = User.objects.create_user(email='viewer@example.com', password='testpassword123')
+        self.client.force_authenticate(user=self.viewer)
+        self.group = Group.objects.create(name='critics')
+        self.permission = Permission.objects.first()
+        self.movie = Movie.objects.create(title='Shared Movie')
+
+    def add_reviews(self, count, same_movie=False):
+        for _ in range(count):
+            index = Review.objects.count()
+            user = User.objects.create_user(email=f'reviewer{index}@example.com')
+            user.groups.add(self.group)
+            user.user_permissions.add(self.permission)
+            movie = self.movie if same_movie else Movie.objects.create(title=f'Movie {index}')
+            Review.objects.create(movie=movie, user=user, content='Review', rating=index % 5 + 1)
+
+    def test_review_list(self):
+        self.assertConstantQueries(reverse('review-list'), self.add_reviews)
+
+    def test_movie_reviews(self):
+        self.assertConstantQueries(
+            reverse('movie-reviews'),
+            lambda count: self.add_reviews(count, same_movie=True),
+            params={'title': 'Shared Movie'}
+        )
+
+
+class ReviewSparseFieldsetTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='test@example.com', password='testpassword123')
+        self.client.force_authenticate(user=self.user)
+        self.movie = Movie.objects.create(title='Test Movie', year='2023', plot='A long plot.', actors='Someone')
+        self.review = Review.objects.create(movie=self.movie, user=self.user, content='Great!', rating=5)
+
+    def test_nested_summaries_by_default(self):
+        response = self.client.get(reverse('review-detail', args=[self.review.id]))
+        self.assertEqual(set(response.data['movie']), {'id', 'title', 'year', 'average_rating'})
+        self.assertEqual(set(response.data['user']), {'id', 'first_name', 'last_name'})
+
+    def test_fields_and_expand(self):
+        response = self.client.get(reverse('review-list'), {'fields': 'id,rating,movie', 'expand': 'movie'})
+        review = response.data['results'][0]
+        self.assertEqual(set(review), {'id', 'rating', 'movie'})
+        self.assertEqual(review['movie']['plot'], 'A long plot.')
+        self.assertNotIn('normalized_title', review['movie'])
+
+    def test_only_selected_columns_are_loaded(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('review-list'), {'fields': 'id,rating,movie'})
+        review_query = next(query['sql'] for query in queries if 'FROM "reviews_review"' in query['sql']
+                            and 'COUNT' not in query['sql'])
+        self.assertNotIn('"reviews_review"."content"', review_query)
+        self.assertNotIn('"movies_movie"."plot"', review_query)
+        self.assertNotIn('"users_user"', review_query)
+
+    def test_user_password_is_never_serialized(self):
+        response = self.client.get(reverse('review-detail', args=[self.review.id]), {'expand': 'user'})
+        self.assertEqual(response.data['user']['email'], 'test@example.com')
+        self.assertNotIn('password', response.data['user'])
+
+
+class ReviewKeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.viewer = User.objects.create_user(email='viewer@example.com', password='testpassword123')
+        self.client.force_authenticate(user=self.viewer)
+        movie = Movie.objects.create(title='Test Movie')
+        for index in range(7):
+            user = User.objects.create_user(email=f'reviewer{index}@example.com')
+            Review.objects.create(movie=movie, user=user, content='Review', rating=3)
+        # Ties on created_at must be broken by id
+        Review.objects.filter(user__email__in=['reviewer2@example.com', 'reviewer3@example.com']).update(
+            created_at=Review.objects.get(user__email='reviewer1@example.com').created_at
+        )
+        self.expected = list(Review.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def walk(self, url, direction):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            pages.append([review['id'] for review in response.data['results']])
+            url = response.data['links'][direction]
+        return pages
+
+    def test_walks_forward_and_back(self):
+        pages = self.walk(reverse('review-list') + '?pagination=keyset&page_size=3&fields=id', 'next')
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([id for page in pages for id in page], [str(id) for id in self.expected])
+
+        response = self.client.get(reverse('review-list') + '?pagination=keyset&page_size=3')
+        last = self.client.get(self.client.get(response.data['links']['next']).data['links']['next'])
+        back = self.walk(last.data['links']['previous'], 'previous')
+        self.assertEqual(back, pages[1::-1])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('review-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_numbers_remain_the_default(self):
+        response = self.client.get(reverse('review-list'))
+        self.assertEqual(response.data['count'], 7)
+
+
+class ReviewQueryPlanTest(QueryPlanMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(User(email=f'planner{index}@example.com') for index in range(40))
+        Movie.objects.bulk_create(Movie(title=f'Plan Movie {index}') for index in range(50))
+        cls.users = list(User.objects.all())
+        movies = list(Movie.objects.all())
+        Review.objects.bulk_create(
+            Review(movie=movie, user=user, content='Review', rating=(index + position) % 5 + 1)
+            for index, movie in enumerate(movies) for position, user in enumerate(cls.users)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.users[0])
+
+    def test_review_list(self):
+        for params in [
+            {},
+            {'min_rating': 4},
+            {'ordering': 'rating'},
+            {'ordering': '-rating'},
+            {'ordering': 'created_at'},
+            {'movie_title': 'Plan Movie 1'},
+            {'min_rating': 4, 'movie_title': 'Plan Movie 1'},
+            {'user': str(self.users[1].id)},
+            {'pagination': 'keyset'},
+        ]:
+            with self.subTest(params=params):
+                self.assertNoFullScans(reverse('review-list'), params)
+
+    def test_movie_reviews(self):
+        self.assertNoFullScans(reverse('movie-reviews'), {'title': 'Plan Movie 7'})
+
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=300)
+class MovieReviewsResponseCacheTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(email='author@example.com', password='testpassword123', first_name='Ann')
+        self.reader = User.objects.create_user(email='reader@example.com', password='testpassword123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.reader)
+        self.movie = Movie.objects.create(title='Heat', external_id='tt0113277')
+        Review.objects.create(user=self.author, movie=self.movie, content='Tense', rating=5)
+        self.url = reverse('movie-reviews')
+
+    def get(self, **headers):
+        return self.client.get(self.url, {'title': 'Heat'}, **headers)
+
+    def test_repeated_reads_skip_the_movie_lookup_and_the_queries(self):
+        first = self.get()
+        with self.assertNumQueries(0):
+            second = self.get()
+        self.assertEqual(second.data, first.data)
+
+    def test_reviews_and_authors_invalidate_cached_responses(self):
+        etag = self.get()['ETag']
+        Review.objects.create(user=self.reader, movie=self.movie, content='Long', rating=3)
+        response = self.get()
+        self.assertEqual(len(response.data['results']['reviews']), 2)
+        self.assertEqual(response.data['results']['average_rating'], 4.0)
+        self.assertNotEqual(response['ETag'], etag)
+
+        self.author.first_name = 'Anne'
+        self.author.save()
+        names = {review['user']['first_name'] for review in self.get().data['results']['reviews']}
+        self.assertIn('Anne', names)
+
+    def test_logins_do_not_invalidate_cached_responses(self):
+        self.get()
+        self.author.last_login = timezone.now()
+        self.author.save(update_fields=['last_login'])
+        with self.assertNumQueries(0):
+            self.get()
+
+    def test_conditional_get(self):
+        etag = self.get()['ETag']
+        with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+            response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class PendingReviewTest(FakeOMDBMixin, TestCase):
+    omdb_titles = ['Arrival', 'Sicario']
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='test@example.com', password='testpassword123')
+        self.other_user = User.objects.create_user(email='other@example.com', password='testpassword123')
+        self.client.force_authenticate(user=self.user)
+
+    def post_review(self, title, user=None, **headers):
+        if user is not None:
+            self.client.force_authenticate(user=user)
+        return self.client.post(
+            reverse('review-list'),
+            {'movie_title': title, 'content': 'Worth it', 'rating': 4},
+            format='json',
+            headers={'Prefer': 'respond-async', **headers},
+        )
+
+    def resolve(self):
+        call_command('resolve_pending_reviews', '--once', stdout=StringIO())
+
+    def test_unknown_title_is_accepted_without_calling_omdb(self):
+        response = self.post_review('Arrival')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertEqual(response.data['movie_title'], 'Arrival')
+        self.assertEqual(response['Location'], f"http://testserver{reverse('review-status', args=[response.data['id']])}")
+        self.assertEqual(self.server.total_requests, 0)
+        self.assertEqual(self.client.get(reverse('review-list')).data['count'], 0)
+
+        self.resolve()
+
+        review = Review.objects.select_related('movie').get(pk=response.data['id'])
+        self.assertEqual(review.status, Review.Status.PUBLISHED)
+        self.assertEqual(review.movie.title, 'Arrival')
+        self.assertIsNone(review.pending_movie_id)
+        self.assertEqual(review.movie.review_count, 1)
+        polled = self.client.get(response['Location'])
+        self.assertEqual(polled.data['status'], 'published')
+        self.assertEqual(polled.data['movie']['title'], 'Arrival')
+
+    def test_stored_title_is_published_at_once(self):
+        Movie.objects.create(title='Sicario', external_id='tt0000002')
+        response = self.post_review('Sicario')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['status'], 'published')
+
+    def test_resolution_is_opt_in(self):
+        response = self.client.post(
+            reverse('review-list'), {'movie_title': 'Arrival', 'content': 'Worth it', 'rating': 4}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.server.total_requests, 1)
+
+        with override_settings(REVIEW_DEFER_MOVIE_RESOLUTION=True):
+            response = self.client.post(
+                reverse('review-list'), {'movie_title': 'Sicario', 'content': 'Tense', 'rating': 4}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_unknown_movie_fails(self):
+        response = self.post_review('Not A Real Movie')
+        self.resolve()
+
+        polled = self.client.get(reverse('review-status', args=[response.data['id']]))
+        self.assertEqual(polled.data['status'], 'failed')
+        self.assertEqual(polled.data['detail'], "Could not find any movie matching 'Not A Real Movie'.")
+
+    def test_reviews_of_one_title_share_a_placeholder(self):
+        mine = self.post_review('arrival')
+        theirs = self.post_review('  ARRIVAL ', user=self.other_user)
+        self.assertEqual(PendingMovie.objects.count(), 1)
+        # Stored and reviewed by the other user in the meantime
+        arrival = Movie.objects.create(title='Arrival', external_id='tt0000001')
+        Review.objects.create(movie=arrival, user=self.other_user, content='Seen it', rating=3)
+
+        self.resolve()
+
+        self.assertEqual(Review.objects.get(pk=mine.data['id']).status, Review.Status.PUBLISHED)
+        self.client.force_authenticate(user=self.other_user)
+        polled = self.client.get(reverse('review-status', args=[theirs.data['id']]))
+        self.assertEqual(polled.data['status'], 'failed')
+        self.assertEqual(polled.data['detail'], "You have already reviewed this movie.")
+        arrival.refresh_from_db()
+        self.assertEqual(arrival.review_count, 2)
+
+    def test_review_posted_during_resolution_fails_only_its_duplicate(self):
+        mine = self.post_review('Arrival')
+        theirs = self.post_review('Arrival', user=self.other_user)
+        arrival = Movie.objects.create(title='Arrival', external_id='tt0000001')
+        exists = QuerySet.exists
+        raced = []
+
+        def exists_then_race(queryset):
+            result = exists(queryset)
+            if queryset.model is Review and self.user.pk.hex in str(queryset.query) and not raced:
+                # The author posts a regular review of the movie right after the check
+                raced.append(Review.objects.create(movie=arrival, user=self.user, content='Direct', rating=2))
+            return result
+
+        with patch.object(QuerySet, 'exists', exists_then_race):
+            self.resolve()
+
+        self.assertEqual(Review.objects.get(pk=mine.data['id']).status, Review.Status.FAILED)
+        self.assertEqual(Review.objects.get(pk=theirs.data['id']).status, Review.Status.PUBLISHED)
+        arrival.refresh_from_db()
+        self.assertEqual(arrival.review_count, 2)
+
+    def test_duplicate_pending_review_is_rejected(self):
+        self.post_review('Arrival')
+        response = self.post_review('arrival')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(REVIEW_RESOLVE_MAX_ATTEMPTS=2)
+    def test_omdb_errors_are_retried(self):
+        response = self.post_review('Arrival')
+        self.server.outage_status = 503
+
+        self.resolve()
+        self.assertEqual(PendingMovie.objects.get().attempts, 1)
+        self.assertEqual(Review.objects.get(pk=response.data['id']).status, Review.Status.PENDING)
+
+        self.resolve()
+        self.assertEqual(Review.objects.get(pk=response.data['id']).status, Review.Status.FAILED)
+
+    def test_status_is_private(self):
+        response = self.post_review('Arrival')
+        self.client.force_authenticate(user=self.other_user)
+        polled = self.client.get(reverse('review-status', args=[response.data['id']]))
+        self.assertEqual(polled.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AsyncReviewViewsTest(FakeOMDBMixin, TestCase):
+    LATENCY = 0.3
+    omdb_titles = [f'Slow Movie {index}' for index in range(10)]
+    omdb_latency = LATENCY
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email='test@example.com', password='testpassword123')
+        self.client = AsyncClient()
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    async def test_omdb_lookups_overlap(self):
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            self.client.get(reverse('movie-reviews'), {'title': title}, headers=self.auth) for title in self.omdb_titles
+        ))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([response.status_code for response in responses], [status.HTTP_200_OK] * 10)
+        self.assertEqual(self.server.total_requests, 10)
+        # Ten round trips waited on together, not one after another
+        self.assertLess(elapsed, 4 * self.LATENCY)
+
+    async def test_create_review(self):
+        response = await self.client.post(
+            reverse('review-list'),
+            {'movie_title': 'Slow Movie 3', 'content': 'Worth the wait', 'rating': 4},
+            content_type='application/json',
+            headers=self.auth,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['movie']['title'], 'Slow Movie 3')
+        self.assertEqual(self.server.total_requests, 1)
+
+    async def test_invalid_reviews_are_rejected_before_the_movie_lookup(self):
+        for data in [
+            {'movie_title': 'Slow Movie 3', 'rating': 9},
+            {'movie_title': 'Slow Movie 3', 'rating': 4},
+            {'movie_title': 'Slow Movie 3', 'content': 'Fine', 'rating': 'five'},
+        ]:
+            with self.subTest(data=data):
+                response = await self.client.post(
+                    reverse('review-list'), data, content_type='application/json', headers=self.auth
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.server.total_requests, 0)
+        self.assertFalse(await Movie.objects.aexists())
+
+    async def test_authentication_is_enforced(self):
+        response = await self.client.get(reverse('review-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
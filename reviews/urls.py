@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import ReviewListCreateAPIView, ReviewDetailAPIView, MovieReviewsAPIView
+from .views import ReviewListCreateAPIView, ReviewDetailAPIView, ReviewStatusAPIView, MovieReviewsAPIView
 
 urlpatterns = [
     path('', ReviewListCreateAPIView.as_view(), name='review-list'),
     path('<uuid:pk>/', ReviewDetailAPIView.as_view(), name='review-detail'),
+    path('<uuid:pk>/status/', ReviewStatusAPIView.as_view(), name='review-status'),
     path('by-movie/', MovieReviewsAPIView.as_view(), name='movie-reviews'),
 ]
\ No newline at end of file
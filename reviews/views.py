@@ -1,16 +1,24 @@
+import uuid
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
 from rest_framework import generics, filters, status, mixins
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Avg
 from .models import Review
-from .serializers import ReviewSerializer
+from .pending import defer_movie_resolution
+from .serializers import ReviewSerializer, ReviewStatusSerializer
 from utils.permissions import IsOwnerOrReadOnly
 from movies.models import Movie
 from utils.pagination import StandardResultsSetPagination
-from utils.movie_api import get_or_create_movie, search_external_movies
+from utils.views import AsyncAPIViewMixin, CachedResponseMixin, SparseFieldsetMixin
+from movies.fuzzy import suggest_titles
+from utils.movie_api import aget_or_create_movie
 
-class ReviewListCreateAPIView(mixins.ListModelMixin,
+class ReviewListCreateAPIView(AsyncAPIViewMixin,
+                                SparseFieldsetMixin,
+                                mixins.ListModelMixin,
                                 mixins.CreateModelMixin,
                                 generics.GenericAPIView):
     """
@@ -23,9 +31,11 @@ class ReviewListCreateAPIView(mixins.ListModelMixin,
     search_fields = ['movie__title', 'content']
     ordering_fields = ['rating', 'created_at']
     ordering = ['-created_at']
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
-        queryset = Review.objects.all()
+        # Only published reviews have a movie; this form is answered from the movie index
+        queryset = ReviewSerializer.setup_eager_loading(Review.objects.filter(movie__isnull=False))
         
         min_rating = self.request.query_params.get('min_rating')
         if min_rating:
@@ -38,38 +48,86 @@ class ReviewListCreateAPIView(mixins.ListModelMixin,
         movie_title = self.request.query_params.get('movie_title')
         if movie_title:
             queryset = queryset.filter(movie__title__icontains=movie_title)
+
+        user_id = self.request.query_params.get('user')
+        if user_id:
+            try:
+                queryset = queryset.filter(user_id=uuid.UUID(user_id))
+            except ValueError:
+                pass
             
         return queryset
     
-    def get(self, request, *args, **kwargs):
-        return self.list(request, *args, **kwargs)
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method == 'POST':
+            context['defer_movie_resolution'] = defer_movie_resolution(self.request)
+            context['resolved_movies'] = getattr(self, 'resolved_movies', {})
+        return context
+
+    def create(self, request, *args, **kwargs):
+        """
+        201 with the review, or 202 with its status when the movie is still
+        being resolved (poll the Location)
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        review = serializer.instance
+        if review.status == Review.Status.PENDING:
+            location = reverse('review-status', kwargs={'pk': review.pk}, request=request)
+            return Response(
+                ReviewStatusSerializer(review, context=self.get_serializer_context()).data,
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': location, 'Preference-Applied': 'respond-async'}
+            )
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    async def get(self, request, *args, **kwargs):
+        return await sync_to_async(self.list)(request, *args, **kwargs)
     
-    def post(self, request, *args, **kwargs):
-        movie_title = request.data.get('movie_title')
-        if movie_title:
-            movie = get_or_create_movie(movie_title)
-            if not movie:
-                external_results = search_external_movies(movie_title)
-                if external_results:
-                    return Response({
-                        "movie_title": f"Found movie '{movie_title}' but couldn't add it to our database. Please try again or contact support."
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                else:
-                    return Response({
-                        "movie_title": f"Could not find any movie matching '{movie_title}'. Please check spelling or try another title."
-                    }, status=status.HTTP_400_BAD_REQUEST)
-        
-        return self.create(request, *args, **kwargs)
+    def check_fields(self, request):
+        """
+        Raise the request's validation errors, short of resolving its movie
+        """
+        context = {**self.get_serializer_context(), 'skip_movie_resolution': True}
+        self.get_serializer_class()(data=request.data, context=context).is_valid(raise_exception=True)
+
+    async def post(self, request, *args, **kwargs):
+        # Resolve the movie here, where waiting on OMDB holds no thread; the
+        # serializer picks it up from the context. Invalid requests are
+        # rejected first, so they cost no OMDB call or catalog write.
+        movie_title = request.data.get('movie_title') if hasattr(request.data, 'get') else None
+        if isinstance(movie_title, str) and movie_title.strip() and not defer_movie_resolution(request):
+            await sync_to_async(self.check_fields)(request)
+            self.resolved_movies = {movie_title.strip(): await aget_or_create_movie(movie_title)}
+        return await sync_to_async(self.create)(request, *args, **kwargs)
+
+
+class ReviewStatusAPIView(mixins.RetrieveModelMixin, generics.GenericAPIView):
+    """
+    API view for polling whether the author's review was published
+    """
+    serializer_class = ReviewStatusSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Review.objects.filter(user=self.request.user).select_related('movie', 'pending_movie')
+
+    def get(self, request, *args, **kwargs):
+        return self.retrieve(request, *args, **kwargs)
 
 
-class ReviewDetailAPIView(mixins.RetrieveModelMixin,
+class ReviewDetailAPIView(SparseFieldsetMixin,
+                            mixins.RetrieveModelMixin,
                             mixins.UpdateModelMixin,
                             mixins.DestroyModelMixin,
                             generics.GenericAPIView):
     """
     API view for retrieving, updating, and deleting a review
     """
-    queryset = Review.objects.all()
+    queryset = ReviewSerializer.setup_eager_loading(Review.objects.all())
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     
@@ -77,54 +135,34 @@ class ReviewDetailAPIView(mixins.RetrieveModelMixin,
         return self.retrieve(request, *args, **kwargs)
     
     def put(self, request, *args, **kwargs):
-        movie_title = request.data.get('movie_title')
-        if movie_title:
-            movie = get_or_create_movie(movie_title)
-            if not movie:
-                return Response({
-                    "movie_title": f"Could not find movie '{movie_title}'. Please check the title."
-                }, status=status.HTTP_400_BAD_REQUEST)
-                
         return self.update(request, *args, **kwargs)
     
     def patch(self, request, *args, **kwargs):
-        movie_title = request.data.get('movie_title')
-        if movie_title:
-            movie = get_or_create_movie(movie_title)
-            if not movie:
-                return Response({
-                    "movie_title": f"Could not find movie '{movie_title}'. Please check the title."
-                }, status=status.HTTP_400_BAD_REQUEST)
-                
         return self.partial_update(request, *args, **kwargs)
     
     def delete(self, request, *args, **kwargs):
         return self.destroy(request, *args, **kwargs)
 
 
-class MovieReviewsAPIView(generics.GenericAPIView):
+class MovieReviewsAPIView(AsyncAPIViewMixin, CachedResponseMixin, SparseFieldsetMixin, generics.GenericAPIView):
     """
     API view for getting reviews for a specific movie
     """
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
+    keyset_ordering = ('-created_at', '-id')
+    # Reviews embed the movie's rating and their authors' names
+    cache_scopes = ('movie', 'review', 'user')
     
     def get_queryset(self):
-        movie_title = self.request.query_params.get('title', None)
-        if not movie_title:
+        # The movie is resolved by get(), without blocking the event loop
+        movie = getattr(self, 'movie', None)
+        if movie is None:
             return Review.objects.none()
-        
-        movie = Movie.objects.filter(title__icontains=movie_title).first()
-        if not movie:
-            movie = get_or_create_movie(movie_title)
-            
-        if not movie:
-            return Review.objects.none()
-            
-        return Review.objects.filter(movie=movie)
+        return ReviewSerializer.setup_eager_loading(Review.objects.filter(movie=movie))
     
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         movie_title = request.query_params.get('title', None)
         if not movie_title:
             return Response(
@@ -132,26 +170,42 @@ class MovieReviewsAPIView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        movie = Movie.objects.filter(title__icontains=movie_title).first()
+        cached = await sync_to_async(self.cached_response)()
+        if cached is not None:
+            return cached
+
+        movie = await Movie.objects.filter(title__icontains=movie_title).afirst()
         if not movie:
-            movie = get_or_create_movie(movie_title)
+            movie = await aget_or_create_movie(movie_title)
             
         if not movie:
             return Response(
-                {"detail": f"Movie '{movie_title}' not found"}, 
+                {"detail": f"Movie '{movie_title}' not found", "suggestions": await sync_to_async(suggest_titles)(movie_title)},
                 status=status.HTTP_404_NOT_FOUND
             )
-            
-        queryset = Review.objects.filter(movie=movie)
-        
-        avg_rating = queryset.aggregate(Avg('rating'))
+
+        self.movie = movie
+        return await sync_to_async(self.cache_response)(lambda: self.list_reviews(movie))
+
+    def get_validators(self):
+        reviews = Review.objects.filter(movie=self.movie).aggregate(
+            rows=Count('pk'), last_modified=Max('updated_at'), authors_modified=Max('user__updated_at')
+        )
+        changes = [self.movie.updated_at, reviews['last_modified'], reviews['authors_modified']]
+        return (self.movie.pk, reviews['rows'], *changes), max(change for change in changes if change)
+
+    def list_reviews(self, movie):
+        """
+        The paginated reviews of ``movie``
+        """
+        queryset = self.filter_queryset(self.get_queryset())
         
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             response_data = {
                 'movie': movie.title,
-                'average_rating': avg_rating['rating__avg'] or 0,  
+                'average_rating': movie.average_rating,
                 'reviews': serializer.data
             }
             return self.get_paginated_response(response_data)
@@ -159,6 +213,6 @@ class MovieReviewsAPIView(generics.GenericAPIView):
         serializer = self.get_serializer(queryset, many=True)
         return Response({
             'movie': movie.title,
-            'average_rating': avg_rating['rating__avg'] or 0,  
+            'average_rating': movie.average_rating,
             'reviews': serializer.data
         })
\ No newline at end of file
@@ -5,8 +5,18 @@ from .models import User
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = "__all__"
+        fields = ('id', 'email', 'first_name', 'last_name', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact user representation nested in reviews
+    """
+    class Meta:
+        model = User
+        fields = ('id', 'first_name', 'last_name')
+        read_only_fields = fields
         
         
 class UserCreationSerializer(serializers.ModelSerializer):
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from utils import response_cache
+from .models import User
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_responses(sender, using, update_fields=None, **kwargs):
+    # Logging in only records last_login, which no cached response shows
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    response_cache.bump('user', using=using)
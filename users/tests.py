@@ -1,3 +1,22 @@
+from django.contrib.auth.models import Group
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.models import User
+from utils.testing import QueryCountMixin
 
-# Create your tests here.
+
+class UserListQueryCountTest(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.group = Group.objects.create(name='critics')
+        self.user = User.objects.create_user(email='test@example.com', password='testpassword123')
+        self.client.force_authenticate(user=self.user)
+
+    def add_users(self, count):
+        for _ in range(count):
+            user = User.objects.create_user(email=f'user{User.objects.count()}@example.com')
+            user.groups.add(self.group)
+
+    def test_user_list(self):
+        self.assertConstantQueries(reverse('user-list-create'), self.add_users)
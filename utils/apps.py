@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class UtilsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'utils'
+
+    def ready(self):
+        from django.core import checks
+        from .checks import check_shared_caches
+        checks.register(check_shared_caches, checks.Tags.caches)
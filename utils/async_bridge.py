@@ -0,0 +1,100 @@
+import asyncio
+import atexit
+import contextvars
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBridge:
+    """
+    Runs coroutines on one long-lived event loop owned by a background thread.
+
+    Sync code (views, serializers) submits coroutines here instead of creating
+    and closing an event loop per call, so loop-bound resources such as the
+    pooled OMDB session are reused across requests. It also works when the
+    caller's thread already has a running loop, since the caller's loop is
+    never touched.
+    """
+
+    def __init__(self, name='async-bridge'):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        with self._lock:
+            # A forked worker inherits the loop object but not its thread
+            if self._loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._start()
+            return self._loop
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        started.wait()
+        self._loop = loop
+        self._pid = os.getpid()
+
+    def submit(self, coro):
+        """
+        Schedule a coroutine on the bridge loop and return a concurrent.futures.Future
+        """
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("AsyncBridge.run() cannot be called from the bridge loop itself")
+        # Start it in an empty context rather than a copy of the caller's: under
+        # ASGI that carries asgiref's per-request thread-sensitive executor, so
+        # sync_to_async calls made on the bridge would wait for the very thread
+        # blocked in run()
+        return contextvars.Context().run(asyncio.run_coroutine_threadsafe, coro, loop)
+
+    def run(self, coro, timeout=None):
+        """
+        Run a coroutine on the bridge loop and block until it finishes
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    async def arun(self, coro):
+        """
+        Await a coroutine on the bridge loop from another event loop (an
+        async view) without blocking a thread, so loop-bound resources such
+        as the pooled OMDB session are still shared
+        """
+        if asyncio.get_running_loop() is self.loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stop(self):
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not loop.is_running():
+            loop.close()
+
+
+async_bridge = AsyncBridge()
+atexit.register(async_bridge.stop)
@@ -0,0 +1,41 @@
+"""
+System checks for settings that only work with a cache shared between
+processes. Without CACHES every alias is a per-process LocMemCache, which
+silently turns a cross-worker limit, lock or invalidation into a
+per-worker one.
+"""
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+# (id, whether the feature is on, alias setting, what goes wrong per process, how to turn it off)
+SHARED_CACHE_SETTINGS = [
+    ('utils.W001', lambda: getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 0), 'RESPONSE_CACHE_ALIAS',
+     'other workers and management commands will not invalidate its cached responses', 'set RESPONSE_CACHE_TIMEOUT=0'),
+    ('utils.W002', lambda: getattr(settings, 'OMDB_RATE_LIMIT', 0), 'OMDB_RATE_LIMIT_ALIAS',
+     'every worker gets the whole OMDB_RATE_LIMIT budget', 'set OMDB_RATE_LIMIT=0'),
+    ('utils.W003', lambda: True, 'OMDB_CACHE_ALIAS',
+     'the shared OMDB cache tier is not shared between workers', 'leave OMDB_CACHE_ALIAS empty'),
+    ('utils.W004', lambda: True, 'OMDB_LOCK_ALIAS',
+     'concurrent lookups in other workers are not locked out', 'leave OMDB_LOCK_ALIAS empty'),
+]
+
+
+def check_shared_caches(app_configs=None, **kwargs):
+    """
+    Warn about each cross-process feature that is on but backed by a
+    local-memory cache
+    """
+    warnings = []
+    for check_id, enabled, alias_setting, problem, disable in SHARED_CACHE_SETTINGS:
+        alias = getattr(settings, alias_setting, None)
+        if not alias or not enabled() or alias not in settings.CACHES:
+            continue
+        if isinstance(caches[alias], LocMemCache):
+            warnings.append(checks.Warning(
+                f'{alias_setting} is the local-memory cache {alias!r}: {problem}.',
+                hint=f'Point {alias_setting} at a shared cache backend (Redis, Memcached, database), or {disable}.',
+                id=check_id,
+            ))
+    return warnings
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import deque
+from django.conf import settings
+from utils import metrics
+
+
+class CircuitBreaker:
+    """
+    Per-process circuit breaker for an upstream dependency.
+
+    Closed: calls go through and their outcomes are kept for ``WINDOW``
+    seconds. Once at least ``MIN_CALLS`` outcomes are recorded and the share
+    of failures reaches ``FAILURE_RATE``, the breaker opens and rejects calls
+    for ``COOLDOWN`` seconds. It then lets a single probe through (half-open):
+    success closes it, failure opens it again.
+
+    Thresholds are read from ``<prefix>_FAILURE_RATE``, ``<prefix>_MIN_CALLS``,
+    ``<prefix>_WINDOW`` and ``<prefix>_COOLDOWN`` settings on every call.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, settings_prefix, clock=time.monotonic):
+        self.name = name
+        self.settings_prefix = settings_prefix
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def _setting(self, name, default):
+        return getattr(settings, f'{self.settings_prefix}_{name}', default)
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes = deque()
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def _transition(self, state):
+        self._state = state
+        metrics.incr(f'{self.name}.breaker.{state}')
+
+    def _open(self, now):
+        self._transition(self.OPEN)
+        self._opened_at = now
+        self._probe_started = None
+        self._outcomes.clear()
+        self._failures = 0
+
+    def allow(self):
+        """
+        Whether a call may go to the upstream now. A True answer in the
+        half-open state reserves the probe; report its outcome with
+        record_success / record_failure, or hand it back with release.
+        """
+        now = self.clock()
+        cooldown = self._setting('COOLDOWN', 30)
+        with self._lock:
+            if self._state == self.OPEN and now - self._opened_at >= cooldown:
+                self._transition(self.HALF_OPEN)
+            if self._state == self.HALF_OPEN:
+                # A probe that never reported back (e.g. cancelled) expires
+                if self._probe_started is None or now - self._probe_started >= cooldown:
+                    self._probe_started = now
+                    return True
+            elif self._state == self.CLOSED:
+                return True
+        metrics.incr(f'{self.name}.breaker.rejected')
+        return False
+
+    def release(self):
+        """
+        Give back a half-open probe that was not sent
+        """
+        with self._lock:
+            self._probe_started = None
+
+    def record_success(self):
+        self._record(True)
+
+    def record_failure(self):
+        metrics.incr(f'{self.name}.breaker.failures')
+        self._record(False)
+
+    def _record(self, succeeded):
+        now = self.clock()
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if succeeded:
+                    self._transition(self.CLOSED)
+                    self._probe_started = None
+                else:
+                    self._open(now)
+                return
+            if self._state == self.OPEN:
+                return
+
+            outcomes = self._outcomes
+            outcomes.append((now, succeeded))
+            self._failures += not succeeded
+            horizon = now - self._setting('WINDOW', 30)
+            while outcomes and outcomes[0][0] < horizon:
+                self._failures -= not outcomes.popleft()[1]
+            if (len(outcomes) >= self._setting('MIN_CALLS', 10)
+                    and self._failures / len(outcomes) >= self._setting('FAILURE_RATE', 0.5)):
+                self._open(now)
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+from collections import Counter
+from aiohttp import web
+
+
+def make_omdb_movie(title, imdb_id, **fields):
+    """
+    Build an OMDB-shaped payload for a movie
+    """
+    data = {
+        'Title': title,
+        'Year': '2010',
+        'Rated': 'PG-13',
+        'Released': '16 Jul 2010',
+        'Runtime': '148 min',
+        'Genre': 'Action, Sci-Fi',
+        'Director': 'Test Director',
+        'Actors': 'Actor One, Actor Two',
+        'Plot': f'Plot of {title}',
+        'Poster': f'https://example.com/{imdb_id}.jpg',
+        'imdbRating': '8.0',
+        'imdbID': imdb_id,
+        'Type': 'movie',
+        'Response': 'True',
+    }
+    data.update(fields)
+    return data
+
+
+class FakeOMDBServer:
+    """
+    Local stand-in for the OMDB API, served from a background thread.
+    Used by tests and benchmarks; point settings.OMDB_API_URL at ``url``.
+    """
+
+    def __init__(self, titles=(), latency=0.0):
+        self.latency = latency
+        self.delays = {}
+        self.failures = {}
+        # Answer every request with this HTTP status (simulates an outage)
+        self.outage_status = None
+        self.movies = {}
+        self.requests = Counter()
+        for index, title in enumerate(titles):
+            self.add_movie(title, f'tt{index + 1:07d}')
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self.port = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.port}/'
+
+    @property
+    def total_requests(self):
+        return sum(self.requests.values())
+
+    def add_movie(self, title, imdb_id, **fields):
+        self.movies[imdb_id] = make_omdb_movie(title, imdb_id, **fields)
+
+    def reset(self):
+        self.requests.clear()
+
+    async def _handle(self, request):
+        query = request.query
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.outage_status:
+            self.requests['outage'] += 1
+            return web.Response(status=self.outage_status)
+
+        if 'i' in query:
+            self.requests['i', query['i']] += 1
+            if query['i'] in self.delays:
+                await asyncio.sleep(self.delays[query['i']])
+            if query['i'] in self.failures:
+                return web.Response(status=self.failures[query['i']])
+            movie = self.movies.get(query['i'])
+            if movie:
+                return web.json_response(movie)
+        elif 't' in query:
+            self.requests['t', query['t']] += 1
+            wanted = query['t'].casefold()
+            for movie in self.movies.values():
+                if movie['Title'].casefold() == wanted:
+                    return web.json_response(movie)
+        elif 's' in query:
+            self.requests['s', query['s']] += 1
+            term = query['s'].casefold()
+            hits = [
+                {'Title': m['Title'], 'Year': m['Year'], 'imdbID': m['imdbID'], 'Type': 'movie'}
+                for m in self.movies.values() if term in m['Title'].casefold()
+            ]
+            if hits:
+                return web.json_response({
+                    'Search': hits, 'totalResults': str(len(hits)), 'Response': 'True'
+                })
+        return web.json_response({'Response': 'False', 'Error': 'Movie not found!'})
+
+    def start(self):
+        started = threading.Event()
+
+        async def serve():
+            app = web.Application()
+            app.router.add_get('/', self._handle)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, '127.0.0.1', 0)
+            await site.start()
+            self.port = site._server.sockets[0].getsockname()[1]
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(serve())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._runner.cleanup())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name='fake-omdb', daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
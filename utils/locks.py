@@ -0,0 +1,63 @@
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from django.conf import settings
+from django.core.cache import caches
+
+
+@contextmanager
+def cache_lock(name, timeout=None, wait=None):
+    """
+    Best-effort cross-process lock kept in the cache named by OMDB_LOCK_ALIAS.
+
+    Waits up to ``wait`` seconds for the lock and yields whether it is held.
+    When no alias is configured locking is disabled and this yields True.
+    """
+    alias = getattr(settings, 'OMDB_LOCK_ALIAS', None)
+    if not alias:
+        yield True
+        return
+
+    lock_timeout = timeout or getattr(settings, 'OMDB_LOCK_TIMEOUT', 10)
+    deadline = time.monotonic() + (lock_timeout if wait is None else wait)
+    cache = caches[alias]
+    key = f'lock:{name}'
+    token = uuid.uuid4().hex
+
+    acquired = cache.add(key, token, lock_timeout)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.05)
+        acquired = cache.add(key, token, lock_timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
+
+
+@asynccontextmanager
+async def acache_lock(name, timeout=None, wait=None):
+    """
+    cache_lock for coroutines: waits without blocking the event loop
+    """
+    alias = getattr(settings, 'OMDB_LOCK_ALIAS', None)
+    if not alias:
+        yield True
+        return
+
+    lock_timeout = timeout or getattr(settings, 'OMDB_LOCK_TIMEOUT', 10)
+    deadline = time.monotonic() + (lock_timeout if wait is None else wait)
+    cache = caches[alias]
+    key = f'lock:{name}'
+    token = uuid.uuid4().hex
+
+    acquired = await cache.aadd(key, token, lock_timeout)
+    while not acquired and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        acquired = await cache.aadd(key, token, lock_timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired and await cache.aget(key) == token:
+            await cache.adelete(key)
@@ -1,6 +1,8 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.http import HttpResponseForbidden, HttpResponseRedirect
 from django.urls import resolve, reverse
 from django.urls.exceptions import Resolver404
+from whitenoise.middleware import WhiteNoiseMiddleware
 
 
 class AdminAccessMiddleware:
@@ -8,34 +10,84 @@ class AdminAccessMiddleware:
     Middleware to restrict Django admin access to superusers only.
     Allows access to login, logout, and password reset views for all users.
     """
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        # Under ASGI, stay async so the views below it are not run in a thread
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        if request.path.startswith(reverse('admin:index').split('index')[0]):
-            try:
-                match = resolve(request.path)
-                view_name = match.view_name
-            except Resolver404:
-                view_name = None
-
-            whitelisted_views = {
-                'admin:login',
-                # 'admin:logout',
-                # 'admin:password_reset',
-                # 'admin:password_reset_done',
-                # 'admin:password_reset_confirm',
-                # 'admin:password_reset_complete',
-            }
-
-            if view_name in whitelisted_views:
-                return self.get_response(request)
-
-            if not request.user.is_authenticated:
-                return HttpResponseRedirect(reverse('admin:login'))
-
-            if not request.user.is_superuser:
-                return HttpResponseForbidden("Access denied. Superuser privileges required.")
-
+        if self.async_mode:
+            return self.__acall__(request)
+        if self.is_restricted(request):
+            denied = self.deny(request.user)
+            if denied is not None:
+                return denied
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self.is_restricted(request):
+            denied = self.deny(await request.auser())
+            if denied is not None:
+                return denied
+        return await self.get_response(request)
+
+    def is_restricted(self, request):
+        if not request.path.startswith(reverse('admin:index').split('index')[0]):
+            return False
+        try:
+            match = resolve(request.path)
+            view_name = match.view_name
+        except Resolver404:
+            view_name = None
+
+        whitelisted_views = {
+            'admin:login',
+            # 'admin:logout',
+            # 'admin:password_reset',
+            # 'admin:password_reset_done',
+            # 'admin:password_reset_confirm',
+            # 'admin:password_reset_complete',
+        }
+        return view_name not in whitelisted_views
+
+    def deny(self, user):
+        if not user.is_authenticated:
+            return HttpResponseRedirect(reverse('admin:login'))
+
+        if not user.is_superuser:
+            return HttpResponseForbidden("Access denied. Superuser privileges required.")
+        return None
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, usable in an async middleware chain. WhiteNoiseMiddleware is
+    sync only, which under ASGI makes Django run every view below it in a
+    thread; here only static files are served from one.
+    """
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
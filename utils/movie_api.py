@@ -1,165 +1,469 @@
 import aiohttp
 import asyncio
+import atexit
 import logging
+import os
+import re
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections, transaction
+from django.utils import timezone
 from movies.models import Movie
+from movies.fuzzy import title_index, find_similar_movies, fuzzy_enabled, numbering, split_year
+from movies.relations import sync_movie_relations
+from movies.search import index_movies
 from asgiref.sync import sync_to_async
+from utils import metrics, response_cache
+from utils.async_bridge import async_bridge
+from utils.circuit_breaker import CircuitBreaker
+from utils.locks import acache_lock, cache_lock
+from utils.omdb_cache import omdb_cache, NOT_FOUND
+from utils.rate_limit import SharedRateLimiter
+from utils.singleflight import SingleFlight, AsyncSingleFlight
+from utils.text import normalize_title, parse_rating, parse_runtime, parse_year
 
 logger = logging.getLogger(__name__)
 
 OMDB_API_URL = "http://www.omdbapi.com/"
+IMDB_ID_RE = re.compile(r'^tt\d{7,}$', re.IGNORECASE)
+
+# Statuses that mean OMDB (or our key) is in trouble, as opposed to a bad request
+UPSTREAM_FAILURE_STATUSES = {401, 429}
+
+
+class OMDBUnavailable(Exception):
+    """
+    OMDB was not called: the circuit breaker is open or the shared rate limit is spent
+    """
+
+
+class OMDBClient:
+    """
+    Process-wide OMDB client backed by a persistent aiohttp connection pool.
+
+    aiohttp sessions are bound to the event loop they were created on, so one
+    session is kept per running loop and reused by every call made on it.
+    """
+
+    def __init__(self):
+        self._sessions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return getattr(settings, 'OMDB_API_URL', OMDB_API_URL)
+
+    def _create_session(self):
+        connector = aiohttp.TCPConnector(
+            limit=getattr(settings, 'OMDB_CONNECTION_LIMIT', 100),
+            limit_per_host=getattr(settings, 'OMDB_CONNECTION_LIMIT_PER_HOST', 20),
+            keepalive_timeout=getattr(settings, 'OMDB_KEEPALIVE_TIMEOUT', 30),
+            ttl_dns_cache=300,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=getattr(settings, 'OMDB_REQUEST_TIMEOUT', 10),
+            connect=getattr(settings, 'OMDB_CONNECT_TIMEOUT', 3),
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    def get_session(self):
+        """
+        Return the pooled session for the running event loop, creating it on first use
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                session = self._create_session()
+                self._sessions[loop] = session
+            return session
+
+    async def get(self, params):
+        """
+        Perform a GET request against OMDB and return (status, json payload).
+        Raises OMDBUnavailable without calling OMDB while the circuit breaker
+        is open or the shared rate limit (OMDB_RATE_LIMIT) is spent.
+        """
+        if not omdb_breaker.allow():
+            raise OMDBUnavailable("OMDB circuit breaker is open")
+        rate = getattr(settings, 'OMDB_RATE_LIMIT', 0)
+        if rate:
+            try:
+                acquired = await omdb_rate_limiter.acquire(
+                    rate,
+                    caches[getattr(settings, 'OMDB_RATE_LIMIT_ALIAS', 'default')],
+                    wait=getattr(settings, 'OMDB_RATE_LIMIT_WAIT', 0.5),
+                )
+            except BaseException:
+                omdb_breaker.release()
+                raise
+            if not acquired:
+                omdb_breaker.release()
+                metrics.incr('omdb.rate_limited')
+                raise OMDBUnavailable("OMDB rate limit reached")
+
+        query = {'apikey': settings.OMDB_API_KEY or '', 'r': 'json'}
+        query.update(params)
+        try:
+            async with self.get_session().get(self.base_url, params=query) as response:
+                if response.status != 200:
+                    data = None
+                else:
+                    data = await response.json(content_type=None)
+        except asyncio.CancelledError:
+            # Abandoned by the caller (e.g. a search deadline), not an upstream failure
+            omdb_breaker.release()
+            raise
+        except Exception:
+            omdb_breaker.record_failure()
+            raise
+        if response.status in UPSTREAM_FAILURE_STATUSES or response.status >= 500:
+            omdb_breaker.record_failure()
+        else:
+            omdb_breaker.record_success()
+        return response.status, data
+
+    async def close(self):
+        """
+        Close the session bound to the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def shutdown(self):
+        """
+        Close every pooled session whose loop is still usable (registered with atexit,
+        after the bridge so it runs while the bridge loop is still alive)
+        """
+        with self._lock:
+            sessions = list(self._sessions.items())
+            self._sessions.clear()
+        for loop, session in sessions:
+            if session.closed or loop.is_closed():
+                continue
+            try:
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=5)
+                else:
+                    loop.run_until_complete(session.close())
+            except Exception as e:
+                logger.warning(f"Error closing OMDB session: {str(e)}")
+
+
+omdb_client = OMDBClient()
+atexit.register(omdb_client.shutdown)
+omdb_breaker = CircuitBreaker('omdb', 'OMDB_BREAKER')
+omdb_rate_limiter = SharedRateLimiter('omdb')
+
+# Concurrent lookups of the same title / IMDb ID share one upstream call,
+# and concurrent resolutions of the same title share one DB write
+_omdb_flights = AsyncSingleFlight('omdb')
+_movie_flights = SingleFlight('movie')
+_async_movie_flights = AsyncSingleFlight('movie')
+
+
+def _parse_movie(data):
+    """
+    Map an OMDB payload onto our movie fields
+    """
+    return {
+        'title': data.get('Title'),
+        'year': data.get('Year'),
+        'rated': data.get('Rated'),
+        'released': data.get('Released'),
+        'runtime': data.get('Runtime'),
+        'genre': data.get('Genre'),
+        'director': data.get('Director'),
+        'actors': data.get('Actors'),
+        'plot': data.get('Plot'),
+        'poster': data.get('Poster'),
+        'external_id': data.get('imdbID'),
+        'imdb_rating': data.get('imdbRating')
+    }
+
+async def _request_movie(params):
+    """
+    Fetch a single movie from OMDB, uncached
+    """
+    status, data = await omdb_client.get(params)
+    if status != 200:
+        return {'error': f'API Error: {status}'}
+    return _parse_movie(data) if data.get('Response') == 'True' else dict(NOT_FOUND)
+
+async def _fetch_movie(params, cache_key):
+    """
+    Fetch a single movie from OMDB and cache the answer (hit or not found)
+    """
+    result = await _request_movie(params)
+    if 'error' in result and result != NOT_FOUND:
+        return result
+    await omdb_cache.set(cache_key, result)
+    return result
 
 async def fetch_movie_details(movie_title):
     """
     Asynchronously fetch movie details from OMDB API
     """
+    cache_key = omdb_cache.make_key('title', movie_title)
+    cached = await omdb_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        api_key = settings.OMDB_API_KEY
-        params = {
-            'apikey': api_key,
-            't': movie_title,
-            'plot': 'short',
-            'r': 'json'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(OMDB_API_URL, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get('Response') == 'True':
-                        return {
-                            'title': data.get('Title'),
-                            'year': data.get('Year'),
-                            'rated': data.get('Rated'),
-                            'released': data.get('Released'),
-                            'runtime': data.get('Runtime'),
-                            'genre': data.get('Genre'),
-                            'director': data.get('Director'),
-                            'actors': data.get('Actors'),
-                            'plot': data.get('Plot'),
-                            'poster': data.get('Poster'),
-                            'external_id': data.get('imdbID'),
-                            'imdb_rating': data.get('imdbRating')
-                        }
-                    return {'error': 'Movie not found'}
-                return {'error': f'API Error: {response.status}'}
+        params = {'t': ' '.join(movie_title.split()), 'plot': 'short'}
+        return dict(await _omdb_flights.do(cache_key, _fetch_movie, params, cache_key))
     except Exception as e:
         logger.error(f"Error fetching movie details: {str(e)}")
         return {'error': f'Failed to fetch movie details: {str(e)}'}
 
-async def fetch_movie_search(search_term):
+async def fetch_movie_search(search_term, limit=None):
     """
     Asynchronously search for movies from OMDB API
+
+    Details for the top ``limit`` hits are fetched concurrently (bounded by
+    OMDB_SEARCH_CONCURRENCY). Each lookup has its own timeout and the whole
+    search has a deadline; whatever finished by then is returned.
     """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + getattr(settings, 'OMDB_SEARCH_DEADLINE', 5)
+    if limit is None:
+        limit = getattr(settings, 'OMDB_SEARCH_RESULT_LIMIT', 5)
+
+    cache_key = omdb_cache.make_key('search', search_term, limit)
+    cached = await omdb_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        api_key = settings.OMDB_API_KEY
-        params = {
-            'apikey': api_key,
-            's': search_term,
-            'r': 'json'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(OMDB_API_URL, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get('Response') == 'True':
-                        search_results = []
-                        for item in data.get('Search', [])[:5]:  
-                            movie_id = item.get('imdbID')
-                            movie_details = await fetch_movie_by_id(movie_id, session)
-                            if 'error' not in movie_details:
-                                search_results.append(movie_details)
-                        return search_results
-                    return []
-                return []
+        status, data = await omdb_client.get({'s': search_term})
+        if status != 200:
+            return []
+
+        movie_ids = [item.get('imdbID') for item in data.get('Search', [])[:limit]]
+        if data.get('Response') != 'True' or not movie_ids:
+            await omdb_cache.set(cache_key, [])
+            return []
+
+        semaphore = asyncio.Semaphore(getattr(settings, 'OMDB_SEARCH_CONCURRENCY', 5))
+        item_timeout = getattr(settings, 'OMDB_SEARCH_ITEM_TIMEOUT', 3)
+
+        async def fetch_detail(movie_id):
+            async with semaphore:
+                return await asyncio.wait_for(fetch_movie_by_id(movie_id), item_timeout)
+
+        tasks = [asyncio.ensure_future(fetch_detail(movie_id)) for movie_id in movie_ids]
+        done, pending = await asyncio.wait(tasks, timeout=max(0, deadline - loop.time()))
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"OMDB search for '{search_term}' returned {len(done)} of {len(tasks)} results before the deadline")
+
+        search_results = []
+        for task in tasks:
+            if task in done and task.exception() is None:
+                movie_details = task.result()
+                if 'error' not in movie_details:
+                    search_results.append(movie_details)
+        # Partial results are served but not cached
+        if not pending:
+            await omdb_cache.set(cache_key, search_results)
+        return search_results
     except Exception as e:
         logger.error(f"Error searching movies: {str(e)}")
         return []
 
-async def fetch_movie_by_id(movie_id, session=None):
+async def fetch_movie_by_id(movie_id):
     """
     Fetch movie details by IMDB ID
     """
+    cache_key = omdb_cache.make_key('id', movie_id)
+    cached = await omdb_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        close_session = False
-        if session is None:
-            session = aiohttp.ClientSession()
-            close_session = True
-            
-        api_key = settings.OMDB_API_KEY
-        params = {
-            'apikey': api_key,
-            'i': movie_id,
-            'plot': 'short'
-        }
-        
-        async with session.get(OMDB_API_URL, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                if data.get('Response') == 'True':
-                    return {
-                        'title': data.get('Title'),
-                        'year': data.get('Year'),
-                        'rated': data.get('Rated'),
-                        'runtime': data.get('Runtime'),
-                        'genre': data.get('Genre'),
-                        'director': data.get('Director'),
-                        'actors': data.get('Actors'),
-                        'plot': data.get('Plot'),
-                        'poster': data.get('Poster'),
-                        'external_id': data.get('imdbID'),
-                        'imdb_rating': data.get('imdbRating')
-                    }
-            return {'error': 'Movie not found'}
+        params = {'i': movie_id, 'plot': 'short'}
+        return dict(await _omdb_flights.do(cache_key, _fetch_movie, params, cache_key))
     except Exception as e:
         logger.error(f"Error fetching movie by ID: {str(e)}")
         return {'error': f'Failed to fetch movie details: {str(e)}'}
-    finally:
-        if close_session and session:
-            await session.close()
 
-@sync_to_async
-def create_or_update_movie_in_db(movie_data):
+async def refetch_movie_by_id(movie_id):
+    """
+    Fetch movie details by IMDb ID straight from OMDB, replacing any cached
+    answer with the fresh one (refreshes)
+    """
+    cache_key = omdb_cache.make_key('id', movie_id)
+    try:
+        params = {'i': movie_id, 'plot': 'short'}
+        return dict(await _fetch_movie(params, cache_key))
+    except Exception as e:
+        logger.error(f"Error fetching movie by ID: {str(e)}")
+        return {'error': f'Failed to fetch movie details: {str(e)}'}
+
+async def fetch_movie(title_or_id):
+    """
+    Fetch a movie by title or IMDb ID, through the response cache
+    """
+    title_or_id = title_or_id.strip()
+    if IMDB_ID_RE.match(title_or_id):
+        return await fetch_movie_by_id(title_or_id.lower())
+    return await fetch_movie_details(title_or_id)
+
+async def fetch_movie_uncached(title_or_id):
+    """
+    Fetch a movie by title or IMDb ID straight from OMDB, bypassing the
+    response cache and lookup coalescing (bulk imports, refreshes)
+    """
+    title_or_id = title_or_id.strip()
+    if IMDB_ID_RE.match(title_or_id):
+        params = {'i': title_or_id.lower(), 'plot': 'short'}
+    else:
+        params = {'t': ' '.join(title_or_id.split()), 'plot': 'short'}
+    try:
+        return await _request_movie(params)
+    except Exception as e:
+        logger.error(f"Error fetching movie: {str(e)}")
+        return {'error': f'Failed to fetch movie details: {str(e)}'}
+
+UPSERT_FIELDS = [
+    'title', 'year', 'rated', 'runtime', 'genre', 'director', 'actors', 'plot', 'poster', 'imdb_rating',
+    'last_fetched_at',
+]
+
+def movie_fields(movie_data):
+    """
+    Movie field values for parsed OMDB data
+    """
+    return {
+        'title': movie_data['title'],
+        'external_id': movie_data.get('external_id'),
+        'year': parse_year(movie_data.get('year')),
+        'rated': movie_data.get('rated'),
+        'runtime': parse_runtime(movie_data.get('runtime')),
+        'genre': movie_data.get('genre'),
+        'director': movie_data.get('director'),
+        'actors': movie_data.get('actors'),
+        'plot': movie_data.get('plot'),
+        'poster': movie_data.get('poster'),
+        'imdb_rating': parse_rating(movie_data.get('imdb_rating')),
+        'last_fetched_at': timezone.now(),
+    }
+
+def save_movie_data(movie_data):
     """
     Create or update a movie in the database (sync function)
+
+    OMDB data is upserted on its unique IMDb ID in a single INSERT ... ON
+    CONFLICT statement, so concurrent saves of one movie cannot race into
+    duplicate rows.
     """
     try:
-        year_value = None
-        if movie_data.get('year'):
-            try:
-                year_str = movie_data.get('year', '').split('–')[0].strip()
-                year_value = int(year_str) if year_str.isdigit() else None
-            except (ValueError, TypeError):
-                year_value = None
-        
-        imdb_rating = None
-        if movie_data.get('imdb_rating'):
-            try:
-                imdb_rating = float(movie_data.get('imdb_rating'))
-            except (ValueError, TypeError):
-                imdb_rating = None
-        
-        movie, created = Movie.objects.update_or_create(
-            title=movie_data['title'],
-            defaults={
-                'external_id': movie_data.get('external_id'),
-                'year': year_value,
-                'rated': movie_data.get('rated'),
-                'runtime': movie_data.get('runtime'),
-                'genre': movie_data.get('genre'),
-                'director': movie_data.get('director'),
-                'actors': movie_data.get('actors'),
-                'plot': movie_data.get('plot'),
-                'poster': movie_data.get('poster'),
-                'imdb_rating': imdb_rating
-            }
-        )
+        if movie_data.get('external_id'):
+            return upsert_movies([movie_data])[0]
+        # Data without an IMDb ID (not from OMDB) matches an ID-less row with the same title
+        movie = Movie.objects.filter(
+            normalized_title=normalize_title(movie_data['title']), external_id=None
+        ).order_by('created_at').first() or Movie()
+        for field, value in movie_fields(movie_data).items():
+            setattr(movie, field, value)
+        movie.save()
         return movie
     except Exception as e:
         logger.error(f"Error saving movie: {str(e)}")
         return None
 
+def upsert_movies(movie_data_list, using='default', **insert_fields):
+    """
+    Insert or update many movies keyed on external_id in one statement.
+    bulk_create skips Movie's save() and signals, so the normalized title,
+    search index, genre/person relations and trigram index are maintained
+    here. Data without an IMDb ID is skipped. ``insert_fields`` only apply
+    to new rows. Returns the saved movies.
+    """
+    by_id = {data['external_id']: data for data in movie_data_list if data.get('external_id')}
+    if not by_id:
+        return []
+    movies = [Movie(**movie_fields(data), **insert_fields) for data in by_id.values()]
+    for movie in movies:
+        movie.normalized_title = normalize_title(movie.title)
+    with transaction.atomic(using=using):
+        Movie.objects.using(using).bulk_create(
+            movies,
+            update_conflicts=True,
+            unique_fields=['external_id'],
+            update_fields=[*UPSERT_FIELDS, 'normalized_title', 'updated_at'],
+        )
+        # Conflicting rows keep their existing primary keys; read them back
+        movies = list(Movie.objects.using(using).filter(external_id__in=by_id))
+        index_movies(movies, using)
+        sync_movie_relations(Movie, movies, using)
+        entries = [(movie.id, movie.normalized_title) for movie in movies]
+
+        def update_title_index():
+            for movie_id, normalized_title in entries:
+                title_index.update(movie_id, normalized_title)
+
+        transaction.on_commit(update_title_index, using=using)
+        response_cache.bump('movie', using=using)
+    return movies
+
+def store_search_results(movie_data_list, using='default'):
+    """
+    Add OMDB search results missing from the catalog in one batched write, so
+    later reviews of those titles are served locally. Stored movies are left
+    alone: a (possibly cached) search result is no fresher than they are.
+    """
+    by_id = {data['external_id']: data for data in movie_data_list if data.get('external_id') and data.get('title')}
+    if not by_id:
+        return []
+    stored = set(Movie.objects.using(using).filter(external_id__in=by_id).values_list('external_id', flat=True))
+    missing = [data for external_id, data in by_id.items() if external_id not in stored]
+    if not missing:
+        return []
+    movies = upsert_movies(missing, using, from_search=True)
+    metrics.incr('catalog.search_warmed.movies', len(movies))
+    return movies
+
+def _store_search_results_in_background(movie_data_list):
+    close_old_connections()
+    try:
+        return store_search_results(movie_data_list)
+    except Exception as e:
+        logger.error(f"Error storing search results: {str(e)}")
+        return []
+    finally:
+        close_old_connections()
+
+_catalog_writer = None
+_catalog_writer_pid = None
+_catalog_writer_lock = threading.Lock()
+
+def warm_catalog(movie_data_list):
+    """
+    Queue search results for store_search_results on a background thread,
+    off the request path, unless MOVIE_SEARCH_WARM_CATALOG is off. Returns
+    a concurrent.futures.Future, or None when nothing was queued.
+    """
+    global _catalog_writer, _catalog_writer_pid
+    if not movie_data_list or not getattr(settings, 'MOVIE_SEARCH_WARM_CATALOG', True):
+        return None
+    with _catalog_writer_lock:
+        # One writer thread keeps these writes from contending with each other;
+        # a forked worker inherits the executor but not its thread
+        if _catalog_writer is None or _catalog_writer_pid != os.getpid():
+            _catalog_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='catalog-writer')
+            _catalog_writer_pid = os.getpid()
+        return _catalog_writer.submit(_store_search_results_in_background, list(movie_data_list))
+
+create_or_update_movie_in_db = sync_to_async(save_movie_data)
+
 async def save_movie_details(movie_title):
     """
     Fetch movie details and save to database
@@ -175,48 +479,159 @@ async def save_movie_details(movie_title):
             return None
     return None
 
-def get_movie_from_db(movie_title):
+def get_movie_from_db(movie_title, partial=True):
     """
     Get movie from database (sync function)
+
+    IMDb IDs and normalized titles are matched through their indexes (exact,
+    then prefix range); a substring scan is only the last resort. With
+    ``partial`` off only exact matches are returned.
     """
-    movie = Movie.objects.filter(title__iexact=movie_title).first()
-    
+    movie_title = movie_title.strip()
+    if IMDB_ID_RE.match(movie_title):
+        movie = Movie.objects.filter(external_id=movie_title.lower()).first()
+        if movie:
+            return movie
+
+    normalized = normalize_title(movie_title)
+    if not normalized:
+        return None
+
+    movie = Movie.objects.filter(normalized_title=normalized).first()
+    if movie or not partial:
+        return movie
+
+    movie = Movie.objects.filter(
+        normalized_title__gte=normalized,
+        normalized_title__lt=normalized + '\uffff'
+    ).order_by('normalized_title').first()
     if movie:
         return movie
-    
-    return Movie.objects.filter(title__icontains=movie_title).first()
+
+    if fuzzy_enabled():
+        # The trigram index narrows substring matches to a few candidates
+        movie_ids = title_index.containing(normalized, limit=5)
+        movies = Movie.objects.in_bulk(movie_ids) if movie_ids else {}
+        return next((movies[movie_id] for movie_id in movie_ids if movie_id in movies), None)
+    return Movie.objects.filter(normalized_title__contains=normalized).first()
+
+def get_closest_movie(movie_title):
+    """
+    Return the stored movie ``movie_title`` is a near-exact misspelling of,
+    or None. Only a fallback for titles OMDB does not know: sequel numbers
+    and a trailing "(year)" must match as well, since close titles are
+    often different films (Alien and Aliens).
+    """
+    if IMDB_ID_RE.match(movie_title.strip()):
+        return None
+    title, year = split_year(movie_title)
+    threshold = getattr(settings, 'MOVIE_FUZZY_MATCH_THRESHOLD', 0.9)
+    wanted = numbering(title)
+    for movie, _ in find_similar_movies(title, limit=3, threshold=threshold):
+        if numbering(movie.title) == wanted and year in (None, movie.year):
+            return movie
+    return None
+
+def find_stored_movie(movie_title):
+    """
+    The stored movie with exactly this IMDb ID or (normalized) title
+    """
+    return get_movie_from_db(movie_title, partial=False)
+
+def find_partial_match(movie_title):
+    """
+    The stored movie a title OMDB does not know most likely means: one whose
+    title contains it, or a near-exact misspelling
+    """
+    return get_movie_from_db(movie_title) or get_closest_movie(movie_title)
 
 def get_or_create_movie(movie_title):
     """
-    Get movie from database or fetch from API if not found
+    Get movie from database or fetch from API if not found. Anything short of
+    an exact match is looked up on OMDB first, since close titles are often
+    different films.
     """
-    movie = get_movie_from_db(movie_title)
+    movie = find_stored_movie(movie_title)
     if movie:
         return movie
-        
-    try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+
+    movie = _movie_flights.do(normalize_title(movie_title), _resolve_movie, movie_title)
+    return movie or find_partial_match(movie_title)
+
+async def aget_or_create_movie(movie_title):
+    """
+    get_or_create_movie for async views: database work runs in a thread,
+    while the OMDB lookup is awaited without holding one
+    """
+    movie = await sync_to_async(find_stored_movie)(movie_title)
+    if movie:
+        return movie
+
+    movie = await _async_movie_flights.do(normalize_title(movie_title), _aresolve_movie, movie_title)
+    return movie or await sync_to_async(find_partial_match)(movie_title)
+
+def _resolve_movie(movie_title):
+    """
+    Fetch and store a movie missing from the database. Runs once at a time per
+    normalized title in this process, and across processes when OMDB_LOCK_ALIAS is set.
+    """
+    with cache_lock(omdb_cache.make_key('title', movie_title)):
+        # Another worker may have stored it while we waited for the lock
+        movie = find_stored_movie(movie_title)
+        if movie:
+            return movie
+
         try:
-            return loop.run_until_complete(save_movie_details(movie_title))
-        finally:
-            loop.close()
-    except Exception as e:
-        logger.error(f"Failed to get or create movie: {str(e)}")
-        return None
+            movie_data = async_bridge.run(fetch_movie(movie_title))
+        except Exception as e:
+            logger.error(f"Failed to get or create movie: {str(e)}")
+            return None
+
+        if 'error' in movie_data:
+            return None
+        return save_movie_data(movie_data)
 
-def search_external_movies(search_term):
+async def _aresolve_movie(movie_title):
+    """
+    _resolve_movie for coroutines: runs once at a time per normalized title
+    on this event loop, and across processes when OMDB_LOCK_ALIAS is set
+    """
+    async with acache_lock(omdb_cache.make_key('title', movie_title)):
+        movie = await sync_to_async(find_stored_movie)(movie_title)
+        if movie:
+            return movie
+
+        try:
+            movie_data = await async_bridge.arun(fetch_movie(movie_title))
+        except Exception as e:
+            logger.error(f"Failed to get or create movie: {str(e)}")
+            return None
+
+        if 'error' in movie_data:
+            return None
+        return await create_or_update_movie_in_db(movie_data)
+
+def search_external_movies(search_term, limit=None):
     """
     Search for movies from the external API
     Returns a list of movie data dictionaries
     """
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(fetch_movie_search(search_term))
-        finally:
-            loop.close()
+        results = async_bridge.run(fetch_movie_search(search_term, limit))
     except Exception as e:
         logger.error(f"Error in search_external_movies: {str(e)}")
-        return []
\ No newline at end of file
+        return []
+    warm_catalog(results)
+    return results
+
+async def asearch_external_movies(search_term, limit=None):
+    """
+    search_external_movies for async views
+    """
+    try:
+        results = await async_bridge.arun(fetch_movie_search(search_term, limit))
+    except Exception as e:
+        logger.error(f"Error in search_external_movies: {str(e)}")
+        return []
+    warm_catalog(results)
+    return results
@@ -0,0 +1,117 @@
+import copy
+import hashlib
+import logging
+import threading
+import time
+from cachetools import TLRUCache
+from django.conf import settings
+from django.core.cache import caches
+from utils import metrics
+from utils.text import normalize_title
+
+logger = logging.getLogger(__name__)
+
+NOT_FOUND = {'error': 'Movie not found'}
+
+
+def is_negative(value):
+    return value == NOT_FOUND or value == []
+
+
+class _LocalTier(TLRUCache):
+    """
+    In-process LRU tier with a per-entry expiry that counts evictions
+    """
+
+    def popitem(self):
+        item = super().popitem()
+        metrics.incr('omdb_cache.evictions')
+        return item
+
+
+class OMDBCache:
+    """
+    Two-tier cache for OMDB responses.
+
+    Lookups check an in-process LRU first, then an optional shared tier backed by
+    Django's cache framework (OMDB_CACHE_ALIAS). Successful results live for
+    OMDB_CACHE_TTL seconds and "not found" answers for OMDB_CACHE_NEGATIVE_TTL.
+    """
+
+    def __init__(self):
+        self._local = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _ttl(value):
+        if is_negative(value):
+            return getattr(settings, 'OMDB_CACHE_NEGATIVE_TTL', 600)
+        return getattr(settings, 'OMDB_CACHE_TTL', 86400)
+
+    @property
+    def local(self):
+        if self._local is None:
+            self._local = _LocalTier(
+                maxsize=getattr(settings, 'OMDB_CACHE_MAXSIZE', 2048),
+                ttu=lambda key, value, now: now + self._ttl(value),
+                timer=time.monotonic,
+            )
+        return self._local
+
+    @property
+    def shared(self):
+        alias = getattr(settings, 'OMDB_CACHE_ALIAS', None)
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def make_key(kind, value, *extra):
+        """
+        Build a cache key from a normalized title, search term or IMDb ID
+        """
+        normalized = normalize_title(value) if kind in ('title', 'search') else str(value).strip().lower()
+        raw = ':'.join([normalized, *map(str, extra)])
+        return f"omdb:{kind}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key):
+        with self._lock:
+            value = self.local.get(key)
+        if value is None and self.shared is not None:
+            try:
+                value = await self.shared.aget(key)
+            except Exception as e:
+                logger.warning(f"OMDB shared cache read failed: {str(e)}")
+                value = None
+            if value is not None:
+                metrics.incr('omdb_cache.shared_hits')
+                with self._lock:
+                    self.local[key] = value
+        elif value is not None:
+            metrics.incr('omdb_cache.local_hits')
+
+        if value is None:
+            metrics.incr('omdb_cache.misses')
+            return None
+        metrics.incr('omdb_cache.hits')
+        if is_negative(value):
+            metrics.incr('omdb_cache.negative_hits')
+        return copy.deepcopy(value)
+
+    async def set(self, key, value):
+        # Keep our own copy: callers go on to use (and may change) ``value``
+        value = copy.deepcopy(value)
+        with self._lock:
+            self.local[key] = value
+        if self.shared is not None:
+            try:
+                await self.shared.aset(key, value, self._ttl(value))
+            except Exception as e:
+                logger.warning(f"OMDB shared cache write failed: {str(e)}")
+
+    def clear(self, shared=False):
+        with self._lock:
+            self._local = None
+        if shared and self.shared is not None:
+            self.shared.clear()
+
+
+omdb_cache = OMDBCache()
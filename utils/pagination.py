@@ -1,12 +1,182 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that caches COUNT(*) per query for PAGINATION_COUNT_CACHE_TIMEOUT
+    seconds, so paging through a large table does not recount it every time.
+    Counts (and total_pages) may lag behind writes by up to that long.
+    """
+
+    @cached_property
+    def count(self):
+        timeout = getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 0)
+        query = getattr(self.object_list, 'query', None)
+        if not timeout or query is None:
+            return super().count
+        try:
+            sql, params = query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        digest = hashlib.sha1(f'{self.object_list.db}:{sql}:{params!r}'.encode()).hexdigest()
+        key = f'pagination:count:{digest}'
+        cache = caches[getattr(settings, 'PAGINATION_COUNT_CACHE_ALIAS', 'default')]
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, timeout)
+        return count
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination over the view's ``keyset_ordering``, e.g.
+    ``('-created_at', '-id')``. Pages are fetched with WHERE (created_at, id)
+    < (last seen) instead of OFFSET and without a COUNT(*), so every page
+    costs the same. The last field must be unique. Cursors are opaque
+    base64 tokens carried in ?cursor=.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    @staticmethod
+    def encode_cursor(position, reverse=False):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            position, reverse = payload['p'], bool(payload['r'])
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(field).to_python(value)
+                for (field, _), value in zip(self.ordering, position)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _seek(self, position, reverse):
+        """
+        Rows strictly after ``position`` in the (possibly reversed) ordering.
+        The redundant bound on the leading field lets the database seek the
+        index instead of scanning it to evaluate the OR.
+        """
+        condition = Q()
+        for index, (field, descending) in enumerate(self.ordering):
+            lookup = 'lt' if descending != reverse else 'gt'
+            equal = {name: value for (name, _), value in zip(self.ordering[:index], position[:index])}
+            condition |= Q(**equal, **{f'{field}__{lookup}': position[index]})
+        field, descending = self.ordering[0]
+        bound = 'lte' if descending != reverse else 'gte'
+        return Q(**{f'{field}__{bound}': position[0]}) & condition
+
+    def _position(self, row):
+        return [self.model._meta.get_field(field).value_to_string(row) for field, _ in self.ordering]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.ordering = [(field.lstrip('-'), field.startswith('-')) for field in view.keyset_ordering]
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[1])
+
+        queryset = queryset.order_by(*[
+            ('-' if descending != reverse else '') + field for field, descending in self.ordering
+        ])
+        # Keep the ordering columns when the queryset was trimmed with only()
+        names, deferred = queryset.query.deferred_loading
+        if names and not deferred:
+            queryset = queryset.only(*names, *[field for field, _ in self.ordering])
+        if cursor:
+            queryset = queryset.filter(self._seek(cursor[0], reverse))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+        self.has_next = has_more or reverse
+        self.has_previous = bool(cursor) and (has_more or not reverse)
+        self.first_position = self._position(rows[0]) if rows else None
+        self.last_position = self._position(rows[-1]) if rows else None
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.first_position is None:
+            return remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.first_position, reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'links': {
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link()
+            },
+            'results': data
+        })
+
 
 class StandardResultsSetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset mode: clients that send
+    ?cursor= (or ?pagination=keyset for the first page) to a view declaring
+    ``keyset_ordering`` get KeysetPagination instead
+    """
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
-    
+    django_paginator_class = CachedCountPaginator
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if getattr(view, 'keyset_ordering', None) and (
+                KeysetPagination.cursor_query_param in request.query_params
+                or request.query_params.get('pagination') == 'keyset'):
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
         return Response({
             'links': {
                 'next': self.get_next_link(),
@@ -16,4 +186,4 @@ class StandardResultsSetPagination(PageNumberPagination):
             'total_pages': self.page.paginator.num_pages,
             'current_page': self.page.number,
             'results': data
-        })
\ No newline at end of file
+        })
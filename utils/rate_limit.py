@@ -0,0 +1,80 @@
+import asyncio
+import time
+from asgiref.sync import sync_to_async
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for coroutines on one event loop: ``rate`` acquisitions per
+    second on average, with bursts of up to ``capacity``.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        Wait until a token is available and take it. Waiters are served in
+        arrival order.
+        """
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class SharedRateLimiter:
+    """
+    Request budget shared by every process using the same Django cache: at
+    most ``rate`` acquisitions per one-second window, counted with an atomic
+    cache increment per window. With a shared backend (Redis, Memcached) the
+    budget is global; with LocMemCache it is per process.
+    """
+
+    def __init__(self, name, clock=time.time):
+        self.name = name
+        # Wall-clock windows line up across processes
+        self.clock = clock
+
+    async def acquire(self, rate, cache, wait=0.0):
+        """
+        Take one request from the budget, waiting up to ``wait`` seconds for
+        the next window if this one is spent. Returns whether it was taken.
+        """
+        deadline = self.clock() + wait
+        while True:
+            now = self.clock()
+            window = int(now)
+            count = await sync_to_async(self._count, thread_sensitive=False)(cache, window)
+            if count is None:
+                # The window's key expired between add and incr
+                continue
+            if count <= rate:
+                return True
+            if window + 1 > deadline:
+                return False
+            await asyncio.sleep(window + 1 - now)
+
+    def _count(self, cache, window):
+        # The cache's async incr is a non-atomic get and set; the sync one is
+        # atomic on the shared backends
+        key = f'ratelimit:{self.name}:{window}'
+        cache.add(key, 0, timeout=2)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            return None
@@ -0,0 +1,76 @@
+"""
+Version counters for the response cache (see utils.views.CachedResponseMixin).
+
+Cached responses are keyed on the current version of every scope they read
+('movie', 'review', 'user'); saving or deleting a row of that kind bumps the
+scope, so stale entries are never read again and simply expire. Writes that
+skip model signals (bulk_create, update()) call bump() themselves.
+
+The versions live in the cache too, so invalidation only reaches processes
+sharing it: RESPONSE_CACHE_ALIAS must name a shared backend (Redis,
+Memcached, database) when the cache is on.
+"""
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+VERSION_KEY = 'response:version:{}'
+
+
+def response_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _initial_version():
+    # Start from the clock rather than 0, so an evicted counter cannot come
+    # back at a version older entries were cached under
+    return time.time_ns()
+
+
+def versions(scopes):
+    """
+    The current version of each scope
+    """
+    cache = response_cache()
+    keys = [VERSION_KEY.format(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _initial_version(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump(*scopes, using='default'):
+    """
+    Invalidate the responses cached for ``scopes``, now and again when the
+    current transaction commits: a request reading the old rows until then
+    would otherwise cache them under the new version. Nothing to do while
+    the cache is off.
+    """
+    if not getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 0):
+        return
+
+    def increment():
+        cache = response_cache()
+        for scope in scopes:
+            key = VERSION_KEY.format(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, _initial_version(), None)
+
+    increment()
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(increment, using=using)
+
+
+def request_fingerprint(request):
+    """
+    Host, path and query string with the parameters sorted, so the same
+    query written differently shares one entry
+    """
+    query = sorted((key, value) for key, values in request.query_params.lists() for value in values)
+    return hashlib.sha1(f'{request.get_host()}{request.path}?{query!r}'.encode()).hexdigest()
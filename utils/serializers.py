@@ -0,0 +1,86 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def query_param_set(request, name):
+    """
+    Comma separated query parameter as a set, e.g. ?fields=id,title
+    """
+    value = request.query_params.get(name, '') if request is not None else ''
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    ModelSerializer mixin for sparse fieldsets on reads:
+
+    - ``?fields=id,title`` keeps only the listed fields
+    - ``?expand=movie`` swaps a compact nested representation for the full
+      serializer named in ``Meta.expandable``
+
+    Only the serializer built by the view reacts to the query string; nested
+    serializers keep their declared fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+
+        expandable = getattr(self.Meta, 'expandable', {})
+        for name in query_param_set(request, 'expand') & set(expandable):
+            self.fields[name] = expandable[name](read_only=True)
+
+        fields = query_param_set(request, 'fields')
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+def serialized_columns(serializer, prefix=''):
+    """
+    ORM paths of the columns ``serializer`` renders, for ``QuerySet.only()``.
+    Returns None when some field reads more than a plain column or a
+    to-one relation (properties, method fields, many-to-many), in which case
+    the queryset should be left untrimmed.
+    """
+    model = serializer.Meta.model
+    columns = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer) or not (
+                    model_field.many_to_one or model_field.one_to_one):
+                return None
+            nested = serialized_columns(field, f'{prefix}{field.source}__')
+            if nested is None:
+                return None
+            columns.append(prefix + field.source)
+            columns.extend(nested)
+        elif model_field.concrete and not model_field.many_to_many:
+            columns.append(prefix + field.source)
+        else:
+            return None
+    return columns
+
+
+def only_serialized(queryset, serializer):
+    """
+    Trim ``queryset`` to the columns and joins ``serializer`` renders
+    """
+    columns = serialized_columns(serializer)
+    if not columns:
+        return queryset
+    # Join only the relations that are still rendered
+    related = {column.rsplit('__', 1)[0] for column in columns if '__' in column}
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
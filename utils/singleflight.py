@@ -0,0 +1,69 @@
+import asyncio
+import concurrent.futures
+import threading
+from utils import metrics
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one execution.
+
+    The first thread to ask for a key runs the function; threads arriving
+    while it is in flight wait for and share its result (or exception).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._calls[key] = future
+
+        if not leader:
+            metrics.incr(f'singleflight.{self.name}.shared')
+            return future.result()
+
+        metrics.incr(f'singleflight.{self.name}.executed')
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight: concurrent awaits of the same key on
+    one event loop share a single task.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+
+    async def do(self, key, coro_fn, *args, **kwargs):
+        call_key = (asyncio.get_running_loop(), key)
+        task = self._calls.get(call_key)
+        if task is None:
+            metrics.incr(f'singleflight.{self.name}.executed')
+            task = asyncio.ensure_future(coro_fn(*args, **kwargs))
+            self._calls[call_key] = task
+            task.add_done_callback(lambda _: self._calls.pop(call_key, None))
+            # Waiters may all have been cancelled; don't log the outcome as unretrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        else:
+            metrics.incr(f'singleflight.{self.name}.shared')
+        # Shielded so one cancelled waiter does not cancel the others
+        return await asyncio.shield(task)
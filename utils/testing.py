@@ -0,0 +1,119 @@
+import asyncio
+import re
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from utils.fake_omdb import FakeOMDBServer
+from utils.movie_api import omdb_breaker, omdb_client
+from utils.omdb_cache import omdb_cache
+
+
+def run_omdb(coro):
+    """
+    Run an OMDB coroutine on a throwaway loop, closing that loop's session afterwards
+    """
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await omdb_client.close()
+    return asyncio.run(runner())
+
+
+class FakeOMDBMixin:
+    """
+    Test case mixin that serves ``omdb_titles`` from a local FakeOMDBServer
+    and starts every test with a cold OMDB cache.
+    """
+    omdb_titles = ()
+    omdb_latency = 0.0
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeOMDBServer(cls.omdb_titles, latency=cls.omdb_latency).start()
+        cls.omdb_settings = override_settings(OMDB_API_URL=cls.server.url)
+        cls.omdb_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.omdb_settings.disable()
+        cls.server.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.server.reset()
+        self.server.delays.clear()
+        self.server.failures.clear()
+        self.server.outage_status = None
+        self.server.latency = self.omdb_latency
+        omdb_cache.clear(shared=True)
+        omdb_breaker.reset()
+
+
+class QueryCountMixin:
+    """
+    Test case mixin for list endpoints whose query count must not grow with
+    the number of rows they render.
+    """
+
+    def assertConstantQueries(self, url, add_rows, sizes=(1, 25), params=None):
+        """
+        Grow the data set with ``add_rows(count)`` to each of ``sizes`` rows,
+        fetch ``url`` with a page that large and assert every fetch ran the
+        same number of queries. Returns that number.
+        """
+        counts = {}
+        total = 0
+        for size in sizes:
+            add_rows(size - total)
+            total = size
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, {**(params or {}), 'page_size': size})
+            self.assertEqual(response.status_code, 200, response.data)
+            counts[size] = len(queries)
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f"Query count of {url} grows with the number of rows: {counts}"
+        )
+        return counts[sizes[0]]
+
+
+FULL_SCAN_PATTERNS = {
+    'sqlite': ('EXPLAIN QUERY PLAN ', re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')),
+    'postgresql': ('EXPLAIN ', re.compile(r'Seq Scan on (\w+)')),
+}
+
+
+def full_scans(sql):
+    """
+    Tables the database plans to read in full (without an index) for ``sql``
+    """
+    prefix, pattern = FULL_SCAN_PATTERNS[connection.vendor]
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql)
+        plan = [str(row[-1]) for row in cursor.fetchall()]
+    return [match.group(1) for line in plan for match in [pattern.search(line.strip())] if match]
+
+
+class QueryPlanMixin:
+    """
+    Test case mixin asserting that an endpoint's queries are answered from
+    indexes. Seed enough rows first; on an empty table any plan is cheap.
+    """
+
+    def assertNoFullScans(self, url, params=None):
+        """
+        Fetch ``url`` and EXPLAIN every query it ran, failing if one reads a
+        whole table
+        """
+        if connection.vendor not in FULL_SCAN_PATTERNS:
+            self.skipTest(f'No query plan check for {connection.vendor}')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200, response.data)
+        for query in queries:
+            if query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT')):
+                continue
+            self.assertEqual(full_scans(query['sql']), [], f"{url} {params}: {query['sql']}")
@@ -1,3 +1,564 @@
-from django.test import TestCase
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest.mock import patch
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from movies.models import Movie
+from users.models import User
+from utils import metrics
+from utils.async_bridge import AsyncBridge
+from utils.circuit_breaker import CircuitBreaker
+from utils.locks import cache_lock
+from utils import movie_api
+from utils.movie_api import (
+    aget_or_create_movie, omdb_breaker, omdb_client, fetch_movie_details, fetch_movie_by_id, fetch_movie_search, get_or_create_movie,
+    search_external_movies
+)
+from utils.omdb_cache import omdb_cache
+from utils.pagination import CachedCountPaginator
+from utils.rate_limit import AsyncTokenBucket, SharedRateLimiter
+from utils.checks import check_shared_caches
+from utils.response_cache import versions
+from utils.testing import FakeOMDBMixin, run_omdb
+from utils.text import parse_rating, parse_runtime, parse_year
 
-# Create your tests here.
+
+class OMDBClientTest(FakeOMDBMixin, SimpleTestCase):
+    omdb_titles = ['Inception', 'Interstellar']
+
+    def test_lookups_share_pooled_session(self):
+        async def lookups():
+            session = omdb_client.get_session()
+            details = await fetch_movie_details('Inception')
+            by_id = await fetch_movie_by_id(details['external_id'])
+            reused = omdb_client.get_session() is session
+            await omdb_client.close()
+            return details, by_id, reused
+
+        details, by_id, reused = asyncio.run(lookups())
+        self.assertEqual(details['title'], 'Inception')
+        self.assertEqual(by_id['title'], 'Inception')
+        self.assertTrue(reused)
+
+    def test_unknown_title_returns_error(self):
+        self.assertEqual(run_omdb(fetch_movie_details('No Such Movie')), {'error': 'Movie not found'})
+
+
+class MovieSearchFanOutTest(FakeOMDBMixin, SimpleTestCase):
+    LATENCY = 0.2
+    omdb_titles = [f'Star Movie {i}' for i in range(8)]
+    omdb_latency = LATENCY
+
+    def test_details_are_fetched_concurrently(self):
+        started = time.perf_counter()
+        results = run_omdb(fetch_movie_search('Star Movie'))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(results), 5)
+        # One search round trip plus one (parallel) detail round trip,
+        # instead of the six sequential round trips
+        self.assertLess(elapsed, 3 * self.LATENCY)
+
+    def test_result_limit_is_configurable(self):
+        with override_settings(OMDB_SEARCH_RESULT_LIMIT=7):
+            self.assertEqual(len(run_omdb(fetch_movie_search('Star Movie'))), 7)
+        self.assertEqual(len(run_omdb(fetch_movie_search('Star Movie', limit=2))), 2)
+
+    def test_partial_results_within_deadline(self):
+        self.server.delays['tt0000001'] = 1
+        with override_settings(OMDB_SEARCH_DEADLINE=3 * self.LATENCY):
+            started = time.perf_counter()
+            results = run_omdb(fetch_movie_search('Star Movie'))
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(results), 4)
+        self.assertNotIn('tt0000001', [movie['external_id'] for movie in results])
+        self.assertLess(elapsed, 1)
+
+    def test_slow_item_times_out_individually(self):
+        self.server.delays['tt0000002'] = 1
+        with override_settings(OMDB_SEARCH_ITEM_TIMEOUT=2 * self.LATENCY):
+            results = run_omdb(fetch_movie_search('Star Movie'))
+
+        self.assertEqual(
+            [movie['external_id'] for movie in results],
+            ['tt0000001', 'tt0000003', 'tt0000004', 'tt0000005']
+        )
+
+
+class OMDBCacheTest(FakeOMDBMixin, SimpleTestCase):
+    omdb_titles = ['Inception', 'Up']
+
+    def setUp(self):
+        super().setUp()
+        metrics.reset('omdb_cache.')
+
+    def test_repeated_title_is_served_from_cache(self):
+        first = run_omdb(fetch_movie_details('Inception'))
+        second = run_omdb(fetch_movie_details('  inception '))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.server.total_requests, 1)
+        self.assertEqual(metrics.get('omdb_cache.hits'), 1)
+        self.assertEqual(metrics.get('omdb_cache.misses'), 1)
+
+    def test_misses_are_negatively_cached(self):
+        for _ in range(3):
+            self.assertEqual(run_omdb(fetch_movie_details('Incepshun')), {'error': 'Movie not found'})
+
+        self.assertEqual(self.server.total_requests, 1)
+        self.assertEqual(metrics.get('omdb_cache.negative_hits'), 2)
+
+    def test_negative_results_use_their_own_ttl(self):
+        with override_settings(OMDB_CACHE_NEGATIVE_TTL=0, OMDB_CACHE_ALIAS=None):
+            omdb_cache.clear()
+            run_omdb(fetch_movie_details('Incepshun'))
+            run_omdb(fetch_movie_details('Incepshun'))
+            run_omdb(fetch_movie_details('Inception'))
+            run_omdb(fetch_movie_details('Inception'))
+
+        self.assertEqual(self.server.requests['t', 'Incepshun'], 2)
+        self.assertEqual(self.server.requests['t', 'Inception'], 1)
+        omdb_cache.clear()
+
+    @override_settings(OMDB_CACHE_ALIAS='default')
+    def test_shared_tier_repopulates_local_tier(self):
+        run_omdb(fetch_movie_by_id('tt0000001'))
+        omdb_cache.clear()
+        run_omdb(fetch_movie_by_id('TT0000001'))
+
+        self.assertEqual(self.server.total_requests, 1)
+        self.assertEqual(metrics.get('omdb_cache.shared_hits'), 1)
+
+    def test_entries_are_isolated_from_callers(self):
+        results = run_omdb(fetch_movie_search('Inception'))
+        results[0]['title'] = 'Changed'
+        results.clear()
+        detail = run_omdb(fetch_movie_details('Inception'))
+        detail['title'] = 'Changed'
+
+        self.assertEqual([movie['title'] for movie in run_omdb(fetch_movie_search('Inception'))], ['Inception'])
+        self.assertEqual(run_omdb(fetch_movie_details('Inception'))['title'], 'Inception')
+
+    def test_lru_evictions_are_counted(self):
+        with override_settings(OMDB_CACHE_MAXSIZE=1, OMDB_CACHE_ALIAS=None):
+            omdb_cache.clear()
+            run_omdb(fetch_movie_details('Inception'))
+            run_omdb(fetch_movie_details('Up'))
+            run_omdb(fetch_movie_details('Inception'))
+
+        self.assertEqual(self.server.total_requests, 3)
+        self.assertEqual(metrics.get('omdb_cache.evictions'), 2)
+        omdb_cache.clear()
+
+
+class LookupCoalescingTest(FakeOMDBMixin, TransactionTestCase):
+    omdb_titles = ['Trending Movie']
+    omdb_latency = 0.2
+
+    def test_concurrent_fetches_share_one_upstream_call(self):
+        async def lookups():
+            return await asyncio.gather(*(fetch_movie_details('Trending Movie') for _ in range(100)))
+
+        results = run_omdb(lookups())
+        self.assertEqual(len({result['external_id'] for result in results}), 1)
+        self.assertEqual(self.server.total_requests, 1)
+
+    def test_concurrent_resolutions_share_one_omdb_call_and_write(self):
+        barrier = threading.Barrier(100)
+        titles = ['Trending Movie', 'trending movie', ' TRENDING  MOVIE '] * 34
+
+        def lookup(title):
+            try:
+                barrier.wait()
+                return get_or_create_movie(title)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=100) as pool:
+            movies = list(pool.map(lookup, titles[:100]))
+
+        self.assertEqual(self.server.total_requests, 1)
+        self.assertEqual(Movie.objects.count(), 1)
+        self.assertEqual({movie.pk for movie in movies}, {Movie.objects.get().pk})
+
+    def test_concurrent_async_resolutions_share_one_omdb_call_and_write(self):
+        titles = ['Trending Movie', 'trending movie', ' TRENDING  MOVIE '] * 34
+
+        async def lookups():
+            return await asyncio.gather(*(aget_or_create_movie(title) for title in titles[:100]))
+
+        with patch('utils.movie_api.save_movie_data', wraps=movie_api.save_movie_data) as save, \
+                patch('utils.movie_api.create_or_update_movie_in_db', sync_to_async(save)):
+            movies = run_omdb(lookups())
+
+        self.assertEqual(self.server.total_requests, 1)
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(Movie.objects.count(), 1)
+        self.assertEqual({movie.pk for movie in movies}, {Movie.objects.get().pk})
+
+    @override_settings(OMDB_LOCK_ALIAS='default')
+    def test_async_resolutions_take_the_shared_lock(self):
+        held = []
+        fetch_movie = movie_api.fetch_movie
+
+        async def fetch(title):
+            held.append(cache.get(f"lock:{omdb_cache.make_key('title', title)}") is not None)
+            return await fetch_movie(title)
+
+        with patch('utils.movie_api.fetch_movie', side_effect=fetch):
+            movie = run_omdb(aget_or_create_movie('Trending Movie'))
+        self.assertEqual(movie.title, 'Trending Movie')
+        self.assertEqual(held, [True])
+
+    @override_settings(OMDB_LOCK_ALIAS='default')
+    def test_shared_cache_lock_excludes_other_holders(self):
+        with cache_lock('movie:test') as held:
+            self.assertTrue(held)
+            with cache_lock('movie:test', wait=0) as other:
+                self.assertFalse(other)
+        with cache_lock('movie:test', wait=0) as held_again:
+            self.assertTrue(held_again)
+
+
+
+class SearchCatalogWarmingTest(FakeOMDBMixin, TransactionTestCase):
+    omdb_titles = [f'Star Movie {index}' for index in range(1, 8)]
+
+    def setUp(self):
+        super().setUp()
+        metrics.reset('catalog.')
+
+    def search(self, search_term):
+        results = search_external_movies(search_term)
+        # The single writer thread runs queued jobs in order
+        movie_api._catalog_writer.submit(lambda: None).result(timeout=5)
+        return results
+
+    def test_search_results_missing_from_the_catalog_are_stored(self):
+        kept = Movie.objects.create(title='Kept As Is', external_id='tt0000001')
+
+        results = self.search('Star Movie')
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(Movie.objects.filter(from_search=True).count(), 4)
+        self.assertEqual(metrics.get('catalog.search_warmed.movies'), 4)
+        kept.refresh_from_db()
+        self.assertEqual((kept.title, kept.from_search), ('Kept As Is', False))
+
+        # Searching again finds nothing new to store
+        self.search('Star Movie')
+        self.assertEqual(metrics.get('catalog.search_warmed.movies'), 4)
+
+    @override_settings(MOVIE_SEARCH_WARM_CATALOG=False)
+    def test_warming_can_be_disabled(self):
+        self.assertEqual(len(search_external_movies('Star Movie')), 5)
+        self.assertFalse(Movie.objects.exists())
+
+    def test_reviews_of_warmed_movies_need_no_omdb_call(self):
+        self.search('Star Movie')
+        requests = self.server.total_requests
+        client = APIClient()
+        for email in ('first@example.com', 'second@example.com'):
+            client.force_authenticate(User.objects.create_user(email=email, password='testpassword123'))
+            response = client.post(reverse('review-list'), {'movie_title': 'Star Movie 2', 'content': 'Great', 'rating': 5})
+            self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(self.server.total_requests, requests)
+        self.assertEqual(metrics.get('catalog.search_warmed.reviews'), 2)
+        self.assertEqual(metrics.get('catalog.search_warmed.lookups_saved'), 1)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@override_settings(
+    OMDB_BREAKER_FAILURE_RATE=0.5, OMDB_BREAKER_MIN_CALLS=4, OMDB_BREAKER_WINDOW=30, OMDB_BREAKER_COOLDOWN=10
+)
+class CircuitBreakerTest(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker('test', 'OMDB_BREAKER', clock=self.clock)
+        metrics.reset('test.')
+
+    def test_opens_once_the_failure_rate_is_reached(self):
+        for succeeded in (True, False, True):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_success() if succeeded else self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(metrics.get('test.breaker.failures'), 2)
+        self.assertEqual(metrics.get('test.breaker.rejected'), 1)
+
+    def test_old_outcomes_leave_the_window(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now += 31
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.now += 10
+
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        # Only one probe at a time
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        self.clock.now += 10
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(metrics.get('test.breaker.open'), 2)
+        self.assertEqual(metrics.get('test.breaker.closed'), 1)
+
+    def test_released_probe_can_be_retaken(self):
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.now += 10
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+        self.assertTrue(self.breaker.allow())
+
+
+class SharedRateLimiterTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_budget_is_per_second(self):
+        clock = FakeClock(1000.2)
+        limiter = SharedRateLimiter('test', clock=clock)
+
+        taken = [asyncio.run(limiter.acquire(3, cache)) for _ in range(5)]
+        self.assertEqual(taken, [True, True, True, False, False])
+        clock.now += 1
+        self.assertTrue(asyncio.run(limiter.acquire(3, cache)))
+
+    def test_processes_share_the_budget(self):
+        clock = FakeClock(1000.2)
+        first, second = SharedRateLimiter('test', clock=clock), SharedRateLimiter('test', clock=clock)
+
+        self.assertTrue(asyncio.run(first.acquire(1, cache)))
+        self.assertFalse(asyncio.run(second.acquire(1, cache)))
+
+    def test_waits_for_the_next_window(self):
+        limiter = SharedRateLimiter('test')
+
+        async def acquire_all():
+            return [await limiter.acquire(1, cache, wait=1.5) for _ in range(2)]
+
+        started = time.time()
+        self.assertEqual(asyncio.run(acquire_all()), [True, True])
+        self.assertGreaterEqual(int(time.time()), int(started) + 1)
+
+
+@override_settings(OMDB_BREAKER_MIN_CALLS=3, OMDB_BREAKER_COOLDOWN=0.2)
+class OMDBCircuitBreakerTest(FakeOMDBMixin, TestCase):
+    omdb_titles = ['Inception', 'Up']
+
+    def setUp(self):
+        super().setUp()
+        metrics.reset('omdb.')
+
+    def test_outage_opens_the_breaker_and_fails_fast(self):
+        self.server.outage_status = 503
+        for title in ('One', 'Two', 'Three'):
+            self.assertIn('error', run_omdb(fetch_movie_details(title)))
+        self.assertEqual(omdb_breaker.state, omdb_breaker.OPEN)
+        self.assertEqual(self.server.total_requests, 3)
+
+        self.assertIn('error', run_omdb(fetch_movie_details('Inception')))
+        self.assertEqual(self.server.total_requests, 3)
+        self.assertEqual(metrics.get('omdb.breaker.rejected'), 1)
+
+    def test_probe_closes_the_breaker_after_recovery(self):
+        self.server.outage_status = 500
+        for title in ('One', 'Two', 'Three'):
+            run_omdb(fetch_movie_details(title))
+        self.server.outage_status = None
+        time.sleep(0.2)
+
+        self.assertEqual(run_omdb(fetch_movie_details('Inception'))['title'], 'Inception')
+        self.assertEqual(omdb_breaker.state, omdb_breaker.CLOSED)
+
+    def test_timeouts_count_as_failures(self):
+        self.server.latency = 0.5
+        with override_settings(OMDB_REQUEST_TIMEOUT=0.05):
+            for title in ('One', 'Two', 'Three'):
+                self.assertIn('error', run_omdb(fetch_movie_details(title)))
+        self.assertEqual(omdb_breaker.state, omdb_breaker.OPEN)
+
+    def test_not_found_is_not_a_failure(self):
+        for title in ('One', 'Two', 'Three'):
+            self.assertEqual(run_omdb(fetch_movie_details(title)), {'error': 'Movie not found'})
+        self.assertEqual(omdb_breaker.state, omdb_breaker.CLOSED)
+
+    def test_open_breaker_falls_back_to_the_database(self):
+        stored = Movie.objects.create(title='Up', external_id='tt0000002')
+        self.server.outage_status = 503
+        for title in ('One', 'Two', 'Three'):
+            run_omdb(fetch_movie_details(title))
+        self.server.reset()
+
+        self.assertEqual(get_or_create_movie('Up'), stored)
+        self.assertIsNone(get_or_create_movie('Inception'))
+        self.assertEqual(self.server.total_requests, 0)
+
+    def test_shared_rate_limit_fails_fast(self):
+        cache.clear()
+        with override_settings(OMDB_RATE_LIMIT=2, OMDB_RATE_LIMIT_WAIT=0):
+            async def lookups():
+                return await asyncio.gather(*(fetch_movie_by_id(f'tt{i:07d}') for i in range(1, 6)))
+
+            results = run_omdb(lookups())
+        limited = [result for result in results if 'rate limit' in result.get('error', '')]
+        # Unless the lookups straddled a second boundary, two went through
+        self.assertLessEqual(self.server.total_requests, 4)
+        self.assertEqual(self.server.total_requests + len(limited), 5)
+        self.assertEqual(metrics.get('omdb.rate_limited'), len(limited))
+        self.assertEqual(omdb_breaker.state, omdb_breaker.CLOSED)
+
+
+class ParseMovieFieldsTest(SimpleTestCase):
+    def test_omdb_values(self):
+        self.assertEqual(parse_year('2010'), 2010)
+        self.assertEqual(parse_year('2008–2013'), 2008)
+        self.assertEqual(parse_runtime('148 min'), 148)
+        self.assertEqual(parse_runtime('1 h 30 min'), 90)
+        self.assertEqual(parse_rating('8.8'), Decimal('8.8'))
+
+    def test_missing_values(self):
+        for parse in (parse_year, parse_runtime, parse_rating):
+            self.assertIsNone(parse('N/A'))
+            self.assertIsNone(parse(None))
+
+
+class AsyncTokenBucketTest(SimpleTestCase):
+    def test_limits_the_rate_after_the_burst(self):
+        async def acquire_all():
+            bucket = AsyncTokenBucket(rate=50, capacity=2)
+            started = time.perf_counter()
+            for _ in range(7):
+                await bucket.acquire()
+            return time.perf_counter() - started
+
+        # Two tokens up front, the other five at 50 per second
+        self.assertGreaterEqual(asyncio.run(acquire_all()), 0.09)
+
+
+class AsyncBridgeTest(SimpleTestCase):
+    def setUp(self):
+        self.bridge = AsyncBridge()
+        self.addCleanup(self.bridge.stop)
+
+    def test_calls_reuse_one_loop(self):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = self.bridge.run(current_loop())
+        second = self.bridge.run(current_loop())
+        self.assertIs(first, second)
+        self.assertTrue(first.is_running())
+
+    def test_run_from_thread_with_running_loop(self):
+        async def answer():
+            return 42
+
+        async def caller():
+            # Mirrors a sync view invoked while an ASGI loop is running
+            return self.bridge.run(answer())
+
+        self.assertEqual(asyncio.run(caller()), 42)
+
+    def test_exceptions_propagate(self):
+        async def fail():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            self.bridge.run(fail())
+
+    def test_run_from_thread_sensitive_sync_code(self):
+        async def uses_sync_code():
+            return await sync_to_async(lambda: 42)()
+
+        async def request():
+            # A sync view under ASGI: its thread is the request's thread-sensitive executor
+            async with ThreadSensitiveContext():
+                return await sync_to_async(self.bridge.run)(uses_sync_code(), timeout=5)
+
+        self.assertEqual(asyncio.run(request()), 42)
+
+
+class CachedCountPaginatorTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Movie.objects.bulk_create(Movie(title=f'Movie {index}') for index in range(5))
+
+    def count(self, queryset):
+        return CachedCountPaginator(queryset, 2).count
+
+    @override_settings(PAGINATION_COUNT_CACHE_TIMEOUT=60)
+    def test_counts_are_cached_per_query(self):
+        self.assertEqual(self.count(Movie.objects.all()), 5)
+        Movie.objects.create(title='Late Arrival')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.count(Movie.objects.all()), 5)
+        self.assertEqual(self.count(Movie.objects.filter(title__startswith='Late')), 1)
+
+    def test_disabled_by_default(self):
+        self.assertEqual(self.count(Movie.objects.all()), 5)
+        Movie.objects.create(title='Late Arrival')
+        self.assertEqual(self.count(Movie.objects.all()), 6)
+
+
+class ResponseCacheBumpTest(TestCase):
+    def test_writes_skip_the_cache_while_it_is_off(self):
+        with patch('utils.response_cache.response_cache') as response_cache:
+            movie = Movie.objects.create(title='Heat')
+            User.objects.create_user(email='writer@example.com', password='pass')
+            movie_api.upsert_movies([{'title': 'Alien', 'external_id': 'tt0078748'}])
+        response_cache.assert_not_called()
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=300)
+    def test_writes_bump_the_versions_while_it_is_on(self):
+        version = versions(['movie'])[0]
+        Movie.objects.create(title='Heat')
+        self.assertGreater(versions(['movie'])[0], version)
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    def warnings(self):
+        return [warning.id for warning in check_shared_caches()]
+
+    def test_default_settings_pass(self):
+        self.assertEqual(self.warnings(), [])
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=300, OMDB_RATE_LIMIT=10, OMDB_CACHE_ALIAS='default', OMDB_LOCK_ALIAS='default')
+    def test_warns_about_per_process_caches(self):
+        self.assertEqual(self.warnings(), ['utils.W001', 'utils.W002', 'utils.W003', 'utils.W004'])
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            self.assertEqual(self.warnings(), [])
+
+    @override_settings(OMDB_RATE_LIMIT=0, OMDB_RATE_LIMIT_ALIAS='default')
+    def test_disabled_features_are_not_checked(self):
+        self.assertEqual(self.warnings(), [])
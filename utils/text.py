@@ -0,0 +1,52 @@
+import re
+import unicodedata
+from decimal import Decimal, InvalidOperation
+
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize_title(value):
+    """
+    Normalize a title for matching: accents stripped, casefolded,
+    punctuation removed and whitespace collapsed.
+    """
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_WORD.sub(' ', stripped.casefold()).strip()
+
+
+_YEAR = re.compile(r'\d{4}')
+_HOURS = re.compile(r'(\d+)\s*h', re.IGNORECASE)
+_MINUTES = re.compile(r'(\d+)\s*m', re.IGNORECASE)
+
+
+def parse_year(value):
+    """
+    First year of an OMDB ``Year``, e.g. 2010 for "2010–2015"; None if absent
+    """
+    match = _YEAR.search(str(value or ''))
+    return int(match.group()) if match else None
+
+
+def parse_runtime(value):
+    """
+    Runtime in minutes from "148 min" or "2 h 28 min"; None if absent
+    """
+    value = str(value or '')
+    hours, minutes = _HOURS.search(value), _MINUTES.search(value)
+    if not hours and not minutes:
+        return int(value) if value.strip().isdigit() else None
+    return (int(hours.group(1)) * 60 if hours else 0) + (int(minutes.group(1)) if minutes else 0)
+
+
+def parse_rating(value):
+    """
+    OMDB ``imdbRating`` ("8.8") as a one-decimal Decimal; None for "N/A"
+    """
+    try:
+        rating = Decimal(str(value)).quantize(Decimal('0.1'))
+    except (InvalidOperation, TypeError):
+        return None
+    return rating if rating.is_finite() and 0 <= rating <= 10 else None
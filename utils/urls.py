@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import MetricsAPIView
+
+urlpatterns = [
+    path('', MetricsAPIView.as_view(), name='metrics'),
+]
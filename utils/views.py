@@ -1,3 +1,157 @@
-from django.shortcuts import render
+import hashlib
+import inspect
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.functional import cached_property
+from django.utils.http import http_date, quote_etag
+from rest_framework.permissions import IsAdminUser, SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from utils import metrics, response_cache
+from utils.serializers import only_serialized
 
-# Create your views here.
+
+class SparseFieldsetMixin:
+    """
+    GenericAPIView mixin that, on reads, loads only the columns the
+    serializer (after ?fields= / ?expand=) actually renders
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method in SAFE_METHODS:
+            queryset = only_serialized(queryset, self.get_serializer())
+        return queryset
+
+
+class CachedResponseMixin:
+    """
+    GenericAPIView mixin for cached reads. GET responses (their serialized
+    data) are cached for RESPONSE_CACHE_TIMEOUT seconds under the normalized
+    query string and the versions of ``cache_scopes``, which saves and
+    deletes bump. Responses carry a strong ETag and Last-Modified from
+    get_validators(), and a conditional GET the client's copy still matches
+    is answered 304 without serializing anything.
+    """
+    cache_scopes = ()
+
+    def get_validators(self):
+        """
+        Values that change whenever the response would, and the time of the
+        last change: by default the row count and newest updated_at of the
+        filtered queryset
+        """
+        state = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            rows=Count('pk'), last_modified=Max('updated_at')
+        )
+        return (state['rows'], state['last_modified']), state['last_modified']
+
+    @cached_property
+    def request_fingerprint(self):
+        return response_cache.request_fingerprint(self.request)
+
+    @cached_property
+    def response_cache_key(self):
+        versions = '.'.join(str(version) for version in response_cache.versions(self.cache_scopes))
+        return f'response:{type(self).__name__}:{versions}:{self.request_fingerprint}'
+
+    def make_etag(self, validators):
+        media_type = getattr(self.request, 'accepted_media_type', '')
+        resource = f'{type(self).__name__}:{self.request_fingerprint}:{media_type}:{validators!r}'
+        return quote_etag(hashlib.sha1(resource.encode()).hexdigest())
+
+    def not_modified(self, etag, last_modified):
+        """
+        A 304 when the request's preconditions match the current representation
+        """
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        return self.with_validators(response, etag, last_modified) if response is not None else None
+
+    def with_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # Clients may keep the response but must revalidate it
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def cached_response(self):
+        """
+        The cached response for this request (or a 304), or None on a miss
+        """
+        if not getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 0):
+            return None
+        entry = response_cache.response_cache().get(self.response_cache_key)
+        if entry is None:
+            metrics.incr('response_cache.misses')
+            return None
+        metrics.incr('response_cache.hits')
+        data, etag, last_modified = entry
+        return self.not_modified(etag, last_modified) or self.with_validators(Response(data), etag, last_modified)
+
+    def cache_response(self, render):
+        """
+        Answer 304 if the client's copy is current, else call ``render`` and
+        cache a successful response
+        """
+        timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 0)
+        # Read the versions before the data, so a write landing in between
+        # leaves the entry under an outdated version
+        key = self.response_cache_key if timeout else None
+        validators, last_modified = self.get_validators()
+        etag = self.make_etag(validators)
+        not_modified = self.not_modified(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = render()
+        if key and response.status_code == 200:
+            response_cache.response_cache().set(key, (response.data, etag, last_modified), timeout)
+        return self.with_validators(response, etag, last_modified)
+
+    def respond_cached(self, render):
+        return self.cached_response() or self.cache_response(render)
+
+
+class AsyncAPIViewMixin:
+    """
+    APIView mixin for views with coroutine handlers. DRF dispatches
+    synchronously, so this dispatch runs the authentication, permission and
+    throttling checks (which may query the database) in a thread and awaits
+    the handler, leaving the worker's event loop free during upstream calls.
+    """
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class MetricsAPIView(APIView):
+    """
+    API view exposing in-process counters (OMDB cache hits/misses, etc.)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(metrics.snapshot(request.query_params.get('prefix', '')))